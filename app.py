@@ -11,18 +11,35 @@
 브라우저: http://localhost:5000
 """
 
-from flask import Flask, jsonify, render_template_string, request, Response
+from flask import Flask, abort, jsonify, request, Response
+from flask.json.provider import DefaultJSONProvider
 from apscheduler.schedulers.background import BackgroundScheduler
 from datetime import datetime, timedelta
 from decimal import Decimal, ROUND_HALF_UP
-import json
 import math
+import atexit
+import csv
+import gzip
+import hashlib
+import html
+import io
 import os
 import logging
+import queue
+import re
+import tempfile
 import threading
+import time
 import traceback
 from zoneinfo import ZoneInfo
 
+import orjson
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성 - 없으면 고정 페이지는 gzip으로만 미리 압축한다.
+    brotli = None
+
 from backtester import BacktestEngine
 from screening import calculate_scores, fetch_all_data
 from stock_db import StockDB
@@ -30,7 +47,42 @@ from stock_db import StockDB
 # ============================================================
 # 설정
 # ============================================================
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify 응답을 orjson으로 직렬화한다.
+
+    키 정렬 등 Flask 기본 동작은 유지하고, orjson이 모르는 타입(Decimal 등)은
+    기본 제공자의 default 변환을 그대로 사용한다.
+    """
+
+    def _orjson_option(self, sort_keys):
+        # 날짜는 기존 응답과 같도록 Flask의 default(HTTP 날짜 형식)로 넘긴다.
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj,
+            default=kwargs.get('default', self.default),
+            option=self._orjson_option(kwargs.get('sort_keys', self.sort_keys)),
+        ).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(
+            obj,
+            default=self.default,
+            option=self._orjson_option(self.sort_keys) | orjson.OPT_APPEND_NEWLINE,
+        )
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -46,6 +98,7 @@ BACKTEST_ITEM_SOURCES = {
     'nps': '국민연금 신규/추가매수',
 }
 RETURN_PCT_QUANTUM = Decimal("0.01")
+PROGRESS_UPDATE_INTERVAL = 0.25  # 백테스트 진행 문구 갱신 최소 간격(초)
 
 
 def _format_return_pct(value):
@@ -69,9 +122,63 @@ current_data = {
     'last_updated': None,
     'status': 'idle',  # idle, loading, done, error
     'error_msg': '',
+    'version': 0,  # 결과를 교체할 때마다 증가 (클라이언트 재렌더링 판단용)
 }
 data_lock = threading.Lock()
 refresh_lock = threading.Lock()
+# 데이터 갱신이 진행 중이 아닐 때 set 상태 (/api/status/wait 롱 폴링, /api/status/stream SSE용)
+refresh_settled = threading.Event()
+refresh_settled.set()
+STATUS_WAIT_TIMEOUT = 25.0
+STATUS_STREAM_KEEPALIVE = 15.0
+
+# 캐시 파일 저장 전용 스레드 - 대기열은 한 칸이며 가장 최근 캐시만 남긴다.
+_cache_write_queue = queue.Queue(maxsize=1)
+_cache_writer = None
+_cache_writer_lock = threading.Lock()
+
+# /api/data 응답 캐시 - current_data의 객체가 교체되면 다시 인코딩한다.
+SCREENING_DATA_KEYS = ('last_updated', 'stats', 'result', 'turn', 'supply', 'nps')
+_screening_data_cache = {'sources': None, 'version': None, 'body': b'', 'etag': ''}
+
+
+class _DaemonWorker:
+    """종류별 단일 백그라운드 워커 - 데몬 스레드 하나가 대기열의 작업을 차례로 실행한다.
+
+    ThreadPoolExecutor의 워커는 인터프리터 종료 시 join되어 실행 중인 갱신/백테스트가
+    끝날 때까지 Ctrl+C 종료가 멈추므로, 데몬 스레드와 Queue로 직접 구성한다.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._loop, name=self.name, daemon=True
+                )
+                self._thread.start()
+            self._queue.put((fn, args, kwargs))
+
+    def _loop(self):
+        while True:
+            fn, args, kwargs = self._queue.get()
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                logger.error(f"{self.name} 작업 실패: {traceback.format_exc()}")
+            finally:
+                self._queue.task_done()
+
+
+# 백그라운드 작업 워커 - 요청마다 스레드를 만들지 않고 종류별 단일 워커를 재사용한다.
+refresh_executor = _DaemonWorker('refresh')
+backtest_executor = _DaemonWorker('backtest')
+
 
 # 백테스트 상태
 backtest_state = {
@@ -80,8 +187,31 @@ backtest_state = {
     'error_msg': '',
     'progress': '',
     'engine': None,  # BacktestEngine 객체 보관 (CSV용)
+    'revision': 0,  # 상태가 바뀔 때마다 증가 (SSE 구독자가 변화 여부를 판단)
 }
 bt_lock = threading.Lock()
+bt_changed = threading.Condition(bt_lock)
+# /api/backtest/status 본문 캐시 (revision 태그 단위)
+_backtest_status_cache = {'tag': None, 'body': b'', 'gzip': None}
+# /api/backtest/csv gzip 본문 캐시 (revision 태그 단위)
+_backtest_csv_cache = {'tag': None, 'gzip': b''}
+# 같은 결과의 CSV gzip을 동시에 여러 번 만들지 않도록 빌드를 한 줄로 세운다 (bt_lock보다 먼저 잡는다)
+_backtest_csv_lock = threading.Lock()
+# 서버를 재시작해도 이전 프로세스의 revision과 섞이지 않도록 붙이는 접두어
+BACKTEST_EPOCH = os.urandom(4).hex()
+
+
+def _backtest_changed():
+    """상태 변경을 SSE 구독자에게 알린다. bt_lock을 잡은 채로 호출한다."""
+    backtest_state['revision'] += 1
+    # 이전 결과의 CSV gzip은 다시 쓰이지 않으므로 바로 놓아 준다.
+    _backtest_csv_cache.update(tag=None, gzip=b'')
+    bt_changed.notify_all()
+
+
+def _backtest_tag():
+    """현재 백테스트 상태를 가리키는 태그 (ETag·SSE id). bt_lock을 잡은 채로 호출한다."""
+    return f"{BACKTEST_EPOCH}-{backtest_state['revision']}"
 
 # KRX 인증 정보가 있으면 pykrx를 우선 사용하고, 없으면 StockDB의
 # ticker_map.json/yfinance 경로를 사용한다. pykrx 1.2.8부터 KRX 데이터
@@ -117,6 +247,9 @@ def _run_reserved_refresh():
     try:
         return _refresh_data_locked()
     finally:
+        # 대기자를 먼저 깨운 뒤 잠금을 푼다 - 반대 순서면 그 틈에 시작된 새 갱신의 clear()를
+        # 이 set()이 덮어써 대기자가 갱신 중인 상태를 완료로 읽는다.
+        refresh_settled.set()
         refresh_lock.release()
 
 
@@ -127,6 +260,7 @@ def _refresh_data_locked():
     with data_lock:
         current_data['status'] = 'loading'
         current_data['error_msg'] = ''
+        refresh_settled.clear()
 
     logger.info("=" * 50)
     logger.info("데이터 갱신 시작")
@@ -147,6 +281,7 @@ def _refresh_data_locked():
             current_data['stats'] = stats
             current_data['last_updated'] = now
             current_data['status'] = 'done'
+            current_data['version'] += 1
 
         # 캐시 파일 저장
         cache = {
@@ -154,8 +289,7 @@ def _refresh_data_locked():
             'turn': turn, 'supply': supply, 'nps': nps,
             'result': result, 'stats': stats, 'last_updated': now,
         }
-        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, ensure_ascii=False, indent=2)
+        _queue_cache_write(cache)
 
         logger.info(f"데이터 갱신 완료: 3점={stats['score_3']}, 2점={stats['score_2']}, 1점={stats['score_1']}")
         return True
@@ -174,13 +308,70 @@ def _refresh_data_locked():
         return False
 
 
+def _write_cache(cache, path=None):
+    """캐시를 같은 디렉터리의 임시 파일에 쓴 뒤 원자적으로 교체한다."""
+    path = path or CACHE_FILE
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(
+        prefix='.cache-data-', suffix='.json', dir=directory
+    )
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(orjson.dumps(cache, option=orjson.OPT_INDENT_2))
+        os.replace(temporary, path)
+    except Exception:
+        try:
+            os.unlink(temporary)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _cache_writer_loop():
+    while True:
+        path, cache = _cache_write_queue.get()
+        try:
+            _write_cache(cache, path)
+        except Exception as e:
+            logger.error(f"캐시 파일 저장 실패: {e}")
+        finally:
+            _cache_write_queue.task_done()
+
+
+def _queue_cache_write(cache):
+    """캐시 저장을 전용 스레드에 넘긴다. 밀린 저장은 최신 캐시로 덮어쓴다."""
+    global _cache_writer
+    with _cache_writer_lock:
+        if _cache_writer is None or not _cache_writer.is_alive():
+            _cache_writer = threading.Thread(
+                target=_cache_writer_loop, name='cache-writer', daemon=True
+            )
+            _cache_writer.start()
+        while True:
+            try:
+                _cache_write_queue.put_nowait((CACHE_FILE, cache))
+                return
+            except queue.Full:
+                try:
+                    _cache_write_queue.get_nowait()
+                except queue.Empty:
+                    continue
+                _cache_write_queue.task_done()
+
+
+@atexit.register
+def flush_cache_writes():
+    """대기 중인 캐시 저장이 끝날 때까지 기다린다."""
+    _cache_write_queue.join()
+
+
 def load_cache():
     """캐시 파일에서 데이터 로드"""
     global current_data
     if os.path.exists(CACHE_FILE):
         try:
-            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-                cache = json.load(f)
+            with open(CACHE_FILE, 'rb') as f:
+                cache = orjson.loads(f.read())
             if cache.get('version') != CACHE_VERSION:
                 logger.info("구형 스크리닝 캐시를 무시합니다")
                 return False
@@ -192,6 +383,7 @@ def load_cache():
                 current_data['stats'] = cache.get('stats', {})
                 current_data['last_updated'] = cache.get('last_updated')
                 current_data['status'] = 'done'
+                current_data['version'] += 1
             logger.info(f"캐시 데이터 로드 완료 (갱신: {current_data['last_updated']})")
             return True
         except Exception as e:
@@ -202,9 +394,122 @@ def load_cache():
 # ============================================================
 # Flask 라우트
 # ============================================================
+# 미리 압축해 두는 Content-Encoding (클라이언트가 받으면 앞쪽을 우선 사용)
+PAGE_ENCODINGS = ('br', 'gzip')
+
+
+def _compress_page(text):
+    """고정 응답 본문을 원본/압축 바이트와 ETag로 한 번만 만들어 둔다.
+
+    페이지 템플릿에는 Jinja 구문이 없으므로 요청마다 템플릿 엔진을 거치지 않는다.
+    brotli 패키지가 있으면 gzip보다 작은 br 본문도 함께 만든다.
+    """
+    raw = text.encode('utf-8')
+    encoded = {'gzip': gzip.compress(raw, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoded['br'] = brotli.compress(raw, quality=11)
+    return raw, encoded, hashlib.sha1(raw).hexdigest()
+
+
+# 페이지에서 분리한 CSS - 해시가 들어간 파일명 → _compress_page 결과
+_STYLE_BLOCK_RE = re.compile(r'<style>(.*?)</style>', re.S)
+# 따옴표 문자열은 그대로 두고, 주석·공백 덩어리와 구분자({};,)·콜론 뒤 공백만 고른다.
+_CSS_TOKEN_RE = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/|\s+""", re.S)
+_CSS_SEPARATOR_SPACE_RE = re.compile(r' ?([{};,]) ?|(:) ')
+_CSS_STRING_SLOT_RE = re.compile(r'\x00(\d+)\x00')
+STYLESHEETS = {}
+
+
+def _minify_css(css):
+    """가져올 때 한 번 CSS의 주석과 불필요한 공백을 걷어 낸다."""
+    strings = []
+
+    def token(match):
+        if match.group(1):
+            strings.append(match.group(1))
+            return f'\x00{len(strings) - 1}\x00'
+        return ' '
+
+    compact = re.sub(' {2,}', ' ', _CSS_TOKEN_RE.sub(token, css))
+    compact = _CSS_SEPARATOR_SPACE_RE.sub(lambda m: m.group(1) or m.group(2), compact)
+    compact = compact.replace(';}', '}').strip()
+    return _CSS_STRING_SLOT_RE.sub(lambda m: strings[int(m.group(1))], compact)
+
+
+_SCRIPT_BLOCK_RE = re.compile(r'(<script\b.*?</script>)', re.S)
+_LINE_INDENT_RE = re.compile(r'\n[ \t]+')
+
+
+def _minify_markup(template):
+    """<script> 밖 HTML의 줄 앞 들여쓰기를 지운다.
+
+    템플릿에는 <pre>나 white-space:pre 요소가 없어 화면에는 차이가 없다.
+    스크립트는 여러 줄 템플릿 리터럴이 있어 그대로 둔다.
+    """
+    parts = _SCRIPT_BLOCK_RE.split(template)
+    return ''.join(
+        part if index % 2 else _LINE_INDENT_RE.sub('\n', part)
+        for index, part in enumerate(parts)
+    )
+
+
+def _static_page(template, name):
+    """페이지 템플릿을 CSS 분리·공백 정리·압축까지 마친 응답 본문으로 만든다."""
+    return _compress_page(_minify_markup(_external_stylesheet(template, name)))
+
+
+def _external_stylesheet(template, name):
+    """페이지의 <style> 블록을 내용 해시 이름의 외부 CSS 링크로 바꾼다."""
+    match = _STYLE_BLOCK_RE.search(template)
+    if match is None:
+        return template
+    css = _minify_css(match.group(1))
+    filename = f"{name}.{hashlib.sha1(css.encode('utf-8')).hexdigest()[:12]}.css"
+    STYLESHEETS[filename] = _compress_page(css)
+    link = f'<link rel="stylesheet" href="/assets/{filename}">'
+    return template[:match.start()] + link + template[match.end():]
+
+
+def _page_response(page, mimetype='text/html', immutable=False):
+    """클라이언트가 받는 인코딩(br, gzip 순)으로 미리 압축한 바이트를 그대로 보낸다.
+
+    ETag가 같으면 본문 없이 304로 응답해 재방문 시 페이지를 다시 보내지 않는다.
+    파일명에 내용 해시가 들어간 자원(immutable)은 브라우저가 1년간 재검증 없이 쓴다.
+    """
+    raw, encoded, etag = page
+    encoding = next(
+        (name for name in PAGE_ENCODINGS
+         if name in encoded and request.accept_encodings[name]),
+        None,
+    )
+    if encoding:
+        response = Response(encoded[encoding], mimetype=mimetype)
+        response.headers['Content-Encoding'] = encoding
+        etag += '-' + encoding
+    else:
+        response = Response(raw, mimetype=mimetype)
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+    if immutable:
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@app.route('/assets/<filename>')
+def stylesheet(filename):
+    page = STYLESHEETS.get(filename)
+    if page is None:
+        abort(404)
+    return _page_response(page, mimetype='text/css', immutable=True)
+
+
 @app.route('/')
 def index():
-    return render_template_string(HTML_TEMPLATE)
+    return _page_response(INDEX_PAGE)
 
 
 @app.route('/api/refresh', methods=['POST'])
@@ -216,12 +521,11 @@ def api_refresh():
     with data_lock:
         current_data['status'] = 'loading'
         current_data['error_msg'] = ''
+        refresh_settled.clear()
 
     try:
-        thread = threading.Thread(target=_run_reserved_refresh, daemon=True)
-        thread.start()
+        refresh_executor.submit(_run_reserved_refresh)
     except Exception as e:
-        refresh_lock.release()
         with data_lock:
             if current_data.get('last_updated'):
                 current_data['status'] = 'done'
@@ -229,24 +533,183 @@ def api_refresh():
             else:
                 current_data['status'] = 'error'
                 current_data['error_msg'] = str(e)
+        refresh_settled.set()
+        refresh_lock.release()
         return jsonify({'error': '갱신 작업을 시작하지 못했습니다.'}), 500
     return jsonify({'status': 'started', 'message': '데이터 갱신을 시작합니다.'})
 
 
-@app.route('/api/status')
-def api_status():
-    """현재 상태 및 데이터 반환"""
+def _status_snapshot():
     with data_lock:
-        return jsonify({
+        return {
             'status': current_data['status'],
             'last_updated': current_data['last_updated'],
             'error_msg': current_data['error_msg'],
             'stats': current_data['stats'],
-            'result': current_data['result'],
-            'turn': current_data['turn'],
-            'supply': current_data['supply'],
-            'nps': current_data['nps'],
-        })
+            'version': current_data['version'],
+        }
+
+
+@app.route('/api/status')
+def api_status():
+    """현재 갱신 상태와 요약 통계만 반환 (폴링용) - 변화가 없으면 304"""
+    response = jsonify(_status_snapshot())
+    response.add_etag()
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@app.route('/api/status/stream')
+def api_status_stream():
+    """갱신이 끝나면 상태를 한 번 푸시하고 닫는 SSE 스트림
+
+    기다리는 동안에는 프록시가 연결을 끊지 않도록 keep-alive 주석을 보낸다.
+    """
+    def events():
+        while not refresh_settled.wait(timeout=STATUS_STREAM_KEEPALIVE):
+            yield b': keep-alive\n\n'
+        yield b'data: ' + orjson.dumps(_status_snapshot()) + b'\n\n'
+
+    return Response(
+        events(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@app.route('/api/status/wait')
+def api_status_wait():
+    """갱신이 끝나거나 timeout(초)이 지날 때까지 기다린 뒤 상태 반환 (롱 폴링)"""
+    try:
+        timeout = float(request.args.get('timeout', STATUS_WAIT_TIMEOUT))
+    except ValueError:
+        return jsonify({'error': 'timeout은 숫자여야 합니다.'}), 400
+    if not math.isfinite(timeout):
+        return jsonify({'error': 'timeout은 숫자여야 합니다.'}), 400
+
+    refresh_settled.wait(timeout=min(max(timeout, 0.0), STATUS_WAIT_TIMEOUT))
+    return api_status()
+
+
+# 대시보드 메인 테이블의 상세 컬럼 접두어 → CSS 클래스
+_DETAIL_PREFIXES = (('[턴]', 'turn'), ('[수급]', 'supply'), ('[연금]', 'nps'))
+
+
+def _display_text(value, quote=False):
+    """브라우저의 String(value)와 같은 문자열로 바꾼 뒤 HTML 이스케이프한다.
+
+    JSON에서 null이 되는 값(None, NaN, 무한대)은 빈 문자열로 표시한다.
+    속성값에 넣을 때는 quote=True로 따옴표까지 이스케이프한다.
+    """
+    if value is None or (isinstance(value, float) and not math.isfinite(value)):
+        return ''
+    if isinstance(value, bool):
+        text = 'true' if value else 'false'
+    elif isinstance(value, float) and value.is_integer():
+        text = str(int(value))
+    else:
+        text = str(value)
+    return html.escape(text, quote=quote)
+
+
+def _tag_class(source):
+    if '실적' in source:
+        return 'turn'
+    if '순매수' in source:
+        return 'supply'
+    return 'nps'
+
+
+def _dashboard_row(row, rank):
+    """메인 테이블의 완성된 <tr> HTML을 붙인 행 사본을 반환한다.
+
+    태그 사이 간격은 CSS margin으로 주고 공백 텍스트 노드는 만들지 않는다.
+    """
+    tags = ''.join(
+        f'<span class="tag {_tag_class(src)}">{_display_text(src)}</span>'
+        for src in (row.get('출처') or '').split(', ')
+    )
+    details = []
+    # 응답은 키 정렬로 직렬화되므로 기존 클라이언트와 같은 순서로 나열한다.
+    for key in sorted(row):
+        value = row[key]
+        if not value or value != value:
+            continue
+        for prefix, cls in _DETAIL_PREFIXES:
+            if key.startswith(prefix):
+                details.append(
+                    f'<span class="d {cls}">{_display_text(key[len(prefix):])}: '
+                    f'{_display_text(value)}</span>'
+                )
+                break
+    score = _display_text(row.get('종합점수'), quote=True)
+    row_html = (
+        f'<tr class="score-{score}" data-score="{score}">'
+        f'<td class="c">{rank}</td>'
+        f'<td class="sn"><b>{_display_text(row.get("종목명"))}</b></td>'
+        f'<td class="c"><span class="badge b{score}">{score}점</span></td>'
+        f'<td>{tags}</td>'
+        f'<td class="det">{"".join(details)}</td>'
+        '</tr>'
+    )
+    return {**row, '_row_html': row_html}
+
+
+def _sub_table_html(rows):
+    """출처별 원본 표의 머리글/본문 HTML을 한 번에 이스케이프해 만든다."""
+    if not rows:
+        return ''
+    # 응답 키 정렬 순서와 같게 컬럼을 나열한다.
+    cols = [col for col in sorted(rows[0]) if col != 'No.']
+    head = ''.join(f'<th>{_display_text(col)}</th>' for col in cols)
+    body = ''.join(
+        '<tr>' + ''.join(f'<td>{_display_text(row.get(col))}</td>' for col in cols) + '</tr>'
+        for row in rows
+    )
+    return f'<thead><tr>{head}</tr></thead><tbody>{body}</tbody>'
+
+
+@app.route('/api/data')
+def api_data():
+    """스크리닝 결과 전체 반환 - 같은 데이터면 인코딩한 바이트를 재사용한다.
+
+    ETag 또는 마지막 갱신 시각(Last-Modified)이 같으면 본문 없이 304로 응답한다.
+    """
+    with data_lock:
+        sources = tuple(current_data[key] for key in SCREENING_DATA_KEYS)
+        version = current_data['version']
+        cached = _screening_data_cache['sources']
+        if (cached is None or _screening_data_cache['version'] != version
+                or any(a is not b for a, b in zip(cached, sources))):
+            payload = dict(zip(SCREENING_DATA_KEYS, sources))
+            payload['result'] = [
+                _dashboard_row(row, rank)
+                for rank, row in enumerate(payload['result'] or [], 1)
+            ]
+            payload['tables'] = {
+                key: _sub_table_html(payload[key]) for key in ('turn', 'supply', 'nps')
+            }
+            payload['version'] = version
+            body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+            _screening_data_cache.update(
+                sources=sources, version=version, body=body,
+                etag=hashlib.sha1(body).hexdigest(),
+            )
+        body = _screening_data_cache['body']
+        etag = _screening_data_cache['etag']
+        last_updated = current_data['last_updated']
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    if last_updated:
+        # last_updated는 서버 로컬 시각으로 기록된다. 형식이 다른 캐시 값이면 ETag만 쓴다.
+        try:
+            response.last_modified = datetime.strptime(
+                last_updated, '%Y-%m-%d %H:%M:%S'
+            ).astimezone()
+        except ValueError:
+            pass
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 
 # ============================================================
@@ -308,6 +771,7 @@ def run_backtest_task(period_months, initial_capital, strategy,
             backtest_state['status'] = 'loading'
             backtest_state['progress'] = '종목 코드 매핑 중...'
             backtest_state['error_msg'] = ''
+            _backtest_changed()
 
         # 1. 선택한 점수와 항목을 모두 만족하는 종목 추출
         with data_lock:
@@ -325,26 +789,30 @@ def run_backtest_task(period_months, initial_capital, strategy,
         # 2. 종목코드 매핑 (DuckDB 캐시 + pykrx 갱신)
         with bt_lock:
             backtest_state['progress'] = f'종목 코드 매핑 중... ({len(stock_names)}종목)'
+            _backtest_changed()
 
         krx_mod = krx if HAS_PYKRX else None
         name_to_code, code_to_name = stock_db.get_or_refresh_ticker_map(krx_mod)
 
-        matched = {}
+        # (종목코드, 종목명) 목록 하나로 수집·로드 단계를 모두 구동한다.
+        pairs = []
         unmatched = []
+        seen_codes = set()
         for name in stock_names:
             code = name_to_code.get(name)
-            if code:
-                matched[code] = name
-            else:
+            if not code:
                 unmatched.append(name)
+            elif code not in seen_codes:
+                seen_codes.add(code)
+                pairs.append((code, name))
 
-        if not matched:
+        if not pairs:
             raise Exception(f"종목코드 매핑 실패: {', '.join(stock_names[:5])}")
 
         if unmatched:
             logger.warning(f"코드 매핑 실패 종목: {', '.join(unmatched)}")
 
-        logger.info(f"코드 매핑 완료: {len(matched)}개 성공, {len(unmatched)}개 실패")
+        logger.info(f"코드 매핑 완료: {len(pairs)}개 성공, {len(unmatched)}개 실패")
 
         # 3. 기간 설정
         end_dt = datetime.now()
@@ -355,15 +823,26 @@ def run_backtest_task(period_months, initial_capital, strategy,
         end_iso = end_dt.strftime('%Y-%m-%d')
 
         # 4. DuckDB 증분 수집 (이미 있는 데이터는 스킵)
-        ticker_list = list(matched.keys())
+        ticker_list = [code for code, _ in pairs]
+
+        names = dict(pairs)
+        last_progress_at = 0.0
 
         def progress_cb(loaded, total, ticker):
-            name = matched.get(ticker, ticker)
+            # 폴링 주기보다 잦은 갱신은 보이지 않으므로 간격을 두고 마지막 종목만 반영한다.
+            nonlocal last_progress_at
+            now = time.monotonic()
+            if loaded < total and now - last_progress_at < PROGRESS_UPDATE_INTERVAL:
+                return
+            last_progress_at = now
+            name = names.get(ticker, ticker)
             with bt_lock:
                 backtest_state['progress'] = f'주가 데이터 수집 중... ({loaded}/{total}) {name}'
+                _backtest_changed()
 
         with bt_lock:
             backtest_state['progress'] = f'주가 데이터 증분 수집 중... (총 {len(ticker_list)}종목)'
+            _backtest_changed()
 
         fetch_stats = stock_db.ensure_price_data(
             ticker_list, start_str, end_str,
@@ -381,8 +860,9 @@ def run_backtest_task(period_months, initial_capital, strategy,
             tax_pct=tax_pct,
         )
 
-        for code, name in matched.items():
-            prices = stock_db.get_prices(code, start_iso, end_iso)
+        price_map = stock_db.get_prices_bulk(ticker_list, start_iso, end_iso)
+        for code, name in pairs:
+            prices = price_map.get(code)
             if prices:
                 engine.add_price_data(code, prices, name=name)
             else:
@@ -394,6 +874,7 @@ def run_backtest_task(period_months, initial_capital, strategy,
         # 6. 벤치마크 (KOSPI) - DuckDB 증분 수집
         with bt_lock:
             backtest_state['progress'] = 'KOSPI 벤치마크 데이터 수집 중...'
+            _backtest_changed()
         stock_db.ensure_index_data("1001", start_str, end_str, krx_module=krx_mod)
         kospi = stock_db.get_index_prices("1001", start_iso, end_iso)
         if kospi:
@@ -402,6 +883,7 @@ def run_backtest_task(period_months, initial_capital, strategy,
         # 7. 백테스트 실행
         with bt_lock:
             backtest_state['progress'] = '백테스트 실행 중...'
+            _backtest_changed()
 
         tickers = list(engine.price_data.keys())
         if strategy == 'rebalance':
@@ -443,7 +925,7 @@ def run_backtest_task(period_months, initial_capital, strategy,
             'strategy': strategy,
             'strategy_name': strategy_names.get(strategy, strategy),
             'stop_loss_pct': stop_loss_pct,
-            'total_stocks': len(matched),
+            'total_stocks': len(pairs),
             'loaded_stocks': len(engine.price_data),
             'unmatched': unmatched,
             'score_filters': list(score_filters or BACKTEST_SCORE_OPTIONS),
@@ -459,6 +941,7 @@ def run_backtest_task(period_months, initial_capital, strategy,
             backtest_state['results'] = results
             backtest_state['progress'] = ''
             backtest_state['engine'] = engine
+            _backtest_changed()
 
         logger.info(f"백테스트 완료: 수익률={results['metrics']['total_return']}%, "
                      f"MDD={results['metrics']['mdd']}%, DB크기={db_stats['db_size_mb']}MB")
@@ -469,6 +952,7 @@ def run_backtest_task(period_months, initial_capital, strategy,
             backtest_state['status'] = 'error'
             backtest_state['error_msg'] = str(e)
             backtest_state['progress'] = ''
+            _backtest_changed()
 
 
 # ============================================================
@@ -476,7 +960,7 @@ def run_backtest_task(period_months, initial_capital, strategy,
 # ============================================================
 @app.route('/backtest')
 def backtest_page():
-    return render_template_string(BACKTEST_TEMPLATE)
+    return _page_response(BACKTEST_PAGE)
 
 
 @app.route('/api/backtest/run', methods=['POST'])
@@ -536,60 +1020,142 @@ def api_backtest_run():
             progress='백테스트 준비 중...',
             engine=None,
         )
+        _backtest_changed()
 
-    thread = threading.Thread(
-        target=run_backtest_task,
-        args=(
+    try:
+        backtest_executor.submit(
+            run_backtest_task,
             period, capital, strategy, slippage, commission, tax,
             score_filters, item_filters,
-        ),
-        kwargs={'stop_loss_pct': stop_loss},
-        daemon=True,
-    )
-    try:
-        thread.start()
+            stop_loss_pct=stop_loss,
+        )
     except Exception as e:
         with bt_lock:
             backtest_state['status'] = 'error'
             backtest_state['error_msg'] = str(e)
             backtest_state['progress'] = ''
+            _backtest_changed()
         return jsonify({'error': '백테스트 작업을 시작하지 못했습니다.'}), 500
     return jsonify({'status': 'started', 'message': '백테스트를 시작합니다.'})
 
 
+def _backtest_status_body(tag, encoding):
+    """상태 JSON을 revision마다 한 번만 직렬화하고, gzip도 처음 요청될 때 한 번만 압축한다.
+
+    bt_lock을 잡은 채로 호출한다.
+    """
+    if _backtest_status_cache['tag'] != tag:
+        body = orjson.dumps(
+            {
+                'status': backtest_state['status'],
+                'results': backtest_state['results'],
+                'error_msg': backtest_state['error_msg'],
+                'progress': backtest_state['progress'],
+                'revision': tag,
+            },
+            default=app.json.default,
+            option=(orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+                    | orjson.OPT_SERIALIZE_NUMPY),
+        )
+        _backtest_status_cache.update(tag=tag, body=body, gzip=None)
+    if encoding == 'gzip':
+        if _backtest_status_cache['gzip'] is None:
+            # 결과 JSON은 반복이 많아 레벨 1로도 충분히 줄고, 압축 시간은 짧다.
+            _backtest_status_cache['gzip'] = gzip.compress(
+                _backtest_status_cache['body'], compresslevel=1, mtime=0
+            )
+        return _backtest_status_cache['gzip']
+    return _backtest_status_cache['body']
+
+
 @app.route('/api/backtest/status')
 def api_backtest_status():
+    """백테스트 진행 상태·결과 - 상태가 그대로면 결과를 다시 직렬화하지 않고 304"""
+    encoding = 'gzip' if request.accept_encodings['gzip'] else None
     with bt_lock:
-        return jsonify({
-            'status': backtest_state['status'],
-            'results': backtest_state['results'],
-            'error_msg': backtest_state['error_msg'],
-            'progress': backtest_state['progress'],
-        })
+        tag = _backtest_tag()
+        etag = f'{tag}-{encoding}' if encoding else tag
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(
+                _backtest_status_body(tag, encoding), mimetype='application/json'
+            )
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+
+@app.route('/api/backtest/events')
+def api_backtest_events():
+    """백테스트 진행 상황을 바뀔 때마다 푸시하는 SSE 스트림
+
+    progress 이벤트로 진행 문구를 보내고, 끝나면 done 또는 error 이벤트를
+    한 번 보낸 뒤 닫는다. 결과는 done을 받은 클라이언트가 상태 API로 가져간다. 실행 중이 아니면 idle 이벤트만 보내고 닫는다.
+    """
+    def events():
+        revision = None
+        while True:
+            with bt_changed:
+                if backtest_state['revision'] == revision:
+                    bt_changed.wait(timeout=STATUS_STREAM_KEEPALIVE)
+                if backtest_state['revision'] == revision:
+                    snapshot = None
+                else:
+                    revision = backtest_state['revision']
+                    tag = _backtest_tag()
+                    snapshot = {
+                        key: backtest_state[key]
+                        for key in ('status', 'results', 'error_msg', 'progress')
+                    }
+            if snapshot is None:
+                yield b': keep-alive\n\n'
+                continue
+            status = snapshot['status']
+            if status == 'loading':
+                yield _sse_event(tag, 'progress', {'progress': snapshot['progress']})
+                continue
+            if status == 'done':
+                # 결과 본문은 압축·캐시되는 /api/backtest/status로 받게 하고 완료만 알린다.
+                yield _sse_event(tag, 'done', {})
+            elif status == 'error':
+                yield _sse_event(tag, 'error', {'error_msg': snapshot['error_msg']})
+            else:
+                yield _sse_event(tag, 'idle', {})
+            return
 
+    return Response(
+        events(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
 
-@app.route('/api/backtest/csv')
-def api_backtest_csv():
-    """일자별 종목별 상세 데이터 CSV 다운로드"""
-    import csv
-    import io
 
-    with bt_lock:
-        engine = backtest_state.get('engine')
-        results = backtest_state.get('results')
+def _sse_event(event_id, name, payload):
+    """id는 상태 태그라 클라이언트가 e.lastEventId로 받은 결과의 버전을 안다."""
+    head = f'id: {event_id}\nevent: {name}\ndata: '.encode()
+    return head + app.json.dumps(payload).encode() + b'\n\n'
 
-    if not engine or not results:
-        return jsonify({'error': '백테스트 결과가 없습니다.'}), 404
 
-    # 일자별 상세 데이터 생성
-    daily_rows = engine.get_daily_detail()
+def _backtest_csv_lines(engine, results):
+    """백테스트 CSV를 한 줄씩 만든다 (일자별 상세 + 매매 상세 이력)."""
+    # 한 줄씩 써서 바로 내보내고 버퍼를 비워 전체 CSV를 메모리에 두지 않는다.
+    buffer = io.StringIO()
+    writerow = csv.writer(buffer).writerow
 
-    output = io.StringIO()
-    # BOM for Excel 한글 호환
-    output.write('\ufeff')
+    def line(values):
+        writerow(values)
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
 
-    writer = csv.writer(output)
-    writer.writerow([
+    # BOM for Excel 한글 호환
+    yield '\ufeff'
+    yield line([
         '날짜', '종목코드', '종목명',
         '시가', '고가', '저가', '종가', '거래량',
         '매매구분', '매매수량', '체결가', '거래비용',
@@ -597,8 +1163,9 @@ def api_backtest_csv():
         '포트폴리오총자산', '포트폴리오현금',
     ])
 
-    for row in daily_rows:
-        writer.writerow([
+    # 일자별 상세 데이터
+    for row in engine.iter_daily_detail():
+        yield line([
             row['date'], row['ticker'], row['name'],
             row['open'], row['high'], row['low'], row['close'], row['volume'],
             row['action'], row['shares_traded'],
@@ -608,9 +1175,9 @@ def api_backtest_csv():
         ])
 
     # 매매 이력 시트 (별도 섹션)
-    writer.writerow([])
-    writer.writerow(['=== 매매 상세 이력 ==='])
-    writer.writerow([
+    yield line([])
+    yield line(['=== 매매 상세 이력 ==='])
+    yield line([
         '종목코드', '종목명',
         '매수일', '매수가', '매수수량',
         '매입금액', '평균단가', '총매입금액',
@@ -619,7 +1186,7 @@ def api_backtest_csv():
         '실현손익', '수익률(%)', '상태',
     ])
     for t in (results.get('trades') or []):
-        writer.writerow([
+        yield line([
             t['ticker'], t['name'],
             t['entry_date'], t['entry_price'], t['shares'],
             t['buy_amount'], t['avg_price'], t['total_buy_amount'],
@@ -630,8 +1197,42 @@ def api_backtest_csv():
             t['status'],
         ])
 
-    csv_data = output.getvalue()
-    output.close()
+
+def _backtest_csv_gzip(tag, engine, results):
+    """결과(revision 태그)마다 CSV를 한 번만 gzip으로 만들어 둔다.
+
+    행을 만드는 대로 압축 스트림에 써서 압축 전 CSV 전체를 메모리에 두지 않는다.
+    빌드는 _backtest_csv_lock 아래에서 하고, 그 사이 결과가 바뀌었으면 캐시에 넣지 않는다.
+    """
+    with _backtest_csv_lock:
+        if _backtest_csv_cache['tag'] == tag:
+            return _backtest_csv_cache['gzip']
+        packed = io.BytesIO()
+        with gzip.GzipFile(fileobj=packed, mode='wb', compresslevel=6, mtime=0) as stream:
+            write = stream.write
+            for text in _backtest_csv_lines(engine, results):
+                write(text.encode('utf-8'))
+        body = packed.getvalue()
+        with bt_lock:
+            if _backtest_tag() == tag:
+                _backtest_csv_cache.update(tag=tag, gzip=body)
+    return body
+
+
+@app.route('/api/backtest/csv')
+def api_backtest_csv():
+    """일자별 종목별 상세 데이터 CSV 다운로드
+
+    gzip을 받는 클라이언트에는 결과마다 한 번 압축해 둔 CSV를 그대로 보내고,
+    그 외에는 기존처럼 행 단위로 스트리밍한다.
+    """
+    with bt_lock:
+        engine = backtest_state.get('engine')
+        results = backtest_state.get('results')
+        tag = _backtest_tag()
+
+    if not engine or not results:
+        return jsonify({'error': '백테스트 결과가 없습니다.'}), 404
 
     # 파일명에 전략명과 날짜 포함
     config = results.get('config', {})
@@ -639,11 +1240,19 @@ def api_backtest_csv():
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     filename = f'backtest_{strategy_name}_{timestamp}.csv'
 
-    return Response(
-        csv_data,
-        mimetype='text/csv; charset=utf-8-sig',
-        headers={'Content-Disposition': f'attachment; filename={filename}'}
-    )
+    headers = {'Content-Disposition': f'attachment; filename={filename}'}
+    if request.accept_encodings['gzip']:
+        body = _backtest_csv_gzip(tag, engine, results)
+        response = Response(body, mimetype='text/csv; charset=utf-8-sig', headers=headers)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(
+            _backtest_csv_lines(engine, results),
+            mimetype='text/csv; charset=utf-8-sig',
+            headers=headers,
+        )
+    response.vary.add('Accept-Encoding')
+    return response
 
 
 # ============================================================
@@ -651,7 +1260,7 @@ def api_backtest_csv():
 # ============================================================
 @app.route('/db')
 def db_viewer():
-    return render_template_string(DB_VIEWER_TEMPLATE)
+    return _page_response(DB_VIEWER_PAGE)
 
 @app.route('/api/db/tables')
 def api_db_tables():
@@ -709,6 +1318,7 @@ HTML_TEMPLATE = r'''<!DOCTYPE html>
 <meta charset="UTF-8">
 <meta name="viewport" content="width=device-width,initial-scale=1">
 <title>한국 증시 종합 스크리닝</title>
+<link rel="preload" href="/api/status" as="fetch" crossorigin="anonymous">
 <style>
 *{margin:0;padding:0;box-sizing:border-box}
 body{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI','Noto Sans KR',sans-serif;background:#f0f2f5;color:#1a1a2e;line-height:1.6}
@@ -760,10 +1370,12 @@ tr:hover{background:#f8fafc}.c{text-align:center}
 .score-1{background:#fff}
 .badge{display:inline-block;padding:3px 10px;border-radius:20px;font-weight:700;font-size:12px}
 .b3{background:#dcfce7;color:#16a34a}.b2{background:#fef3c7;color:#d97706}.b1{background:#f3f4f6;color:#6b7280}
-.tag{display:inline-block;padding:2px 7px;border-radius:4px;font-size:10px;font-weight:600;margin:1px}
+.tag{display:inline-block;padding:2px 7px;border-radius:4px;font-size:10px;font-weight:600;margin:1px 5px 1px 1px}
 .tag.turn{background:#dbeafe;color:#2563eb}.tag.supply{background:#fce7f3;color:#db2777}.tag.nps{background:#d1fae5;color:#059669}
 .sn{white-space:nowrap}.det{font-size:11px}
-.d{display:inline-block;padding:2px 5px;margin:1px;border-radius:3px;font-size:10px;white-space:nowrap}
+.vs{max-height:70vh;overflow-y:auto}
+.vs-pad td{padding:0;border:0}.vs-pad:hover{background:none}
+.d{display:inline-block;padding:2px 5px;margin:1px 4px 1px 1px;border-radius:3px;font-size:10px;white-space:nowrap}
 .d.turn{background:#eff6ff;color:#1d4ed8}.d.supply{background:#fff1f2;color:#be123c}.d.nps{background:#ecfdf5;color:#047857}
 .st{font-size:12px}.st th{background:#f1f5f9;font-size:12px;padding:8px 10px}.st td{padding:7px 10px}
 .ft{text-align:center;padding:20px;color:#9ca3af;font-size:11px}
@@ -830,7 +1442,7 @@ tr:hover{background:#f8fafc}.c{text-align:center}
     </div>
 
     <div class="tc">
-        <div id="m" class="tp a">
+        <div id="m" class="tp a vs">
             <table><thead><tr>
                 <th style="width:45px" class="c">No.</th>
                 <th style="width:130px">종목명</th>
@@ -842,16 +1454,16 @@ tr:hover{background:#f8fafc}.c{text-align:center}
         </div>
         <div id="t" class="tp">
             <h3 style="padding:14px 14px 0;color:#2563eb">연간실적호전 종목 (단위: 억원, 배)</h3>
-            <table class="st"><thead id="turnHead"></thead><tbody id="turnBody"></tbody></table>
+            <table class="st" id="turnTable"></table>
         </div>
         <div id="s" class="tp">
             <h3 style="padding:14px 14px 0;color:#db2777">외국인/기관 동반 순매수 전환 종목</h3>
-            <table class="st"><thead id="supplyHead"></thead><tbody id="supplyBody"></tbody></table>
+            <table class="st" id="supplyTable"></table>
         </div>
         <div id="n" class="tp">
             <h3 style="padding:14px 14px 0;color:#059669">국민연금 신규/추가매수 신호</h3>
             <p style="padding:6px 14px 0;color:#6b7280;font-size:12px">FnGuide 공개 주요주주 범위의 국민연금 신규·추가매수 신호는 매수일부터 3개월 동안만 1점으로 반영됩니다.</p>
-            <table class="st"><thead id="npsHead"></thead><tbody id="npsBody"></tbody></table>
+            <table class="st" id="npsTable"></table>
         </div>
     </div>
 
@@ -870,22 +1482,58 @@ tr:hover{background:#f8fafc}.c{text-align:center}
 
 <script>
 let pollTimer = null;
+let statusStream = null;
+let statusRequest = null;
+let dataRequest = null;
+let dataVersion = null;
+// 종합 결과는 보이는 구간의 행만 DOM에 두고 나머지는 위아래 여백 행으로 대신한다.
+const ROW_WINDOW = 50;
+const ROW_OVERSCAN = 10;
+let mainRows = [];
+let shownRows = [];
+let scoreFilter = 'all';
+let searchQuery = '';
+let rowHeight = 0;
+let windowStart = -1;
+let windowEnd = -1;
+let scrollFrame = 0;
+let searchFrame = 0;
+let rowParser = null;
+
+// 자주 쓰는 고정 요소는 페이지 로드 때 한 번만 찾아 둔다.
+const ELEMENT_IDS = [
+    'm', 'mainBody', 'toast', 'refreshBtn', 'loadingOverlay', 'updateInfo',
+    'stat3', 'stat2', 'stat1', 'statTurn', 'statSupply', 'statNps',
+    'tabTurn', 'tabSupply', 'tabNps', 'turnTable', 'supplyTable', 'npsTable',
+];
+const els = {};
 
 // 페이지 로드 시 데이터 가져오기
-window.addEventListener('DOMContentLoaded', () => { fetchStatus(); });
+window.addEventListener('DOMContentLoaded', () => {
+    ELEMENT_IDS.forEach(id => { els[id] = document.getElementById(id); });
+    els.m.addEventListener('scroll', () => {
+        if (scrollFrame) return;
+        scrollFrame = requestAnimationFrame(() => {
+            scrollFrame = 0;
+            renderMainWindow();
+        });
+    }, { passive: true });
+    fetchStatus();
+});
 
 function showToast(msg, type='info') {
-    const t = document.getElementById('toast');
+    const t = els.toast;
     t.textContent = msg;
     t.className = 'toast ' + type + ' show';
     setTimeout(() => t.classList.remove('show'), 3000);
 }
 
 function doRefresh() {
-    const btn = document.getElementById('refreshBtn');
+    const btn = els.refreshBtn;
     btn.classList.add('loading');
     btn.disabled = true;
-    document.getElementById('loadingOverlay').classList.add('show');
+    els.loadingOverlay.classList.add('show');
+    stopWatching();
 
     fetch('/api/refresh', { method: 'POST' })
         .then(r => r.json())
@@ -895,42 +1543,121 @@ function doRefresh() {
             } else {
                 showToast('데이터 갱신을 시작합니다...', 'info');
             }
-            // 폴링 시작
-            if (pollTimer) clearInterval(pollTimer);
-            pollTimer = setInterval(pollStatus, 2000);
+            // 완료 대기 시작
+            startPolling();
         })
         .catch(e => {
             showToast('갱신 요청 실패: ' + e.message, 'error');
             btn.classList.remove('loading');
             btn.disabled = false;
-            document.getElementById('loadingOverlay').classList.remove('show');
+            els.loadingOverlay.classList.remove('show');
+        });
+}
+
+function isAbort(e) {
+    return e && e.name === 'AbortError';
+}
+
+// 새 요청이 오면 아직 끝나지 않은 이전 데이터 요청은 취소한다. 취소되면 null로 끝난다.
+function loadData() {
+    if (dataRequest) dataRequest.abort();
+    const request = dataRequest = new AbortController();
+    return fetch('/api/data', { signal: request.signal })
+        .then(r => r.json())
+        .then(d => {
+            dataVersion = d.version;
+            return d;
+        })
+        .catch(e => {
+            if (isAbort(e)) return null;
+            throw e;
+        })
+        .finally(() => {
+            if (dataRequest === request) dataRequest = null;
         });
 }
 
+// 진행 중인 상태 대기(SSE, 롱 폴링, 재시도 타이머)를 모두 정리한다.
+function stopWatching() {
+    if (pollTimer) {
+        clearTimeout(pollTimer);
+        pollTimer = null;
+    }
+    if (statusStream) {
+        statusStream.close();
+        statusStream = null;
+    }
+    if (statusRequest) {
+        statusRequest.abort();
+        statusRequest = null;
+    }
+}
+
+function startPolling() {
+    stopWatching();
+    if (window.EventSource) streamStatus();
+    else pollStatus();
+}
+
+function finishPolling() {
+    els.refreshBtn.classList.remove('loading');
+    els.refreshBtn.disabled = false;
+    els.loadingOverlay.classList.remove('show');
+}
+
+function handleStatus(d) {
+    if (d.status === 'done') {
+        finishPolling();
+        // 결과가 바뀌지 않았으면(갱신 실패 등) 테이블을 다시 그리지 않는다.
+        if (d.version !== dataVersion) loadData().then(data => { if (data) renderData(data); });
+        if (d.error_msg) {
+            showToast(d.error_msg, 'error');
+        } else {
+            showToast('데이터 갱신 완료!', 'success');
+        }
+    } else if (d.status === 'error') {
+        finishPolling();
+        showToast('갱신 실패: ' + d.error_msg, 'error');
+    } else if (d.status === 'loading') {
+        startPolling();
+    } else {
+        finishPolling();
+    }
+}
+
+// 서버가 갱신 완료 시 상태를 한 번 푸시하는 SSE 연결 하나로 기다린다.
+function streamStatus() {
+    pollTimer = null;
+    const es = statusStream = new EventSource('/api/status/stream');
+    es.onmessage = e => {
+        es.close();
+        statusStream = null;
+        handleStatus(JSON.parse(e.data));
+    };
+    es.onerror = () => {
+        // 자동 재연결 대신 롱 폴링으로 이어 간다.
+        es.close();
+        statusStream = null;
+        pollTimer = setTimeout(pollStatus, 2000);
+    };
+}
+
+// SSE를 쓸 수 없을 때: 서버가 갱신 완료(또는 timeout)까지 응답을 미루는 롱 폴링
 function pollStatus() {
-    fetch('/api/status')
+    pollTimer = null;
+    const request = statusRequest = new AbortController();
+    fetch('/api/status/wait?timeout=25', { signal: request.signal })
         .then(r => r.json())
         .then(d => {
-            if (d.status === 'done') {
-                clearInterval(pollTimer);
-                pollTimer = null;
-                document.getElementById('refreshBtn').classList.remove('loading');
-                document.getElementById('refreshBtn').disabled = false;
-                document.getElementById('loadingOverlay').classList.remove('show');
-                renderData(d);
-                if (d.error_msg) {
-                    showToast(d.error_msg, 'error');
-                } else {
-                    showToast('데이터 갱신 완료!', 'success');
-                }
-            } else if (d.status === 'error') {
-                clearInterval(pollTimer);
-                pollTimer = null;
-                document.getElementById('refreshBtn').classList.remove('loading');
-                document.getElementById('refreshBtn').disabled = false;
-                document.getElementById('loadingOverlay').classList.remove('show');
-                showToast('갱신 실패: ' + d.error_msg, 'error');
-            }
+            statusRequest = null;
+            if (d.status === 'loading') pollStatus();
+            else handleStatus(d);
+        })
+        .catch(e => {
+            // 새 대기가 시작되며 취소된 요청은 재시도하지 않는다.
+            if (isAbort(e) || statusRequest !== request) return;
+            statusRequest = null;
+            pollTimer = setTimeout(pollStatus, 2000);
         });
 }
 
@@ -938,94 +1665,131 @@ function fetchStatus() {
     fetch('/api/status')
         .then(r => r.json())
         .then(d => {
-            if (d.status === 'done' && d.result && d.result.length > 0) {
-                renderData(d);
+            if (d.status === 'done') {
+                loadData().then(data => {
+                    if (!data) return;
+                    if (data.result && data.result.length > 0) renderData(data);
+                    else renderEmpty();
+                });
             } else if (d.status === 'loading') {
-                document.getElementById('refreshBtn').classList.add('loading');
-                document.getElementById('refreshBtn').disabled = true;
-                document.getElementById('loadingOverlay').classList.add('show');
-                pollTimer = setInterval(pollStatus, 2000);
+                els.refreshBtn.classList.add('loading');
+                els.refreshBtn.disabled = true;
+                els.loadingOverlay.classList.add('show');
+                startPolling();
             } else {
-                document.getElementById('mainBody').innerHTML =
-                    '<tr><td colspan="5" class="empty-state"><p>데이터가 없습니다</p><p style="font-size:13px">재조회 버튼을 눌러 데이터를 수집하세요</p></td></tr>';
+                renderEmpty();
             }
         });
 }
 
-function escapeHtml(value) {
-    const element = document.createElement('div');
-    element.textContent = value == null ? '' : String(value);
-    return element.innerHTML;
+function renderEmpty() {
+    mainRows = [];
+    shownRows = [];
+    windowStart = windowEnd = -1;
+    els.mainBody.innerHTML =
+        '<tr><td colspan="5" class="empty-state"><p>데이터가 없습니다</p><p style="font-size:13px">재조회 버튼을 눌러 데이터를 수집하세요</p></td></tr>';
 }
 
 function renderData(d) {
     const stats = d.stats || {};
-    document.getElementById('stat3').textContent = stats.score_3 || 0;
-    document.getElementById('stat2').textContent = stats.score_2 || 0;
-    document.getElementById('stat1').textContent = stats.score_1 || 0;
-    document.getElementById('statTurn').textContent = stats.turn_count || 0;
-    document.getElementById('statSupply').textContent = stats.supply_count || 0;
-    document.getElementById('statNps').textContent = stats.nps_count || 0;
-    document.getElementById('updateInfo').textContent = '마지막 갱신: ' + (d.last_updated || '-');
-    document.getElementById('tabTurn').textContent = '연간실적호전 (' + (stats.turn_count||0) + ')';
-    document.getElementById('tabSupply').textContent = '순매수전환 (' + (stats.supply_count||0) + ')';
-    document.getElementById('tabNps').textContent = '국민연금 매수 (' + (stats.nps_count||0) + ')';
+    els.stat3.textContent = stats.score_3 || 0;
+    els.stat2.textContent = stats.score_2 || 0;
+    els.stat1.textContent = stats.score_1 || 0;
+    els.statTurn.textContent = stats.turn_count || 0;
+    els.statSupply.textContent = stats.supply_count || 0;
+    els.statNps.textContent = stats.nps_count || 0;
+    els.updateInfo.textContent = '마지막 갱신: ' + (d.last_updated || '-');
+    els.tabTurn.textContent = '연간실적호전 (' + (stats.turn_count||0) + ')';
+    els.tabSupply.textContent = '순매수전환 (' + (stats.supply_count||0) + ')';
+    els.tabNps.textContent = '국민연금 매수 (' + (stats.nps_count||0) + ')';
 
     // 메인 테이블
-    const body = document.getElementById('mainBody');
-    body.innerHTML = '';
-    (d.result || []).forEach((r, i) => {
-        const s = r['종합점수'];
-        let tags = '';
-        (r['출처'] || '').split(', ').forEach(src => {
-            const cls = src.includes('실적') ? 'turn' : (src.includes('순매수') ? 'supply' : 'nps');
-            tags += `<span class="tag ${cls}">${escapeHtml(src)}</span> `;
-        });
-        let details = '';
-        Object.keys(r).forEach(k => {
-            const v = r[k];
-            if (!v || v === '') return;
-            if (k.startsWith('[턴]')) details += `<span class="d turn">${escapeHtml(k.slice(3))}: ${escapeHtml(v)}</span> `;
-            else if (k.startsWith('[수급]')) details += `<span class="d supply">${escapeHtml(k.slice(4))}: ${escapeHtml(v)}</span> `;
-            else if (k.startsWith('[연금]')) details += `<span class="d nps">${escapeHtml(k.slice(4))}: ${escapeHtml(v)}</span> `;
-        });
-        body.innerHTML += `<tr class="score-${s}" data-score="${s}">
-            <td class="c">${i+1}</td>
-            <td class="sn"><b>${escapeHtml(r['종목명'])}</b></td>
-            <td class="c"><span class="badge b${s}">${s}점</span></td>
-            <td>${tags}</td>
-            <td class="det">${details}</td>
-        </tr>`;
-    });
+    mainRows = (d.result || []).map(r => ({
+        score: +r['종합점수'],
+        name: searchKey(r['종목명'] == null ? '' : String(r['종목명'])),
+        html: r._row_html,
+    }));
+    applyRowFilters();
 
     // 서브 테이블들
-    renderSubTable(d.turn || [], 'turnHead', 'turnBody');
-    renderSubTable(d.supply || [], 'supplyHead', 'supplyBody');
-    renderSubTable(d.nps || [], 'npsHead', 'npsBody');
+    const tables = d.tables || {};
+    els.turnTable.innerHTML = tables.turn || '';
+    els.supplyTable.innerHTML = tables.supply || '';
+    els.npsTable.innerHTML = tables.nps || '';
 }
 
-function renderSubTable(data, headId, bodyId) {
-    if (!data.length) return;
-    const cols = Object.keys(data[0]).filter(c => c !== 'No.');
-    document.getElementById(headId).innerHTML = '<tr>' + cols.map(c => `<th>${escapeHtml(c)}</th>`).join('') + '</tr>';
-    document.getElementById(bodyId).innerHTML = data.map(r =>
-        '<tr>' + cols.map(c => `<td>${escapeHtml(r[c] || '')}</td>`).join('') + '</tr>'
-    ).join('');
+function applyRowFilters() {
+    shownRows = mainRows.filter(r =>
+        (scoreFilter === 'all' || r.score >= scoreFilter) && r.name.includes(searchQuery));
+    els.m.scrollTop = 0;
+    windowStart = windowEnd = -1;
+    renderMainWindow();
+}
+
+function padRow(height) {
+    const tr = document.createElement('tr');
+    tr.className = 'vs-pad';
+    tr.style.height = height + 'px';
+    tr.appendChild(document.createElement('td')).colSpan = 5;
+    return tr;
+}
+
+// 서버가 만든 행 HTML은 처음 보일 때 한 번만 파싱하고, 이후 스크롤에서는 만든 <tr>을 재사용한다.
+function rowElements(rows) {
+    const pending = rows.filter(r => !r.el);
+    if (pending.length) {
+        rowParser = rowParser || document.createElement('template');
+        rowParser.innerHTML = pending.map(r => r.html).join('');
+        const parsed = Array.from(rowParser.content.children);
+        pending.forEach((r, i) => { r.el = parsed[i]; });
+    }
+    return rows.map(r => r.el);
+}
+
+function renderMainWindow() {
+    const height = rowHeight || 40;
+    const start = Math.max(0, Math.floor(els.m.scrollTop / height) - ROW_OVERSCAN);
+    const end = Math.min(shownRows.length, start + ROW_WINDOW);
+    if (start === windowStart && end === windowEnd) return;
+    windowStart = start;
+    windowEnd = end;
+    const nodes = rowElements(shownRows.slice(start, end));
+    const first = nodes[0];
+    if (start > 0) nodes.unshift(padRow(start * height));
+    if (end < shownRows.length) nodes.push(padRow((shownRows.length - end) * height));
+    els.mainBody.replaceChildren(...nodes);
+    if (!rowHeight && first) {
+        // 첫 행 높이로 여백을 잡는다. 탭이 숨겨져 있으면 0이라 다음 표시 때 다시 잰다.
+        rowHeight = first.offsetHeight;
+        if (rowHeight) {
+            windowStart = -1;
+            renderMainWindow();
+        }
+    }
+}
+
+// 입력기에 따라 한글이 자모 분리(NFD)로 들어와도 같은 이름으로 찾도록 NFC로 맞춘다.
+// 행 쪽 키는 렌더링 때 한 번만 만들고, 검색어는 입력마다 한 번만 변환해 includes로 비교한다.
+function searchKey(text) {
+    return text.normalize('NFC').toLowerCase();
 }
 
 function filt(v, btn) {
     document.querySelectorAll('.fb button').forEach(b => b.classList.remove('a'));
     if (btn) btn.classList.add('a');
-    document.querySelectorAll('#mainBody tr').forEach(r => {
-        const s = +r.dataset.score;
-        r.style.display = v === 'all' || s >= v ? '' : 'none';
-    });
+    if (v === scoreFilter) return;
+    scoreFilter = v;
+    applyRowFilters();
 }
 
 function srch(q) {
-    q = q.trim().toLowerCase();
-    document.querySelectorAll('#mainBody tr').forEach(r => {
-        r.style.display = r.querySelector('.sn').textContent.toLowerCase().includes(q) ? '' : 'none';
+    // 입력이 몰리면 프레임당 한 번만 마지막 검색어로 행을 갱신한다.
+    cancelAnimationFrame(searchFrame);
+    searchFrame = requestAnimationFrame(() => {
+        q = searchKey(q.trim());
+        if (q === searchQuery) return;
+        searchQuery = q;
+        applyRowFilters();
     });
 }
 
@@ -1034,10 +1798,15 @@ function showTab(id, btn) {
     document.querySelectorAll('.tb').forEach(b => b.classList.remove('a'));
     document.getElementById(id).classList.add('a');
     if (btn) btn.classList.add('a');
+    if (id === 'm' && !rowHeight) {
+        windowStart = -1;
+        renderMainWindow();
+    }
 }
 </script>
 </body>
 </html>'''
+INDEX_PAGE = _static_page(HTML_TEMPLATE, 'dashboard')
 
 
 # ============================================================
@@ -1049,7 +1818,8 @@ BACKTEST_TEMPLATE = r'''<!DOCTYPE html>
 <meta charset="UTF-8">
 <meta name="viewport" content="width=device-width,initial-scale=1">
 <title>백테스트 - 한국 증시 스크리닝</title>
-<script src="https://cdnjs.cloudflare.com/ajax/libs/Chart.js/4.4.1/chart.umd.min.js"></script>
+<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/uplot@1.6.30/dist/uPlot.min.css">
+<script defer src="https://cdn.jsdelivr.net/npm/uplot@1.6.30/dist/uPlot.iife.min.js"></script>
 <style>
 *{margin:0;padding:0;box-sizing:border-box}
 body{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI','Noto Sans KR',sans-serif;background:#f0f2f5;color:#1a1a2e;line-height:1.6}
@@ -1089,9 +1859,9 @@ body{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI','Noto Sans KR',sans
 .sc .n{font-size:28px;font-weight:700}.sc .l{font-size:11px;color:#666;margin-top:3px}
 .pos .n{color:#16a34a}.neg .n{color:#dc2626}.neu .n{color:#374151}
 .chart-row{display:grid;grid-template-columns:1fr 1fr;gap:20px;margin-bottom:22px}
-.chart-box{background:#fff;border-radius:12px;padding:20px;box-shadow:0 2px 8px rgba(0,0,0,.06)}
+.chart-box{background:#fff;border-radius:12px;padding:20px;box-shadow:0 2px 8px rgba(0,0,0,.06);min-width:0}
 .chart-box h3{font-size:14px;font-weight:600;color:#374151;margin-bottom:12px}
-.chart-box canvas{width:100%!important;height:300px!important}
+.chart-box .u-legend{font-size:11px}
 .tbl-box{background:#fff;border-radius:12px;overflow-x:auto;box-shadow:0 2px 8px rgba(0,0,0,.06);margin-bottom:20px}
 .tbl-box h3{padding:16px 20px 8px;font-size:14px;font-weight:600;color:#374151}
 table{width:100%;border-collapse:collapse;font-size:13px}
@@ -1099,6 +1869,8 @@ thead{background:#f8f9fa;position:sticky;top:0}
 th{padding:10px 14px;text-align:left;font-weight:600;color:#374151;border-bottom:2px solid #e5e7eb;white-space:nowrap}
 td{padding:9px 14px;border-bottom:1px solid #f3f4f6}
 tr:hover{background:#f8fafc}
+.vs{max-height:600px;overflow:auto}
+.vs-pad td{padding:0;border:0}.vs-pad:hover{background:none}
 .c{text-align:center}.r{text-align:right}
 .pos-text{color:#16a34a;font-weight:600}.neg-text{color:#dc2626;font-weight:600}
 .ft{text-align:center;padding:20px;color:#9ca3af;font-size:11px}
@@ -1205,11 +1977,11 @@ tr:hover{background:#f8fafc}
         <div class="chart-row">
             <div class="chart-box">
                 <h3>수익률 곡선 (Equity Curve)</h3>
-                <canvas id="equityChart"></canvas>
+                <div id="equityChart"></div>
             </div>
             <div class="chart-box">
                 <h3>낙폭 (Drawdown)</h3>
-                <canvas id="ddChart"></canvas>
+                <div id="ddChart"></div>
             </div>
         </div>
         <div class="tbl-box">
@@ -1252,7 +2024,7 @@ tr:hover{background:#f8fafc}
                 <button onclick="resetTradeFilters()" style="padding:5px 10px;border:1px solid #d1d5db;border-radius:6px;font-size:12px;background:#fff;cursor:pointer">초기화</button>
                 <span id="tradeFilterCount" style="font-size:11px;color:#6b7280;margin-left:auto"></span>
             </div>
-            <div style="overflow-x:auto">
+            <div class="vs" id="tradeScroll">
             <table id="tradeTable" style="font-size:12px">
                 <thead><tr>
                     <th>종목코드</th><th>종목명</th>
@@ -1279,24 +2051,68 @@ tr:hover{background:#f8fafc}
 
 <script>
 let pollTimer = null;
+let backtestEvents = null;
 let equityChartObj = null;
 let ddChartObj = null;
+// 매매 이력은 보이는 구간의 행만 DOM에 두고 나머지는 위아래 여백 행으로 대신한다.
+const TRADE_WINDOW = 50;
+const TRADE_OVERSCAN = 10;
+let tradeRows = [];
+let tradeRowHeight = 0;
+let tradeWindowStart = -1;
+let tradeWindowEnd = -1;
+let tradeScrollFrame = 0;
 
 // 페이지 로드 시 기존 결과 확인
 window.addEventListener('DOMContentLoaded', () => {
+    document.getElementById('tradeScroll').addEventListener('scroll', () => {
+        if (tradeScrollFrame) return;
+        tradeScrollFrame = requestAnimationFrame(() => {
+            tradeScrollFrame = 0;
+            renderTradeWindow();
+        });
+    }, { passive: true });
+    // 같은 탭에서 다시 들어오면 지난 결과를 바로 그린다. 상태 확인은 계속하되
+    // 서버 상태가 그대로면 304로 끝나고, 같은 revision이면 다시 그리지 않는다.
+    const cached = loadCachedResults();
+    if (cached) renderResults(cached.results);
     fetch('/api/backtest/status').then(r=>r.json()).then(d => {
-        if (d.status === 'done' && d.results) renderResults(d.results);
+        if (d.status === 'done' && d.results) {
+            if (!cached || cached.revision !== d.revision) renderResults(d.results);
+            cacheResults(d.revision, d.results);
+        }
         else if (d.status === 'loading') startPolling();
     });
 });
 
+const RESULT_CACHE_KEY = 'backtest_last_v2';  // 결과 JSON 형식이 바뀌면 올린다
+const RESULT_CACHE_TTL = 3600 * 1000;
+
+function loadCachedResults() {
+    try {
+        const cached = JSON.parse(sessionStorage.getItem(RESULT_CACHE_KEY));
+        if (cached && Date.now() - cached.ts < RESULT_CACHE_TTL) return cached;
+    } catch (e) { /* 저장소를 못 쓰거나 값이 깨졌으면 서버 결과를 기다린다 */ }
+    return null;
+}
+
+function cacheResults(revision, results) {
+    try {
+        sessionStorage.setItem(RESULT_CACHE_KEY, JSON.stringify({ ts: Date.now(), revision, results }));
+    } catch (e) { /* 용량 초과 등은 캐시 없이 진행 */ }
+}
+
 function showToast(msg, type) {
     const t = document.getElementById('toast');
     t.textContent = msg; t.className = 'toast ' + type + ' show';
     setTimeout(() => t.classList.remove('show'), 3500);
 }
 
-function fmt(n) { return n.toString().replace(/\B(?=(\d{3})+(?!\d))/g, ','); }
+// 천 단위 구분은 한 번 만든 포매터로 한다 (셀마다 정규식 lookahead를 돌리지 않는다).
+// signDisplay 옵션은 구형 브라우저에서 RangeError를 내므로 쓰지 않고 -0은 fmt에서 0으로 바꾼다.
+const numberFormatter = new Intl.NumberFormat('en-US', { maximumFractionDigits: 20 });
+
+function fmt(n) { return numberFormatter.format(n === 0 ? 0 : n); }
 
 function runBacktest() {
     const btn = document.getElementById('runBtn');
@@ -1345,28 +2161,74 @@ function startPolling() {
     const btn = document.getElementById('runBtn');
     btn.classList.add('loading'); btn.disabled = true;
     document.getElementById('progressBar').classList.add('show');
-    if (pollTimer) clearInterval(pollTimer);
-    pollTimer = setInterval(pollStatus, 1500);
+    stopWatching();
+    if (!window.EventSource) {
+        pollTimer = setInterval(pollStatus, 1500);
+        return;
+    }
+    // 서버가 진행 상황이 바뀔 때만 푸시한다. 연결이 끊기면 1.5초 폴링으로 넘어간다.
+    backtestEvents = new EventSource('/api/backtest/events');
+    backtestEvents.addEventListener('progress', e => {
+        const d = JSON.parse(e.data);
+        if (d.progress) document.getElementById('progressText').textContent = d.progress;
+    });
+    backtestEvents.addEventListener('done', () => {
+        // 결과는 서버가 한 번 직렬화·압축해 두는 상태 API에서 받는다.
+        stopWatching();
+        pollStatus();
+    });
+    backtestEvents.addEventListener('error', e => {
+        // 서버의 error 이벤트에는 data가 있고, 연결 오류에는 없다.
+        stopWatching();
+        if (e.data) finishBacktest({ status: 'error', ...JSON.parse(e.data) });
+        else pollTimer = setInterval(pollStatus, 1500);
+    });
+    backtestEvents.addEventListener('idle', () => {
+        stopWatching();
+        finishBacktest({ status: 'idle' });
+    });
+}
+
+function stopWatching() {
+    if (backtestEvents) { backtestEvents.close(); backtestEvents = null; }
+    if (pollTimer) { clearInterval(pollTimer); pollTimer = null; }
 }
 
 function pollStatus() {
-    fetch('/api/backtest/status').then(r=>r.json()).then(d => {
+    fetch('/api/backtest/status').then(r => {
+        if (!r.ok) throw new Error('HTTP ' + r.status);
+        return r.json();
+    }).then(d => {
         if (d.progress) document.getElementById('progressText').textContent = d.progress;
-        if (d.status === 'done') {
-            clearInterval(pollTimer); pollTimer = null;
-            resetBtn();
-            document.getElementById('progressBar').classList.remove('show');
-            if (d.results) { renderResults(d.results); showToast('백테스트 완료!', 'success'); }
-        } else if (d.status === 'error') {
-            clearInterval(pollTimer); pollTimer = null;
-            resetBtn();
-            document.getElementById('progressBar').classList.remove('show');
-            showToast('실패: ' + d.error_msg, 'error');
-            document.getElementById('emptyState').style.display = '';
+        if (d.status !== 'loading') {
+            stopWatching();
+            finishBacktest(d);
+        } else if (!pollTimer && !backtestEvents) {
+            pollTimer = setInterval(pollStatus, 1500);
         }
+    }).catch(() => {
+        // done 이벤트 뒤 한 번만 조회하다 실패해도 1.5초 폴링으로 다시 시도한다.
+        if (!pollTimer) pollTimer = setInterval(pollStatus, 1500);
     });
 }
 
+function finishBacktest(d) {
+    resetBtn();
+    document.getElementById('progressBar').classList.remove('show');
+    if (d.status === 'done') {
+        if (d.results) {
+            renderResults(d.results);
+            cacheResults(d.revision, d.results);
+            showToast('백테스트 완료!', 'success');
+        }
+    } else if (d.status === 'error') {
+        showToast('실패: ' + d.error_msg, 'error');
+        document.getElementById('emptyState').style.display = '';
+    } else {
+        document.getElementById('emptyState').style.display = '';
+    }
+}
+
 function resetBtn() {
     const btn = document.getElementById('runBtn');
     btn.classList.remove('loading'); btn.disabled = false;
@@ -1394,10 +2256,9 @@ function renderResults(r) {
         <div class="sc neu"><div class="n">${m.sharpe}</div><div class="l">Sharpe Ratio</div></div>
         <div class="sc neu"><div class="n">${m.volatility}%</div><div class="l">변동성 (연)</div></div>
         <div class="sc neu"><div class="n">${m.trading_days}일</div><div class="l">거래일수</div></div>
-    `;
-    if (r.benchmark) {
-        grid.innerHTML += `<div class="sc ${posNeg(r.benchmark.return_pct)}"><div class="n">${r.benchmark.return_pct}%</div><div class="l">KOSPI 수익률</div></div>`;
-    }
+    ` + (r.benchmark
+        ? `<div class="sc ${posNeg(r.benchmark.return_pct)}"><div class="n">${r.benchmark.return_pct}%</div><div class="l">KOSPI 수익률</div></div>`
+        : '');
 
     // 거래 비용 내역
     const cc = r.cost_config || {};
@@ -1410,104 +2271,127 @@ function renderResults(r) {
         <div style="font-weight:700"><b>총 거래비용</b>: <span style="color:#dc2626">${fmt(cs.total || 0)}원</span></div>
     `;
 
-    renderEquityChart(r);
-    renderDDChart(r);
     renderStrategyStockTable(r);
     renderTradeHistory(r);
+
+    // rAF 콜백은 페인트 직전에 돌므로 거기서 setTimeout으로 한 번 더 미뤄 지표·표가 화면에 나온 뒤 차트를 그린다.
+    // 그 사이 새 결과가 오면 두 핸들을 모두 취소해 마지막 것만 그린다.
+    cancelAnimationFrame(chartFrame);
+    clearTimeout(chartTimer);
+    chartFrame = requestAnimationFrame(() => {
+        chartFrame = 0;
+        chartTimer = setTimeout(() => {
+            chartTimer = 0;
+            renderEquityChart(r);
+            renderDDChart(r);
+        }, 0);
+    });
+}
+
+// uPlot은 시리즈마다 평평한 배열 하나를 받아 한 번의 stroke로 그린다 (점 객체를 만들지 않는다).
+// x는 유닉스 초이고, 날짜 문자열을 UTC 자정으로 읽었으므로 표시도 UTC로 한다.
+const CHART_HEIGHT = 300;
+const CHART_DENSE_POINTS = 2000;
+let chartResizeFrame = 0;
+let chartFrame = 0;
+let chartTimer = 0;
+
+window.addEventListener('resize', () => {
+    if (chartResizeFrame) return;
+    chartResizeFrame = requestAnimationFrame(() => {
+        chartResizeFrame = 0;
+        [equityChartObj, ddChartObj].forEach(chart => {
+            if (chart) chart.setSize({ width: chart.root.parentNode.clientWidth, height: CHART_HEIGHT });
+        });
+    });
+});
+
+function dateSeconds(dates) {
+    const xs = new Float64Array(dates.length);
+    for (let i = 0; i < dates.length; i++) xs[i] = Date.parse(dates[i]) / 1000;
+    return xs;
+}
+
+function lineWidth(count, width) {
+    return count > CHART_DENSE_POINTS ? 1 : width;
+}
+
+function chartOptions(el, series, yTick) {
+    return {
+        width: el.clientWidth, height: CHART_HEIGHT,
+        tzDate: ts => uPlot.tzDate(new Date(ts * 1000), 'Etc/UTC'),
+        cursor: { points: { show: false } },
+        series: [{ value: '{YYYY}-{MM}-{DD}' }, ...series],
+        axes: [
+            { font: '10px sans-serif' },
+            { font: '10px sans-serif', size: 60, values: (u, splits) => splits.map(yTick) },
+        ],
+    };
+}
+
+// 같은 모양(시리즈 수·선 굵기)의 차트가 이미 있으면 데이터만 바꿔 다시 그린다.
+// 캔버스·축·범례를 새로 만들지 않는다.
+function drawChart(chart, el, series, yTick, data) {
+    if (chart && chart.series.length === series.length + 1
+        && series.every((s, i) => chart.series[i + 1].width === s.width)) {
+        chart.setData(data);
+        return chart;
+    }
+    if (chart) chart.destroy();
+    return new uPlot(chartOptions(el, series, yTick), data, el);
 }
 
 function renderEquityChart(r) {
-    const ctx = document.getElementById('equityChart').getContext('2d');
-    if (equityChartObj) equityChartObj.destroy();
-
-    const labels = r.equity_curve.map(d => d.date);
-    const datasets = [{
-        label: '포트폴리오',
-        data: r.equity_curve.map(d => d.equity),
-        borderColor: '#4f46e5', backgroundColor: 'rgba(79,70,229,.08)',
-        fill: true, tension: 0.3, pointRadius: 0, borderWidth: 2,
+    const el = document.getElementById('equityChart');
+
+    // 곡선은 서버가 열 단위({dates, equity})로 보내 그대로 typed array로 옮긴다.
+    const dates = r.equity_curve.dates;
+    const won = (u, v) => v == null ? '-' : fmt(Math.round(v)) + '원';
+    const data = [dateSeconds(dates), Float64Array.from(r.equity_curve.equity)];
+    const series = [{
+        label: '포트폴리오', value: won,
+        stroke: '#4f46e5', fill: 'rgba(79,70,229,.08)', width: lineWidth(dates.length, 2),
     }];
 
     if (r.benchmark && r.benchmark.curve) {
-        // 벤치마크 날짜를 포트폴리오 날짜에 맞춰 보간
-        const bMap = {}; r.benchmark.curve.forEach(b => bMap[b.date] = b.equity);
-        datasets.push({
-            label: 'KOSPI',
-            data: labels.map(d => bMap[d] || null),
-            borderColor: '#9ca3af', borderDash: [5,3],
-            fill: false, tension: 0.3, pointRadius: 0, borderWidth: 1.5,
+        // 벤치마크 날짜를 포트폴리오 날짜에 맞추고, 없는 날은 null로 두고 선으로 잇는다
+        const bench = r.benchmark.curve;
+        const bMap = {}; bench.dates.forEach((d, i) => bMap[d] = bench.equity[i]);
+        data.push(dates.map(d => bMap[d] || null));
+        series.push({
+            label: 'KOSPI', value: won, spanGaps: true,
+            stroke: '#9ca3af', dash: [5, 3], width: lineWidth(dates.length, 1.5),
         });
     }
 
-    equityChartObj = new Chart(ctx, {
-        type: 'line',
-        data: { labels, datasets },
-        options: {
-            responsive: true, maintainAspectRatio: false,
-            interaction: { mode: 'index', intersect: false },
-            plugins: {
-                tooltip: {
-                    callbacks: {
-                        label: ctx => ctx.dataset.label + ': ' + fmt(Math.round(ctx.parsed.y)) + '원'
-                    }
-                }
-            },
-            scales: {
-                x: { display: true, ticks: { maxTicksLimit: 8, font: { size: 10 } } },
-                y: {
-                    display: true,
-                    ticks: {
-                        callback: v => (v / 100000000).toFixed(1) + '억',
-                        font: { size: 10 }
-                    }
-                }
-            }
-        }
-    });
+    equityChartObj = drawChart(
+        equityChartObj, el, series, v => (v / 100000000).toFixed(1) + '억', data,
+    );
 }
 
 function renderDDChart(r) {
-    const ctx = document.getElementById('ddChart').getContext('2d');
-    if (ddChartObj) ddChartObj.destroy();
-
-    ddChartObj = new Chart(ctx, {
-        type: 'line',
-        data: {
-            labels: r.drawdown_curve.map(d => d.date),
-            datasets: [{
-                label: 'Drawdown',
-                data: r.drawdown_curve.map(d => d.dd),
-                borderColor: '#dc2626', backgroundColor: 'rgba(220,38,38,.1)',
-                fill: true, tension: 0.3, pointRadius: 0, borderWidth: 1.5,
-            }]
-        },
-        options: {
-            responsive: true, maintainAspectRatio: false,
-            plugins: {
-                tooltip: {
-                    callbacks: {
-                        label: ctx => 'DD: ' + ctx.parsed.y.toFixed(2) + '%'
-                    }
-                }
-            },
-            scales: {
-                x: { display: true, ticks: { maxTicksLimit: 8, font: { size: 10 } } },
-                y: { display: true, ticks: { callback: v => v.toFixed(0) + '%', font: { size: 10 } } }
-            }
-        }
-    });
+    const el = document.getElementById('ddChart');
+
+    const dates = r.drawdown_curve.dates;
+    const series = [{
+        label: 'Drawdown', value: (u, v) => v == null ? '-' : v.toFixed(2) + '%',
+        stroke: '#dc2626', fill: 'rgba(220,38,38,.1)', width: lineWidth(dates.length, 1.5),
+    }];
+    ddChartObj = drawChart(
+        ddChartObj, el, series, v => v.toFixed(0) + '%',
+        [dateSeconds(dates), Float64Array.from(r.drawdown_curve.dd)],
+    );
 }
 
 function renderStrategyStockTable(r) {
     const body = document.getElementById('strategyStockBody');
-    body.innerHTML = '';
     const pnlClass = value => value > 0 ? 'pos-text' : value < 0 ? 'neg-text' : '';
     const signed = (value, suffix = '') => {
         const sign = value > 0 ? '+' : '';
         return `${sign}${fmt(value)}${suffix}`;
     };
-    (r.strategy_stock_performance || []).forEach(s => {
-        body.innerHTML += `<tr>
+    // 행 문자열을 모아 한 번에 넣는다 (innerHTML에 덧붙이면 매번 앞 행까지 다시 파싱한다)
+    body.innerHTML = (r.strategy_stock_performance || []).map(s => `<tr>
             <td><b>${s.name}</b></td>
             <td class="c">${s.ticker}</td>
             <td class="r">${fmt(s.trade_count)}</td>
@@ -1518,43 +2402,56 @@ function renderStrategyStockTable(r) {
             <td class="r ${pnlClass(s.unrealized_pnl)}">${signed(s.unrealized_pnl)}</td>
             <td class="r ${pnlClass(s.total_pnl)}">${signed(s.total_pnl)}</td>
             <td class="r ${pnlClass(s.return_pct)}">${signed(s.return_pct, '%')}</td>
-        </tr>`;
-    });
+        </tr>`).join('');
 }
 
-// 전역 변수로 trades 보관
+// 전역 변수로 trades 보관 (종목 필터용으로 종목코드별 목록도 미리 나눠 둔다)
 let _allTrades = [];
+let _tradesByTicker = new Map();
+let tradeFilterFrame = 0;
 
 function renderTradeHistory(r) {
     const trades = r.trades || [];
     _allTrades = trades;
+    _tradesByTicker = new Map();
+    for (const t of trades) {
+        const list = _tradesByTicker.get(t.ticker);
+        if (list) list.push(t);
+        else _tradesByTicker.set(t.ticker, [t]);
+    }
 
     // 종목 필터 드롭다운 채우기
     const filter = document.getElementById('tradeStockFilter');
-    const stockNames = new Map();
-    trades.forEach(t => { if (!stockNames.has(t.ticker)) stockNames.set(t.ticker, t.name); });
-    filter.innerHTML = '<option value="all">전체 종목</option>';
-    stockNames.forEach((name, ticker) => {
-        filter.innerHTML += `<option value="${ticker}">${name} (${ticker})</option>`;
+    const options = ['<option value="all">전체 종목</option>'];
+    _tradesByTicker.forEach((list, ticker) => {
+        options.push(`<option value="${ticker}">${list[0].name} (${ticker})</option>`);
     });
+    filter.innerHTML = options.join('');
 
     renderTradeRows(trades);
 }
 
 function filterTrades() {
+    // 필터를 연달아 바꾸면 프레임당 한 번만 마지막 조건으로 다시 그린다.
+    cancelAnimationFrame(tradeFilterFrame);
+    tradeFilterFrame = requestAnimationFrame(applyTradeFilters);
+}
+
+function applyTradeFilters() {
+    tradeFilterFrame = 0;
     const stock = document.getElementById('tradeStockFilter').value;
     const status = document.getElementById('tradeStatusFilter').value;
     const pnl = document.getElementById('tradePnlFilter').value;
     const dateFrom = document.getElementById('tradeDateFrom').value;
     const dateTo = document.getElementById('tradeDateTo').value;
 
-    let filtered = _allTrades;
-    if (stock !== 'all') filtered = filtered.filter(t => t.ticker === stock);
-    if (status !== 'all') filtered = filtered.filter(t => t.status === status);
-    if (pnl === 'profit') filtered = filtered.filter(t => t.realized_pnl != null && t.realized_pnl > 0);
-    if (pnl === 'loss') filtered = filtered.filter(t => t.realized_pnl != null && t.realized_pnl < 0);
-    if (dateFrom) filtered = filtered.filter(t => t.entry_date >= dateFrom);
-    if (dateTo) filtered = filtered.filter(t => t.entry_date <= dateTo);
+    const base = stock === 'all' ? _allTrades : (_tradesByTicker.get(stock) || []);
+    const filtered = base.filter(t =>
+        (status === 'all' || t.status === status)
+        && (pnl !== 'profit' || (t.realized_pnl != null && t.realized_pnl > 0))
+        && (pnl !== 'loss' || (t.realized_pnl != null && t.realized_pnl < 0))
+        && (!dateFrom || t.entry_date >= dateFrom)
+        && (!dateTo || t.entry_date <= dateTo));
 
     document.getElementById('tradeFilterCount').textContent =
         filtered.length === _allTrades.length ? '' : filtered.length + '/' + _allTrades.length + '건';
@@ -1562,6 +2459,8 @@ function filterTrades() {
 }
 
 function resetTradeFilters() {
+    cancelAnimationFrame(tradeFilterFrame);
+    tradeFilterFrame = 0;
     document.getElementById('tradeStockFilter').value = 'all';
     document.getElementById('tradeStatusFilter').value = 'all';
     document.getElementById('tradePnlFilter').value = 'all';
@@ -1586,26 +2485,35 @@ function fmtTradePct(v) {
     return sign + formattedMagnitude + '%';
 }
 
+// 매매 이력 행에서 쓰는 배지·손익 포매터는 렌더링마다 새로 만들지 않는다.
+const TRADE_BADGE_CLOSED = '<span style="background:#e0e7ff;color:#4338ca;padding:2px 8px;border-radius:10px;font-size:11px">청산</span>';
+const TRADE_BADGE_OPEN = '<span style="background:#fef3c7;color:#d97706;padding:2px 8px;border-radius:10px;font-size:11px">보유중</span>';
+
+function fmtPnl(v) {
+    return v != null ? ((v >= 0 ? '+' : '') + fmt(v)) : '-';
+}
+
 function renderTradeRows(trades) {
     const body = document.getElementById('tradeBody');
-    body.innerHTML = '';
+    document.getElementById('tradeScroll').scrollTop = 0;
+    tradeWindowStart = tradeWindowEnd = -1;
 
     if (!trades.length) {
+        tradeRows = [];
         body.innerHTML = '<tr><td colspan="16" class="c" style="color:#999;padding:20px">매매 이력이 없습니다</td></tr>';
         return;
     }
 
-    trades.forEach(t => {
+    // 행 문자열은 한 번만 만들어 두고, 스크롤 위치에 맞는 구간만 한 번에 넣는다
+    const rows = new Array(trades.length);
+    for (let i = 0; i < trades.length; i++) {
+        const t = trades[i];
         const evalCls = (t.eval_pnl || 0) >= 0 ? 'pos-text' : 'neg-text';
         const realCls = (t.realized_pnl || 0) >= 0 ? 'pos-text' : 'neg-text';
         const retCls = (t.return_pct || 0) >= 0 ? 'pos-text' : 'neg-text';
-        const statusBadge = t.status === 'closed'
-            ? '<span style="background:#e0e7ff;color:#4338ca;padding:2px 8px;border-radius:10px;font-size:11px">청산</span>'
-            : '<span style="background:#fef3c7;color:#d97706;padding:2px 8px;border-radius:10px;font-size:11px">보유중</span>';
-
-        const fmtPnl = (v) => v != null ? ((v >= 0 ? '+' : '') + fmt(v)) : '-';
+        const statusBadge = t.status === 'closed' ? TRADE_BADGE_CLOSED : TRADE_BADGE_OPEN;
 
-        body.innerHTML += `<tr>
+        rows[i] = `<tr>
             <td class="c" style="font-size:11px;color:#6b7280">${t.ticker}</td>
             <td><b>${t.name}</b></td>
             <td class="c">${t.entry_date}</td>
@@ -1623,7 +2531,37 @@ function renderTradeRows(trades) {
             <td class="r ${retCls}">${fmtTradePct(t.return_pct)}</td>
             <td class="c">${statusBadge}</td>
         </tr>`;
-    });
+    }
+    tradeRows = rows;
+    renderTradeWindow();
+}
+
+function tradePadRow(height) {
+    return `<tr class="vs-pad" style="height:${height}px"><td colspan="16"></td></tr>`;
+}
+
+function renderTradeWindow() {
+    if (!tradeRows.length) return;
+    const scroll = document.getElementById('tradeScroll');
+    const height = tradeRowHeight || 40;
+    const start = Math.max(0, Math.floor(scroll.scrollTop / height) - TRADE_OVERSCAN);
+    const end = Math.min(tradeRows.length, start + TRADE_WINDOW);
+    if (start === tradeWindowStart && end === tradeWindowEnd) return;
+    tradeWindowStart = start;
+    tradeWindowEnd = end;
+    const body = document.getElementById('tradeBody');
+    body.innerHTML = (start > 0 ? tradePadRow(start * height) : '')
+        + tradeRows.slice(start, end).join('')
+        + (end < tradeRows.length ? tradePadRow((tradeRows.length - end) * height) : '');
+    if (!tradeRowHeight) {
+        // 첫 행 높이로 여백을 잡는다. 결과가 숨겨져 있으면 0이라 다음 렌더링 때 다시 잰다.
+        const first = body.querySelector('tr:not(.vs-pad)');
+        tradeRowHeight = first ? first.offsetHeight : 0;
+        if (tradeRowHeight) {
+            tradeWindowStart = -1;
+            renderTradeWindow();
+        }
+    }
 }
 
 function downloadCSV() {
@@ -1632,6 +2570,7 @@ function downloadCSV() {
 </script>
 </body>
 </html>'''
+BACKTEST_PAGE = _static_page(BACKTEST_TEMPLATE, 'backtest')
 
 
 # ============================================================
@@ -1854,9 +2793,13 @@ function showToast(msg, type) {
     setTimeout(() => t.classList.remove('show'), 3000);
 }
 
+// 천 단위 구분은 한 번 만든 포매터로 한다 (셀마다 정규식 lookahead를 돌리지 않는다).
+// signDisplay 옵션은 구형 브라우저에서 RangeError를 내므로 쓰지 않고 -0은 fmt에서 0으로 바꾼다.
+const numberFormatter = new Intl.NumberFormat('en-US', { maximumFractionDigits: 20 });
+
 function fmt(n) {
     if (n == null) return '-';
-    if (typeof n === 'number') return n.toString().replace(/\B(?=(\d{3})+(?!\d))/g, ',');
+    if (typeof n === 'number') return numberFormatter.format(n === 0 ? 0 : n);
     return n;
 }
 
@@ -2148,16 +3091,22 @@ function renderTickerSummary(summary) {
 </script>
 </body>
 </html>'''
+DB_VIEWER_PAGE = _static_page(DB_VIEWER_TEMPLATE, 'db')
 
 
 # ============================================================
 # 스케줄러 설정
 # ============================================================
+def submit_scheduled_refresh():
+    """예약 갱신도 수동 재조회와 같은 갱신 전용 워커에서 실행한다."""
+    return refresh_executor.submit(refresh_data)
+
+
 def create_scheduler():
     """절전에서 늦게 깨어나도 놓친 일일 갱신을 한 번 실행한다."""
     daily_scheduler = BackgroundScheduler(timezone=KST)
     daily_scheduler.add_job(
-        refresh_data,
+        submit_scheduled_refresh,
         'cron',
         hour=8,
         minute=0,
@@ -27,15 +27,29 @@ Custom Backtest Engine (커스텀 백테스트 엔진)
 """
 
 import math
-import statistics
+import sys
+from bisect import bisect_left, bisect_right
+from collections import deque
 from dataclasses import dataclass, replace
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
+
+
+def _mean_stdev(values: List[float]) -> tuple:
+    """평균과 표본 표준편차 (statistics.mean/stdev와 같은 정의, 2개 이상)
+
+    statistics 모듈은 분수 연산으로 정확히 계산해 리밸런싱마다 호출하기엔
+    느리다. fsum 두 번으로 충분한 정밀도를 얻는다.
+    """
+    n = len(values)
+    mean = math.fsum(values) / n
+    var = math.fsum((x - mean) ** 2 for x in values) / (n - 1)
+    return mean, math.sqrt(var)
 
 
 # ============================================================
 # 거래 비용 설정
 # ============================================================
-@dataclass
+@dataclass(slots=True)
 class CostConfig:
     """거래 비용 설정"""
     slippage_pct: float = 0.0       # 슬리피지 (%)
@@ -46,9 +60,9 @@ class CostConfig:
 # ============================================================
 # 거래 기록
 # ============================================================
-@dataclass
+@dataclass(slots=True)
 class TradeRecord:
-    """개별 거래 기록"""
+    """개별 거래 기록 (거래 수만큼 생기므로 __dict__ 없이 슬롯으로 둔다)"""
     ticker: str
     name: str
     entry_date: str
@@ -65,6 +79,17 @@ class TradeRecord:
     status: str = 'open'
 
 
+# ============================================================
+# 보유 포지션
+# ============================================================
+@dataclass(slots=True)
+class Position:
+    """종목별 보유 포지션 (매 스냅샷마다 읽으므로 슬롯 속성으로 둔다)"""
+    shares: int
+    avg_price: float        # 열린 로트 기준 평균 체결가
+    name: str
+
+
 # ============================================================
 # 포트폴리오
 # ============================================================
@@ -74,11 +99,23 @@ class Portfolio:
     def __init__(self, initial_capital: float, cost_config: CostConfig = None):
         self.initial_capital = initial_capital
         self.cash = initial_capital
-        self.positions: Dict[str, dict] = {}
-        self.equity_history: List[dict] = []
+        self.positions: Dict[str, Position] = {}
+        # 일별 스냅샷은 열 단위로 쌓는다 (날짜마다 dict를 만들지 않음).
+        # 투자금액은 equity - cash로 언제든 구할 수 있어 따로 두지 않는다.
+        self.equity_history: Dict[str, list] = {'dates': [], 'equity': [], 'cash': []}
         self.trades: List[TradeRecord] = []
+        # 종목별 열린 로트 FIFO: (trades 내 위치 하한, TradeRecord)
+        # 부분 청산 시 앞쪽에 삽입만 일어나므로 기록한 위치는 항상 하한이다.
+        self._open_lots: Dict[str, deque] = {}
         self.cost = cost_config or CostConfig()
 
+        # 체결마다 쓰는 비용 계수는 백테스트 동안 변하지 않으므로 미리 계산
+        self._buy_slip = 1 + self.cost.slippage_pct / 100
+        self._sell_slip = 1 - self.cost.slippage_pct / 100
+        self._comm_rate = self.cost.commission_pct / 100
+        self._tax_rate = self.cost.tax_pct / 100
+        self._buy_fee_mult = 1 + self._comm_rate
+
         # 누적 비용 추적
         self.total_slippage_cost = 0.0
         self.total_commission_cost = 0.0
@@ -94,52 +131,57 @@ class Portfolio:
         """
         if shares <= 0 or price <= 0:
             return 0
+        # 포지션/로트/거래기록 키를 가격 데이터 키와 같은 객체로 맞춘다
+        ticker = sys.intern(ticker)
+
+        cash = self.cash
+        comm_rate = self._comm_rate
 
         # 슬리피지 적용 (매수: 불리하게 높은 가격)
-        exec_price = price * (1 + self.cost.slippage_pct / 100)
+        exec_price = price * self._buy_slip
 
         # 수수료 포함 총 비용 계산
         gross_cost = exec_price * shares
-        commission = gross_cost * (self.cost.commission_pct / 100)
+        commission = gross_cost * comm_rate
         total_cost = gross_cost + commission
 
         # 자금 부족 시 매수 가능 수량 재계산
-        if total_cost > self.cash:
+        if total_cost > cash:
             # 수수료 포함해서 살 수 있는 최대 주수
-            max_shares = int(self.cash / (exec_price * (1 + self.cost.commission_pct / 100)))
+            max_shares = int(cash / (exec_price * self._buy_fee_mult))
             if max_shares <= 0:
                 return 0
             shares = max_shares
             gross_cost = exec_price * shares
-            commission = gross_cost * (self.cost.commission_pct / 100)
+            commission = gross_cost * comm_rate
             total_cost = gross_cost + commission
 
         # 비용 차감
-        slippage_cost = (exec_price - price) * shares
-        self.total_slippage_cost += slippage_cost
+        self.total_slippage_cost += (exec_price - price) * shares
         self.total_commission_cost += commission
-        self.cash -= total_cost
+        self.cash = cash - total_cost
 
         # 포지션 업데이트
-        if ticker in self.positions:
-            pos = self.positions[ticker]
-            old_total = pos['shares']
+        name = name or ticker
+        positions = self.positions
+        pos = positions.get(ticker)
+        if pos is not None:
+            old_total = pos.shares
             new_total = old_total + shares
-            pos['avg_price'] = (pos['avg_price'] * old_total + exec_price * shares) / new_total
-            pos['shares'] = new_total
+            pos.avg_price = (pos.avg_price * old_total + exec_price * shares) / new_total
+            pos.shares = new_total
         else:
-            self.positions[ticker] = {
-                'shares': shares,
-                'avg_price': exec_price,
-                'name': name or ticker,
-            }
-
-        self.trades.append(TradeRecord(
-            ticker=ticker, name=name or ticker,
+            positions[ticker] = Position(shares, exec_price, name)
+
+        trades = self.trades
+        trade = TradeRecord(
+            ticker=ticker, name=name,
             entry_date=date, entry_price=price,
             exec_price=exec_price,
             shares=shares, entry_cost=commission,
-        ))
+        )
+        self._open_lots.setdefault(ticker, deque()).append((len(trades), trade))
+        trades.append(trade)
         return shares
 
     def sell(self, ticker: str, price: float, shares: int, date: str) -> int:
@@ -150,24 +192,23 @@ class Portfolio:
         - 세금: 체결 금액의 tax_pct% (증권거래세)
         반환: 실제 매도 주수
         """
-        if ticker not in self.positions or shares <= 0 or price <= 0:
+        pos = self.positions.get(ticker)
+        if pos is None or shares <= 0 or price <= 0:
             return 0
 
-        pos = self.positions[ticker]
-        actual = min(shares, pos['shares'])
+        actual = min(shares, pos.shares)
         if actual <= 0:
             return 0
 
         # 슬리피지 적용 (매도: 불리하게 낮은 가격)
-        exec_price = price * (1 - self.cost.slippage_pct / 100)
+        exec_price = price * self._sell_slip
 
         gross_proceeds = exec_price * actual
-        commission = gross_proceeds * (self.cost.commission_pct / 100)
-        tax = gross_proceeds * (self.cost.tax_pct / 100)
+        commission = gross_proceeds * self._comm_rate
+        tax = gross_proceeds * self._tax_rate
         net_proceeds = gross_proceeds - commission - tax
 
-        slippage_cost = (price - exec_price) * actual
-        self.total_slippage_cost += slippage_cost
+        self.total_slippage_cost += (price - exec_price) * actual
         self.total_commission_cost += commission
         self.total_tax_cost += tax
 
@@ -176,13 +217,9 @@ class Portfolio:
         # 열린 매수 로트를 FIFO로 청산한다. 부분 청산 시 닫힌 로트와
         # 남은 열린 로트로 분리해 매도 수량과 실현손익을 정확히 보존한다.
         remaining = actual
-        open_lots = [
-            trade for trade in self.trades
-            if trade.ticker == ticker and trade.status == 'open'
-        ]
-        for trade in open_lots:
-            if remaining <= 0:
-                break
+        open_lots = self._open_lots[ticker]
+        while remaining > 0 and open_lots:
+            hint, trade = open_lots[0]
             original_shares = trade.shares
             lot_shares = min(remaining, original_shares)
             entry_cost = trade.entry_cost * lot_shares / original_shares
@@ -195,9 +232,12 @@ class Portfolio:
                 )
                 trade.shares = original_shares - lot_shares
                 trade.entry_cost -= entry_cost
-                self.trades.insert(self.trades.index(trade), closed_trade)
+                pos_idx = self._trade_index(trade, hint)
+                self.trades.insert(pos_idx, closed_trade)
+                open_lots[0] = (pos_idx + 1, trade)
             else:
                 closed_trade = trade
+                open_lots.popleft()
 
             allocation = lot_shares / actual
             lot_commission = commission * allocation
@@ -215,45 +255,47 @@ class Portfolio:
             closed_trade.status = 'closed'
             remaining -= lot_shares
 
-        pos['shares'] -= actual
-        if pos['shares'] <= 0:
+        pos.shares -= actual
+        if pos.shares <= 0:
             del self.positions[ticker]
         else:
-            remaining_lots = [
-                trade for trade in self.trades
-                if trade.ticker == ticker and trade.status == 'open'
-            ]
-            open_shares = sum(trade.shares for trade in remaining_lots)
+            open_shares = sum(trade.shares for _, trade in open_lots)
             if open_shares:
-                pos['avg_price'] = sum(
-                    trade.exec_price * trade.shares for trade in remaining_lots
+                pos.avg_price = sum(
+                    trade.exec_price * trade.shares for _, trade in open_lots
                 ) / open_shares
         return actual
 
+    def _trade_index(self, trade: TradeRecord, start: int) -> int:
+        """trades에서 trade의 현재 위치 (start부터 동일 객체를 찾는다)"""
+        trades = self.trades
+        for i in range(start, len(trades)):
+            if trades[i] is trade:
+                return i
+        raise ValueError('열린 로트가 trades에 없습니다')
+
     def sell_all(self, prices: Dict[str, float], date: str):
         """전량 매도"""
-        for ticker in list(self.positions.keys()):
-            if ticker in prices:
-                self.sell(ticker, prices[ticker],
-                          self.positions[ticker]['shares'], date)
+        get = prices.get
+        for ticker, pos in list(self.positions.items()):
+            price = get(ticker)
+            if price is not None:
+                self.sell(ticker, price, pos.shares, date)
 
     def equity(self, prices: Dict[str, float]) -> float:
         """현재 총 자산 평가 (미실현 슬리피지/수수료 미반영 시가평가)"""
+        get = prices.get
         total = self.cash
         for ticker, pos in self.positions.items():
-            p = prices.get(ticker, pos['avg_price'])
-            total += p * pos['shares']
+            total += get(ticker, pos.avg_price) * pos.shares
         return total
 
     def snapshot(self, date: str, prices: Dict[str, float]):
         """일별 자산 스냅샷"""
-        eq = self.equity(prices)
-        self.equity_history.append({
-            'date': date,
-            'equity': eq,
-            'cash': self.cash,
-            'invested': eq - self.cash,
-        })
+        history = self.equity_history
+        history['dates'].append(date)
+        history['equity'].append(self.equity(prices))
+        history['cash'].append(self.cash)
 
     def get_cost_summary(self) -> dict:
         """누적 거래 비용 요약"""
@@ -308,6 +350,11 @@ class BacktestEngine:
         self.all_dates: List[str] = []
         self.benchmark_data: List[dict] = []
         self._price_idx: Dict[str, Dict[str, dict]] = {}
+        # 종목별 열 단위 (정렬된 날짜 리스트, 종가 리스트).
+        # 전략 루프의 종가 조회는 모두 여기서 이분 탐색/슬라이스로 처리하고,
+        # 행 dict(price_data/_price_idx)는 OHLCV가 필요한 일별 상세에만 쓴다.
+        self._close_cols: Dict[str, tuple] = {}
+        self._dates_stale = True   # add_price_data 이후 all_dates 재계산 필요
 
     def add_price_data(self, ticker: str, data: List[dict], name: str = ''):
         """
@@ -319,22 +366,40 @@ class BacktestEngine:
                      'low': float, 'close': float, 'volume': int}, ...]
             name: 종목명 (예: '삼성전자')
         """
+        # 종목코드는 매일 여러 dict의 키로 조회되므로 intern해 둔다
+        ticker = sys.intern(ticker)
         sorted_data = sorted(data, key=lambda x: x['date'])
         self.price_data[ticker] = sorted_data
         if name:
             self.ticker_names[ticker] = name
         self._price_idx[ticker] = {row['date']: row for row in sorted_data}
+        self._close_cols[ticker] = (
+            [row['date'] for row in sorted_data],
+            [row['close'] for row in sorted_data],
+        )
+        self._dates_stale = True
 
     def set_benchmark(self, data: List[dict]):
         """벤치마크 데이터 설정 [{'date': 'YYYY-MM-DD', 'close': float}, ...]"""
         self.benchmark_data = sorted(data, key=lambda x: x['date'])
 
     def _build_dates(self):
+        # 가격 데이터가 바뀌지 않았으면 이전 결과를 그대로 쓴다
+        if not self._dates_stale:
+            return
         dates = set()
-        for ticker_data in self.price_data.values():
-            for row in ticker_data:
-                dates.add(row['date'])
+        for ticker_dates, _ in self._close_cols.values():
+            dates.update(ticker_dates)
         self.all_dates = sorted(dates)
+        self._dates_stale = False
+
+    def _date_window(self, start_date: Optional[str],
+                     end_date: Optional[str]) -> List[str]:
+        """all_dates 중 start_date~end_date 구간 (비어 있으면 처음/끝까지)"""
+        dates = self.all_dates
+        lo = bisect_left(dates, start_date) if start_date else 0
+        hi = bisect_right(dates, end_date) if end_date else len(dates)
+        return dates[lo:hi]
 
     def _price(self, ticker: str, date: str, field: str = 'close') -> Optional[float]:
         idx = self._price_idx.get(ticker, {})
@@ -350,18 +415,27 @@ class BacktestEngine:
         return result
 
     def _last_known_prices(self, date: str) -> Dict[str, float]:
+        """date 이전(포함) 마지막 종가. 종목마다 정렬된 날짜를 이분 탐색한다."""
         result = {}
-        for ticker, data in self.price_data.items():
-            last = None
-            for row in data:
-                if row['date'] <= date:
-                    last = row['close']
-                else:
-                    break
-            if last is not None:
-                result[ticker] = last
+        for ticker, (dates, closes) in self._close_cols.items():
+            i = bisect_right(dates, date)
+            if i:
+                last = closes[i - 1]
+                if last is not None:
+                    result[ticker] = last
         return result
 
+    def _order_shares(self, amount: float, price: float) -> int:
+        """amount로 살 수 있는 주수 (매수 슬리피지와 수수료 포함 체결 단가 기준)"""
+        portfolio = self.portfolio
+        return int(amount / (price * portfolio._buy_slip * portfolio._buy_fee_mult))
+
+    def _recent_closes(self, ticker: str, date: str, n: int) -> List[float]:
+        """date 이전(포함) 최근 n개 종가 (이동평균/변동성 윈도우용)"""
+        dates, closes = self._close_cols[ticker]
+        end = bisect_right(dates, date)
+        return closes[max(end - n, 0):end]
+
     # ----------------------------------------------------------
     # 전략 1: 동일 비중 매수 후 보유
     # ----------------------------------------------------------
@@ -378,9 +452,7 @@ class BacktestEngine:
         if not self.all_dates:
             return
 
-        start = start_date or self.all_dates[0]
-        end = end_date or self.all_dates[-1]
-        dates = [d for d in self.all_dates if start <= d <= end]
+        dates = self._date_window(start_date, end_date)
         if not dates:
             return
 
@@ -395,8 +467,7 @@ class BacktestEngine:
             price = self._price(ticker, buy_date)
             if price and price > 0:
                 # 수수료/슬리피지 고려해서 매수 가능 수량 계산
-                exec_p = price * (1 + self.cost_config.slippage_pct / 100)
-                shares = int(alloc / (exec_p * (1 + self.cost_config.commission_pct / 100)))
+                shares = self._order_shares(alloc, price)
                 name = self.ticker_names.get(ticker, ticker)
                 self.portfolio.buy(ticker, price, shares, buy_date, name)
 
@@ -420,9 +491,7 @@ class BacktestEngine:
         if not self.all_dates:
             return
 
-        start = start_date or self.all_dates[0]
-        end = end_date or self.all_dates[-1]
-        dates = [d for d in self.all_dates if start <= d <= end]
+        dates = self._date_window(start_date, end_date)
 
         valid = [t for t in tickers if t in self.price_data and self.price_data[t]]
         if not valid or not dates:
@@ -439,8 +508,7 @@ class BacktestEngine:
                 alloc = eq / len(valid)
                 for ticker in valid:
                     if ticker in prices and prices[ticker] > 0:
-                        exec_p = prices[ticker] * (1 + self.cost_config.slippage_pct / 100)
-                        shares = int(alloc / (exec_p * (1 + self.cost_config.commission_pct / 100)))
+                        shares = self._order_shares(alloc, prices[ticker])
                         name = self.ticker_names.get(ticker, ticker)
                         self.portfolio.buy(ticker, prices[ticker], shares, date, name)
                 last_rebal = i
@@ -478,13 +546,12 @@ class BacktestEngine:
                     if action == 'buy' and ticker in prices:
                         eq = self.portfolio.equity(prices)
                         alloc = eq * weight
-                        exec_p = prices[ticker] * (1 + self.cost_config.slippage_pct / 100)
-                        shares = int(alloc / (exec_p * (1 + self.cost_config.commission_pct / 100)))
+                        shares = self._order_shares(alloc, prices[ticker])
                         name = self.ticker_names.get(ticker, ticker)
                         self.portfolio.buy(ticker, prices[ticker], shares, date, name)
                     elif action == 'sell' and ticker in self.portfolio.positions:
                         pos = self.portfolio.positions[ticker]
-                        self.portfolio.sell(ticker, prices[ticker], pos['shares'], date)
+                        self.portfolio.sell(ticker, prices[ticker], pos.shares, date)
 
             self.portfolio.snapshot(date, prices)
 
@@ -520,9 +587,7 @@ class BacktestEngine:
         if not self.all_dates:
             return
 
-        start = start_date or self.all_dates[0]
-        end = end_date or self.all_dates[-1]
-        dates = [d for d in self.all_dates if start <= d <= end]
+        dates = self._date_window(start_date, end_date)
         valid = [t for t in tickers if t in self.price_data and self.price_data[t]]
         if not valid or not dates:
             return
@@ -561,14 +626,14 @@ class BacktestEngine:
                 position = self.portfolio.positions.get(t)
                 entry_stop_hit = False
                 if position is not None and stop_loss_pct is not None:
-                    entry_stop_price = position['avg_price'] * (
+                    entry_stop_price = position.avg_price * (
                         1 - stop_loss_pct / 100
                     )
                     entry_stop_hit = p <= entry_stop_price
 
                 if trailing_stop_hit or entry_stop_hit:
                     if position is not None:
-                        self.portfolio.sell(t, p, position['shares'], date)
+                        self.portfolio.sell(t, p, position.shares, date)
                     holding[t] = False
                     sold_day[t] = i
 
@@ -589,14 +654,10 @@ class BacktestEngine:
                 # 변동성 계산 (최근 lookback일 수익률의 표준편차)
                 inv_vols = {}
                 for t in buyable:
-                    closes = []
-                    for row in self.price_data[t]:
-                        if row['date'] <= date:
-                            closes.append(row['close'])
-                    closes = closes[-(lookback + 1):]
+                    closes = self._recent_closes(t, date, lookback + 1)
                     if len(closes) >= 2:
                         rets = [closes[j] / closes[j - 1] - 1 for j in range(1, len(closes))]
-                        vol = statistics.stdev(rets) if len(rets) > 1 else 1.0
+                        vol = _mean_stdev(rets)[1] if len(rets) > 1 else 1.0
                         inv_vols[t] = 1.0 / max(vol, 1e-8)
                     else:
                         inv_vols[t] = 1.0
@@ -612,8 +673,7 @@ class BacktestEngine:
                     if alloc <= 0:
                         continue
                     p = prices[t]
-                    exec_p = p * (1 + self.cost_config.slippage_pct / 100)
-                    shares = int(alloc / (exec_p * (1 + self.cost_config.commission_pct / 100)))
+                    shares = self._order_shares(alloc, p)
                     if shares > 0:
                         name = self.ticker_names.get(t, t)
                         bought = self.portfolio.buy(t, p, shares, date, name)
@@ -648,9 +708,7 @@ class BacktestEngine:
         if not self.all_dates:
             return
 
-        start = start_date or self.all_dates[0]
-        end = end_date or self.all_dates[-1]
-        dates = [d for d in self.all_dates if start <= d <= end]
+        dates = self._date_window(start_date, end_date)
         valid = [t for t in tickers if t in self.price_data and self.price_data[t]]
         if not valid or not dates:
             return
@@ -668,12 +726,9 @@ class BacktestEngine:
                 below_ma = []
 
                 for t in valid:
-                    closes = []
-                    for row in self.price_data[t]:
-                        if row['date'] <= date:
-                            closes.append(row['close'])
+                    closes = self._recent_closes(t, date, ma_period)
                     if len(closes) >= ma_period:
-                        ma_val = sum(closes[-ma_period:]) / ma_period
+                        ma_val = sum(closes) / ma_period
                         current = closes[-1]
                         if current > ma_val:
                             above_ma.append(t)
@@ -687,7 +742,7 @@ class BacktestEngine:
                 for t in below_ma:
                     if t in self.portfolio.positions and t in prices:
                         self.portfolio.sell(t, prices[t],
-                                            self.portfolio.positions[t]['shares'], date)
+                                            self.portfolio.positions[t].shares, date)
 
                 # MA 위 종목에 동일 비중 배분
                 if above_ma:
@@ -698,15 +753,14 @@ class BacktestEngine:
                     for t in above_ma:
                         current_value = 0
                         if t in self.portfolio.positions and t in prices:
-                            current_value = self.portfolio.positions[t]['shares'] * prices[t]
+                            current_value = self.portfolio.positions[t].shares * prices[t]
 
                         diff = target_alloc - current_value
                         if t not in prices or prices[t] <= 0:
                             continue
 
                         if diff > prices[t] * 2:  # 충분한 차이가 있을 때만 추가 매수
-                            exec_p = prices[t] * (1 + self.cost_config.slippage_pct / 100)
-                            shares = int(diff / (exec_p * (1 + self.cost_config.commission_pct / 100)))
+                            shares = self._order_shares(diff, prices[t])
                             if shares > 0:
                                 name = self.ticker_names.get(t, t)
                                 self.portfolio.buy(t, prices[t], shares, date, name)
@@ -748,9 +802,7 @@ class BacktestEngine:
         if not self.all_dates:
             return
 
-        start = start_date or self.all_dates[0]
-        end = end_date or self.all_dates[-1]
-        dates = [d for d in self.all_dates if start <= d <= end]
+        dates = self._date_window(start_date, end_date)
         valid = [t for t in tickers if t in self.price_data and self.price_data[t]]
         if not valid or not dates:
             return
@@ -759,6 +811,7 @@ class BacktestEngine:
         sold_day: Dict[str, int] = {}
         holding: Dict[str, bool] = {}
         last_rebal = -rebalance_period
+        window_len = max(ma_period, lookback + 1)
 
         for t in valid:
             holding[t] = False
@@ -782,7 +835,7 @@ class BacktestEngine:
                     if dd_pct <= stop_pct:
                         if t in self.portfolio.positions:
                             self.portfolio.sell(t, p,
-                                                self.portfolio.positions[t]['shares'], date)
+                                                self.portfolio.positions[t].shares, date)
                         holding[t] = False
                         sold_day[t] = i
 
@@ -790,16 +843,16 @@ class BacktestEngine:
             if i - last_rebal >= rebalance_period:
                 last_rebal = i
 
-                # MA 필터
+                # MA 필터 (종가 윈도우는 변동성 계산과 함께 한 번만 잘라 둔다)
                 above_ma = []
                 below_ma = []
+                windows: Dict[str, List[float]] = {}
                 for t in valid:
-                    closes = []
-                    for row in self.price_data[t]:
-                        if row['date'] <= date:
-                            closes.append(row['close'])
+                    window = self._recent_closes(t, date, window_len)
+                    windows[t] = window
+                    closes = window[-ma_period:]
                     if len(closes) >= ma_period:
-                        ma_val = sum(closes[-ma_period:]) / ma_period
+                        ma_val = sum(closes) / ma_period
                         if closes[-1] > ma_val:
                             above_ma.append(t)
                         else:
@@ -811,7 +864,7 @@ class BacktestEngine:
                 for t in below_ma:
                     if holding[t] and t in self.portfolio.positions and t in prices:
                         self.portfolio.sell(t, prices[t],
-                                            self.portfolio.positions[t]['shares'], date)
+                                            self.portfolio.positions[t].shares, date)
                         holding[t] = False
                         sold_day[t] = i
 
@@ -828,15 +881,11 @@ class BacktestEngine:
                 if buyable:
                     inv_vols = {}
                     for t in buyable:
-                        closes = []
-                        for row in self.price_data[t]:
-                            if row['date'] <= date:
-                                closes.append(row['close'])
-                        closes = closes[-(lookback + 1):]
+                        closes = windows[t][-(lookback + 1):]
                         if len(closes) >= 2:
                             rets = [closes[j] / closes[j - 1] - 1
                                     for j in range(1, len(closes))]
-                            vol = statistics.stdev(rets) if len(rets) > 1 else 1.0
+                            vol = _mean_stdev(rets)[1] if len(rets) > 1 else 1.0
                             inv_vols[t] = 1.0 / max(vol, 1e-8)
                         else:
                             inv_vols[t] = 1.0
@@ -850,8 +899,7 @@ class BacktestEngine:
                         if alloc <= 0:
                             continue
                         p = prices[t]
-                        exec_p = p * (1 + self.cost_config.slippage_pct / 100)
-                        shares = int(alloc / (exec_p * (1 + self.cost_config.commission_pct / 100)))
+                        shares = self._order_shares(alloc, p)
                         if shares > 0:
                             name = self.ticker_names.get(t, t)
                             bought = self.portfolio.buy(t, p, shares, date, name)
@@ -867,20 +915,23 @@ class BacktestEngine:
     def get_results(self) -> dict:
         """백테스트 결과 반환 (JSON 직렬화 가능)"""
         curve = self.portfolio.equity_history
-        if not curve:
+        if not curve['dates']:
             return {'error': '데이터가 없습니다'}
 
-        equities = [c['equity'] for c in curve]
-        dates = [c['date'] for c in curve]
+        equities = curve['equity']
+        dates = curve['dates']
 
         metrics = self._calc_metrics(equities, dates)
         dd_curve = metrics.pop('_dd_curve')
+        trades = self._build_trade_details()
 
+        # 곡선은 열 단위 배열로 보낸다 ({dates: [...], equity: [...]}).
+        # 점마다 키 문자열을 반복하지 않아 JSON이 작고, 차트에 그대로 넘길 수 있다.
         return {
-            'equity_curve': [
-                {'date': d, 'equity': round(e)}
-                for d, e in zip(dates, equities)
-            ],
+            'equity_curve': {
+                'dates': dates,
+                'equity': [round(e) for e in equities],
+            },
             'drawdown_curve': dd_curve,
             'metrics': metrics,
             'cost_summary': self.portfolio.get_cost_summary(),
@@ -893,8 +944,8 @@ class BacktestEngine:
                 self._calc_strategy_stock_performance()
             ),
             'benchmark': self._calc_benchmark(equities, dates),
-            'trades': self._build_trade_details(),
-            'trades_by_stock': self._group_trades_by_stock(),
+            'trades': trades,
+            'trades_by_stock': self._group_trades_by_stock(trades),
         }
 
     def _build_trade_details(self) -> List[dict]:
@@ -917,8 +968,9 @@ class BacktestEngine:
             else:
                 # 보유중 → 마지막 종가로 평가
                 last_price = 0
-                if ticker in self.price_data and self.price_data[ticker]:
-                    last_price = self.price_data[ticker][-1]['close']
+                cols = self._close_cols.get(ticker)
+                if cols and cols[1]:
+                    last_price = cols[1][-1]
                 eval_amount = round(last_price * t.shares)
 
             # 평가손익 (비용 차감 전 시가 기준)
@@ -957,9 +1009,8 @@ class BacktestEngine:
             })
         return details
 
-    def _group_trades_by_stock(self) -> Dict[str, list]:
-        """종목별 매매 이력 그룹핑"""
-        details = self._build_trade_details()
+    def _group_trades_by_stock(self, details: List[dict]) -> Dict[str, list]:
+        """종목별 매매 이력 그룹핑 (_build_trade_details() 결과를 그대로 묶는다)"""
         grouped: Dict[str, list] = {}
         for d in details:
             grouped.setdefault(d['ticker'], []).append(d)
@@ -969,7 +1020,7 @@ class BacktestEngine:
         """핵심 성과 지표 계산"""
         n = len(equities)
         if n == 0 or self.initial_capital <= 0:
-            return {'_dd_curve': []}
+            return {'_dd_curve': {'dates': [], 'dd': []}}
 
         total_ret = (equities[-1] / self.initial_capital - 1) * 100
 
@@ -1002,15 +1053,13 @@ class BacktestEngine:
             (equities[-1] / self.initial_capital) ** (252 / max(n, 1)) - 1
         ) * 100
 
-        vol = (statistics.stdev(daily_rets) * math.sqrt(252) * 100
-               if len(daily_rets) > 1 else 0)
-
-        if daily_rets and len(daily_rets) > 1:
-            avg_d = statistics.mean(daily_rets)
-            std_d = statistics.stdev(daily_rets)
+        if len(daily_rets) > 1:
+            avg_d, std_d = _mean_stdev(daily_rets)
+            vol = std_d * math.sqrt(252) * 100
             sharpe = ((avg_d - 0.035 / 252) / std_d * math.sqrt(252)
                       if std_d > 0 else 0)
         else:
+            vol = 0
             sharpe = 0
 
         closed = [t for t in self.portfolio.trades if t.status == 'closed']
@@ -1037,10 +1086,7 @@ class BacktestEngine:
             'start_date': dates[0],
             'end_date': dates[-1],
             'trading_days': n,
-            '_dd_curve': [
-                {'date': d, 'dd': dd}
-                for d, dd in zip(dates, dd_curve)
-            ],
+            '_dd_curve': {'dates': dates, 'dd': dd_curve},
         }
 
     def get_daily_detail(self) -> List[dict]:
@@ -1065,6 +1111,10 @@ class BacktestEngine:
             }, ...
         ]
         """
+        return list(self.iter_daily_detail())
+
+    def iter_daily_detail(self) -> Iterator[dict]:
+        """get_daily_detail()과 같은 행을 한 줄씩 생성한다 (CSV 스트리밍용)."""
         if not self.all_dates:
             self._build_dates()
 
@@ -1076,17 +1126,15 @@ class BacktestEngine:
             if t.exit_date:
                 sell_map.setdefault(t.exit_date, {}).setdefault(t.ticker, []).append(t)
 
-        # equity_history를 날짜 맵으로
-        eq_map = {e['date']: e for e in self.portfolio.equity_history}
+        # equity_history를 날짜 -> (equity, cash) 맵으로
+        history = self.portfolio.equity_history
+        eq_map = dict(zip(history['dates'], zip(history['equity'], history['cash'])))
 
         # 날짜별 보유현황 추적 (시뮬레이션 재현)
         holdings: Dict[str, int] = {}  # ticker -> shares
-        rows = []
 
         for date in self.all_dates:
-            eq_snap = eq_map.get(date, {})
-            portfolio_equity = eq_snap.get('equity', 0)
-            portfolio_cash = eq_snap.get('cash', 0)
+            portfolio_equity, portfolio_cash = eq_map.get(date, (0, 0))
 
             # 이 날짜의 매수 처리
             day_buys = buy_map.get(date, {})
@@ -1140,7 +1188,7 @@ class BacktestEngine:
                 if not action:
                     continue
 
-                rows.append({
+                yield {
                     'date': date,
                     'ticker': ticker,
                     'name': name,
@@ -1157,9 +1205,7 @@ class BacktestEngine:
                     'holding_value': round(h_shares * close_p),
                     'portfolio_equity': round(portfolio_equity),
                     'portfolio_cash': round(portfolio_cash),
-                })
-
-        return rows
+                }
 
     def _calc_strategy_stock_performance(self) -> List[dict]:
         """실제 거래 로트를 종목별 전략 손익으로 집계한다."""
@@ -1188,13 +1234,13 @@ class BacktestEngine:
                 row['realized_pnl'] += trade.pnl
                 continue
 
-            price_rows = self.price_data.get(trade.ticker)
-            if not price_rows:
+            cols = self._close_cols.get(trade.ticker)
+            if not cols or not cols[1]:
                 raise ValueError(
                     f"열린 거래 종목 {trade.ticker}의 마지막 가격 데이터가 없습니다."
                 )
             row['open_count'] += 1
-            last_close = price_rows[-1]['close']
+            last_close = cols[1][-1]
             row['unrealized_pnl'] += last_close * trade.shares - buy_cost
 
         performance = []
@@ -1238,13 +1284,12 @@ class BacktestEngine:
 
         bench_ret = (bd[-1]['close'] / base - 1) * 100
 
-        curve = [
-            {
-                'date': b['date'],
-                'equity': round(self.initial_capital * b['close'] / base),
-            }
-            for b in bd
-        ]
+        curve = {
+            'dates': [b['date'] for b in bd],
+            'equity': [
+                round(self.initial_capital * b['close'] / base) for b in bd
+            ],
+        }
 
         pk = bd[0]['close']
         bmdd = 0
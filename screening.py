@@ -5,6 +5,9 @@
 읽어 웹 앱, 정적 리포트, 일일 리포트가 같은 데이터 계층을 사용하게 한다.
 """
 
+import atexit
+import codecs
+from collections import Counter
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
 from html import unescape
@@ -12,10 +15,12 @@ import json
 import logging
 import math
 import os
+import queue
 import re
 import threading
 from typing import Callable, Iterable, Optional
 
+import orjson
 import requests
 from nps_tracker import (
     kst_today,
@@ -40,6 +45,13 @@ SHARE_ANALYSIS_URL = "https://wcomp.fnguide.com/CompanyInfo/ShareAnalysis"
 DEFAULT_TICKER_MAP = os.path.join(os.path.dirname(__file__), "ticker_map.json")
 DEFAULT_NPS_STATE = os.path.join(os.path.dirname(__file__), "nps_state.json")
 NPS_SOURCE_LABEL = "국민연금 신규/추가매수"
+_SCORE_SOURCES = (
+    ("턴", "연간실적호전"),
+    ("수급", "순매수전환"),
+    ("연금", NPS_SOURCE_LABEL),
+)
+_DETAIL_SKIP_KEYS = frozenset(("No.", "종목명"))
+_NO_DATA_LABELS = frozenset(("", "-", "자료가 없습니다", "데이터가 없습니다"))
 
 REQUEST_HEADERS = {
     "User-Agent": (
@@ -88,7 +100,16 @@ _SHARE_CHANGE_TABLE_ID_RE = re.compile(
 _HTML_ROW_RE = re.compile(r"<tr[^>]*>(.*?)</tr>", re.I | re.S)
 _HTML_CELL_RE = re.compile(r"<t[dh][^>]*>(.*?)</t[dh]>", re.I | re.S)
 _TAG_RE = re.compile(r"<[^>]+>")
-_thread_local = threading.local()
+_WHITESPACE_RE = re.compile(r"\s+")
+# 새로고침마다 TCP/TLS 연결을 새로 맺지 않도록 세션을 프로세스 수명 동안 재사용한다.
+_SESSION_POOL_SIZE = 32
+_session_pool: "queue.LifoQueue[requests.Session]" = queue.LifoQueue()
+# 두 JSON 피드 수집용 풀 - 호출마다 쓰레드를 새로 띄우지 않고 프로세스 수명 동안 재사용한다.
+# 각 요청은 timeout으로 끝나므로 종료 시에도 남은 작업은 제한된 시간 안에 정리된다.
+_FEED_WORKERS = 2
+_feed_executor = ThreadPoolExecutor(
+    max_workers=_FEED_WORKERS, thread_name_prefix="screening-feed"
+)
 
 
 class ScreeningDataError(RuntimeError):
@@ -97,7 +118,7 @@ class ScreeningDataError(RuntimeError):
 
 def normalize_stock_name(name: object) -> str:
     """종목명의 앞뒤 및 연속 공백을 정규화한다."""
-    return re.sub(r"\s+", " ", str(name or "").strip())
+    return _WHITESPACE_RE.sub(" ", str(name or "").strip())
 
 
 def _retry_session() -> requests.Session:
@@ -115,12 +136,56 @@ def _retry_session() -> requests.Session:
     return session
 
 
-def _worker_session() -> requests.Session:
-    session = getattr(_thread_local, "session", None)
-    if session is None:
-        session = _retry_session()
-        _thread_local.session = session
-    return session
+def _acquire_session() -> requests.Session:
+    try:
+        return _session_pool.get_nowait()
+    except queue.Empty:
+        return _retry_session()
+
+
+def _release_session(session: requests.Session) -> None:
+    if _session_pool.qsize() >= _SESSION_POOL_SIZE:
+        session.close()
+        return
+    _session_pool.put(session)
+
+
+@atexit.register
+def _shutdown_feed_executor() -> None:
+    _feed_executor.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def _close_session_pool() -> None:
+    while True:
+        try:
+            _session_pool.get_nowait().close()
+        except queue.Empty:
+            return
+
+
+class _WorkerSessions:
+    """작업 쓰레드마다 풀에서 세션 하나를 빌려 주고 수집이 끝나면 반납한다."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._leased: list[requests.Session] = []
+
+    def __call__(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = _acquire_session()
+            self._local.session = session
+            with self._lock:
+                self._leased.append(session)
+        return session
+
+    def release(self) -> None:
+        with self._lock:
+            leased, self._leased = self._leased, []
+        for session in leased:
+            _release_session(session)
 
 
 def _fetch_json_rows(
@@ -130,13 +195,17 @@ def _fetch_json_rows(
     session: Optional[requests.Session] = None,
     timeout: float = 20,
 ) -> list[dict]:
-    client = session or _retry_session()
+    client = session or _acquire_session()
     try:
         response = client.get(url, headers=REQUEST_HEADERS, timeout=timeout)
         response.raise_for_status()
-        payload = json.loads(response.content.decode("utf-8-sig"))
+        # orjson은 BOM을 허용하지 않으므로 UTF-8 BOM만 떼고 바이트를 그대로 넘긴다.
+        payload = orjson.loads(response.content.removeprefix(codecs.BOM_UTF8))
     except Exception as exc:
         raise ScreeningDataError(f"FnGuide JSON 응답 해석 실패 ({url}): {exc}") from exc
+    finally:
+        if session is None:
+            _release_session(client)
 
     raw_rows = payload.get("comp") if isinstance(payload, dict) else None
     if not isinstance(raw_rows, list):
@@ -193,12 +262,16 @@ def _table_has_caption(table_html: str, expected: str) -> bool:
     )
 
 
-def _has_snapshot_shareholder_table(html: str) -> bool:
-    shareholder_tables = [
+def _snapshot_shareholder_tables(html: str) -> list[str]:
+    """Snapshot 전체가 아니라 `주주현황` 캡션이 붙은 표 조각만 돌려준다."""
+    return [
         table_html
         for table_html in _HTML_TABLE_RE.findall(html or "")
-        if _table_has_caption(table_html, "주주현황")
+        if "주주현황" in table_html and _table_has_caption(table_html, "주주현황")
     ]
+
+
+def _shareholder_tables_are_valid(shareholder_tables: list[str]) -> bool:
     if not shareholder_tables:
         return False
 
@@ -228,33 +301,37 @@ def _share_change_rows_are_valid(table_html: str) -> bool:
     if not row_html_values:
         return True
 
-    no_data_labels = {"", "-", "자료가 없습니다", "데이터가 없습니다"}
     for row_html in row_html_values:
-        cells = [_cell_text(cell) for cell in _HTML_CELL_RE.findall(row_html)]
-        if len(cells) == 1 and cells[0] in no_data_labels:
+        raw_cells = _HTML_CELL_RE.findall(row_html)
+        if len(raw_cells) == 1 and _cell_text(raw_cells[0]) in _NO_DATA_LABELS:
             continue
-        if len(cells) < 10:
+        if len(raw_cells) < 10:
             return False
+        # 형식 검증에 쓰는 날짜·수량·지분율 칸만 정리한다.
+        changed_at, before, change, after, ratio = (
+            _cell_text(raw_cells[index]) for index in (3, 6, 7, 8, 9)
+        )
         try:
-            date.fromisoformat(cells[3].replace("/", "-").replace(".", "-"))
-            int(cells[6].replace(",", ""))
-            int(cells[7].replace(",", ""))
-            int(cells[8].replace(",", ""))
-            float(cells[9].replace(",", ""))
+            date.fromisoformat(changed_at.replace("/", "-").replace(".", "-"))
+            int(before.replace(",", ""))
+            int(change.replace(",", ""))
+            int(after.replace(",", ""))
+            float(ratio.replace(",", ""))
         except ValueError:
             return False
     return True
 
 
-def _has_share_change_table(html: str) -> bool:
+def _share_change_table(html: str) -> Optional[str]:
+    """지분분석 페이지에서 검증을 통과한 주주변동내역 표 조각을 찾는다."""
     for table_html in _HTML_TABLE_RE.findall(html or ""):
         if (
             _SHARE_CHANGE_TABLE_ID_RE.search(table_html)
             and _table_has_caption(table_html, "주주변동내역")
             and _share_change_rows_are_valid(table_html)
         ):
-            return True
-    return False
+            return table_html
+    return None
 
 
 def parse_nps_holding(
@@ -267,8 +344,21 @@ def parse_nps_holding(
     """
     if _snapshot_ticker(html) != expected_code.upper():
         return None
+    return _extract_nps_holding(
+        _snapshot_shareholder_tables(html) or [html or ""],
+        expected_code=expected_code,
+        stock_name=stock_name,
+    )
+
 
-    row_match = _NPS_ROW_RE.search(html)
+def _extract_nps_holding(
+    fragments: list[str], *, expected_code: str, stock_name: str
+) -> Optional[dict]:
+    row_match = None
+    for fragment in fragments:
+        row_match = _NPS_ROW_RE.search(fragment)
+        if row_match:
+            break
     if not row_match:
         return None
 
@@ -292,15 +382,30 @@ def parse_nps_share_events(
     """FnGuide 지분분석에서 국민연금공단 보통주 변동내역을 추출한다."""
     if _snapshot_ticker(html) != expected_code.upper():
         return []
+    return _extract_nps_share_events(
+        _share_change_table(html) or html or "",
+        expected_code=expected_code,
+        stock_name=stock_name,
+    )
 
-    body_match = _SHARE_BODY_RE.search(html or "")
+
+def _extract_nps_share_events(
+    fragment: str, *, expected_code: str, stock_name: str
+) -> list[dict]:
+    body_match = _SHARE_BODY_RE.search(fragment)
     if not body_match:
         return []
 
     events = []
     for row_html in _HTML_ROW_RE.findall(body_match.group(1)):
-        cells = [_cell_text(cell) for cell in _HTML_CELL_RE.findall(row_html)]
-        if len(cells) < 10 or cells[1] != "국민연금공단" or cells[5] != "보통주":
+        # 다른 주주 행은 태그 제거/언이스케이프 전에 원문 문자열로 먼저 거른다.
+        if "국민연금공단" not in row_html:
+            continue
+        raw_cells = _HTML_CELL_RE.findall(row_html)
+        if len(raw_cells) < 10 or _cell_text(raw_cells[1]) != "국민연금공단":
+            continue
+        cells = [_cell_text(cell) for cell in raw_cells[:10]]
+        if cells[5] != "보통주":
             continue
         try:
             before = int(cells[6].replace(",", ""))
@@ -341,13 +446,15 @@ def _fetch_nps_one(
     )
     response.raise_for_status()
     html = response.text
-    page_matches = (
-        _snapshot_ticker(html) == str(code).upper()
-        and _has_snapshot_shareholder_table(html)
-    )
-    if not page_matches:
+    if _snapshot_ticker(html) != str(code).upper():
         return False, None
-    return True, parse_nps_holding(html, expected_code=str(code), stock_name=stock_name)
+    # 주주현황 표를 한 번만 잘라 검증과 추출에 같이 쓴다.
+    shareholder_tables = _snapshot_shareholder_tables(html)
+    if not _shareholder_tables_are_valid(shareholder_tables):
+        return False, None
+    return True, _extract_nps_holding(
+        shareholder_tables, expected_code=str(code), stock_name=stock_name
+    )
 
 
 def _fetch_nps_share_one(
@@ -366,14 +473,13 @@ def _fetch_nps_share_one(
     )
     response.raise_for_status()
     html = response.text
-    page_matches = (
-        _snapshot_ticker(html) == str(code).upper()
-        and _has_share_change_table(html)
-    )
-    if not page_matches:
+    if _snapshot_ticker(html) != str(code).upper():
+        return False, []
+    table_html = _share_change_table(html)
+    if table_html is None:
         return False, []
-    return True, parse_nps_share_events(
-        html, expected_code=str(code), stock_name=stock_name
+    return True, _extract_nps_share_events(
+        table_html, expected_code=str(code), stock_name=stock_name
     )
 
 
@@ -393,35 +499,39 @@ def fetch_nps_share_events(
     rows = []
     failures = 0
     valid_pages = 0
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = {
-            executor.submit(
-                _fetch_nps_share_one,
-                normalize_stock_name(holding.get("종목명")),
-                str(holding.get("종목코드") or ""),
-                timeout=timeout,
-                session_getter=_worker_session,
-            ): holding
-            for holding in holdings
-        }
-        for future in as_completed(futures):
-            holding = futures[future]
-            try:
-                page_matches, page_rows = future.result()
-                if page_matches:
-                    valid_pages += 1
-                    if verified_codes is not None:
-                        verified_codes.add(
-                            str(holding.get("종목코드") or "").strip().upper()
-                        )
-                    rows.extend(page_rows)
-            except Exception as exc:
-                failures += 1
-                logger.debug(
-                    "국민연금 변동내역 조회 실패 (%s): %s",
-                    holding.get("종목명"),
-                    exc,
-                )
+    worker_sessions = _WorkerSessions()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    _fetch_nps_share_one,
+                    normalize_stock_name(holding.get("종목명")),
+                    str(holding.get("종목코드") or ""),
+                    timeout=timeout,
+                    session_getter=worker_sessions,
+                ): holding
+                for holding in holdings
+            }
+            for future in as_completed(futures):
+                holding = futures[future]
+                try:
+                    page_matches, page_rows = future.result()
+                    if page_matches:
+                        valid_pages += 1
+                        if verified_codes is not None:
+                            verified_codes.add(
+                                str(holding.get("종목코드") or "").strip().upper()
+                            )
+                        rows.extend(page_rows)
+                except Exception as exc:
+                    failures += 1
+                    logger.debug(
+                        "국민연금 변동내역 조회 실패 (%s): %s",
+                        holding.get("종목명"),
+                        exc,
+                    )
+    finally:
+        worker_sessions.release()
 
     minimum_valid_pages = math.ceil(len(holdings) * 0.8)
     if valid_pages < minimum_valid_pages:
@@ -484,31 +594,35 @@ def fetch_nps_holdings(
     rows = []
     failures = 0
     valid_pages = 0
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = {
-            executor.submit(
-                _fetch_nps_one,
-                normalize_stock_name(name),
-                str(code),
-                timeout=timeout,
-                session_getter=_worker_session,
-            ): (name, str(code).strip().upper())
-            for name, code in ticker_map.items()
-        }
-        for future in as_completed(futures):
-            name, code = futures[future]
-            try:
-                page_matches, row = future.result()
-                valid_pages += int(page_matches)
-                if not page_matches and code in required:
-                    unverified_required.add(code)
-                if row:
-                    rows.append(row)
-            except Exception as exc:
-                failures += 1
-                if code in required:
-                    unverified_required.add(code)
-                logger.debug("국민연금 조회 실패 (%s): %s", name, exc)
+    worker_sessions = _WorkerSessions()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    _fetch_nps_one,
+                    normalize_stock_name(name),
+                    str(code),
+                    timeout=timeout,
+                    session_getter=worker_sessions,
+                ): (name, str(code).strip().upper())
+                for name, code in ticker_map.items()
+            }
+            for future in as_completed(futures):
+                name, code = futures[future]
+                try:
+                    page_matches, row = future.result()
+                    valid_pages += int(page_matches)
+                    if not page_matches and code in required:
+                        unverified_required.add(code)
+                    if row:
+                        rows.append(row)
+                except Exception as exc:
+                    failures += 1
+                    if code in required:
+                        unverified_required.add(code)
+                    logger.debug("국민연금 조회 실패 (%s): %s", name, exc)
+    finally:
+        worker_sessions.release()
 
     if unverified_required:
         sample = ", ".join(sorted(unverified_required)[:5])
@@ -585,15 +699,24 @@ def fetch_all_data(
     errors = []
     pending_nps_state = None
     sources = ((0, "턴어라운드", fetch_turnaround), (1, "순매수전환", fetch_supply_trend))
-    for index, label, fetcher in sources:
-        try:
-            collected[index] = fetcher()
-        except Exception as exc:
-            logger.error("%s 데이터 수집 실패: %s", label, exc)
-            errors.append(f"{label}: {exc}")
+    # 두 JSON 피드는 국민연금 잠금과 무관하므로 NPS 수집과 동시에 받아 둔다.
+    feed_futures = [
+        (index, label, _feed_executor.submit(fetcher))
+        for index, label, fetcher in sources
+    ]
+
+    def collect_feeds() -> None:
+        while feed_futures:
+            index, label, future = feed_futures.pop(0)
+            try:
+                collected[index] = future.result()
+            except Exception as exc:
+                logger.error("%s 데이터 수집 실패: %s", label, exc)
+                errors.append(f"{label}: {exc}")
 
     try:
         with nps_state_lock(nps_state_path):
+            nps_error = None
             try:
                 collected[2], pending_nps_state = build_nps_buy_signals(
                     ticker_map_path,
@@ -601,8 +724,11 @@ def fetch_all_data(
                     as_of=as_of,
                 )
             except Exception as exc:
-                logger.error("국민연금 데이터 수집 실패: %s", exc)
-                errors.append(f"국민연금: {exc}")
+                nps_error = exc
+            collect_feeds()
+            if nps_error is not None:
+                logger.error("국민연금 데이터 수집 실패: %s", nps_error)
+                errors.append(f"국민연금: {nps_error}")
 
             if errors and require_all:
                 detail = "; ".join(errors)
@@ -619,6 +745,7 @@ def fetch_all_data(
                     ) from exc
             return collected[0], collected[1], collected[2]
     except NpsStateLockError as exc:
+        collect_feeds()
         logger.error("국민연금 상태 잠금 실패: %s", exc)
         errors.append(f"국민연금: {exc}")
 
@@ -635,61 +762,57 @@ def calculate_scores(
     turn_data: list[dict], supply_data: list[dict], nps_data: list[dict]
 ) -> tuple[list[dict], dict]:
     """세 데이터셋의 포함 여부를 1점씩 합산하고 상세 값을 병합한다."""
-    turn_map = {
-        normalize_stock_name(row.get("종목명")): row
-        for row in turn_data
-        if normalize_stock_name(row.get("종목명"))
-    }
-    supply_map = {
-        normalize_stock_name(row.get("종목명")): row
-        for row in supply_data
-        if normalize_stock_name(row.get("종목명"))
-    }
-    nps_map = {
-        normalize_stock_name(row.get("종목명")): row
-        for row in nps_data
-        if normalize_stock_name(row.get("종목명"))
-    }
-
-    all_stocks = set(turn_map) | set(supply_map) | set(nps_map)
-    results = []
-    for stock in all_stocks:
-        sources = []
-        if stock in turn_map:
-            sources.append("연간실적호전")
-        if stock in supply_map:
-            sources.append("순매수전환")
-        if stock in nps_map:
-            sources.append(NPS_SOURCE_LABEL)
-
-        detail = {
-            "종목명": stock,
-            "종합점수": len(sources),
-            "출처": ", ".join(sources),
-        }
-        for prefix, source_map in (
-            ("턴", turn_map),
-            ("수급", supply_map),
-            ("연금", nps_map),
-        ):
-            if stock not in source_map:
+    source_maps = []
+    for (prefix, _label), rows in zip(
+        _SCORE_SOURCES, (turn_data, supply_data, nps_data)
+    ):
+        # 같은 소스 안의 중복 종목은 기존과 같이 마지막 행만 남긴다.
+        # 접두사를 붙인 상세 열 이름은 열 목록마다 한 번만 만든다.
+        prefixed_keys: dict[str, str] = {}
+        source_map = {}
+        for row in rows:
+            stock = normalize_stock_name(row.get("종목명"))
+            if not stock:
                 continue
-            for key, value in source_map[stock].items():
-                if key not in ("No.", "종목명"):
-                    detail[f"[{prefix}]{key}"] = value
-        results.append(detail)
-
-    results.sort(key=lambda row: (-row["종합점수"], row["종목명"]))
+            details = {}
+            for key, value in row.items():
+                if key in _DETAIL_SKIP_KEYS:
+                    continue
+                detail_key = prefixed_keys.get(key)
+                if detail_key is None:
+                    detail_key = prefixed_keys[key] = f"[{prefix}]{key}"
+                details[detail_key] = value
+            source_map[stock] = details
+        source_maps.append(source_map)
+
+    merged: dict[str, dict] = {}
+    source_labels: dict[str, list[str]] = {}
+    for (_prefix, label), source_map in zip(_SCORE_SOURCES, source_maps):
+        for stock, details in source_map.items():
+            detail = merged.get(stock)
+            if detail is None:
+                # 열 순서를 유지하려고 출처 자리를 먼저 잡아 두고 마지막에 채운다.
+                detail = merged[stock] = {"종목명": stock, "종합점수": 0, "출처": ""}
+                source_labels[stock] = []
+            detail["종합점수"] += 1
+            source_labels[stock].append(label)
+            detail.update(details)
+
+    results = sorted(merged.values(), key=lambda row: (-row["종합점수"], row["종목명"]))
+    score_counts = Counter()
     for index, row in enumerate(results, start=1):
+        row["출처"] = ", ".join(source_labels[row["종목명"]])
         row["순위"] = index
+        score_counts[row["종합점수"]] += 1
 
+    turn_map, supply_map, nps_map = source_maps
     stats = {
         "turn_count": len(turn_map),
         "supply_count": len(supply_map),
         "nps_count": len(nps_map),
-        "total": len(all_stocks),
-        "score_3": sum(row["종합점수"] == 3 for row in results),
-        "score_2": sum(row["종합점수"] == 2 for row in results),
-        "score_1": sum(row["종합점수"] == 1 for row in results),
+        "total": len(results),
+        "score_3": score_counts[3],
+        "score_2": score_counts[2],
+        "score_1": score_counts[1],
     }
     return results, stats
@@ -22,6 +22,8 @@ import os
 import threading
 import time
 from datetime import date, datetime, timedelta
+from itertools import groupby
+from operator import itemgetter
 from typing import Dict, List, Tuple, Optional
 from zoneinfo import ZoneInfo
 
@@ -535,6 +537,41 @@ class StockDB:
         finally:
             con.close()
 
+    def get_prices_bulk(self, tickers: List[str], start_date: str,
+                        end_date: str) -> Dict[str, List[dict]]:
+        """
+        여러 종목의 일봉 데이터를 쿼리 한 번으로 조회
+
+        Args:
+            tickers: 종목코드 리스트
+            start_date, end_date: 'YYYY-MM-DD' 형식
+        Returns:
+            {종목코드: get_prices()와 같은 형식의 리스트} - 데이터가 없으면 빈 리스트
+        """
+        result: Dict[str, List[dict]] = {ticker: [] for ticker in tickers}
+        if not result:
+            return result
+
+        placeholders = ', '.join('?' for _ in result)
+        con = self._connect()
+        try:
+            rows = con.execute(f"""
+                SELECT ticker, CAST(date AS VARCHAR), open, high, low, close, volume
+                FROM daily_prices
+                WHERE ticker IN ({placeholders}) AND date >= ? AND date <= ?
+                ORDER BY ticker, date
+            """, [*result, start_date, end_date]).fetchall()
+        finally:
+            con.close()
+
+        for ticker, group in groupby(rows, key=itemgetter(0)):
+            result[ticker] = [
+                {'date': r[1], 'open': r[2], 'high': r[3],
+                 'low': r[4], 'close': r[5], 'volume': int(r[6] or 0)}
+                for r in group
+            ]
+        return result
+
     @staticmethod
     def _number(value, default: float = 0.0) -> float:
         try:
@@ -718,18 +755,22 @@ class StockDB:
             {'total': 전체 종목수, 'fetched': API 호출 종목수, 'new_days': 신규 일수}
         """
         stats = {'total': len(tickers), 'fetched': 0, 'new_days': 0}
+        # API를 실제로 호출한 뒤에만 속도 제한을 두고, 이미 지난 시간은 빼고 기다린다.
+        next_api_at = 0.0
 
         for i, ticker in enumerate(tickers):
             if progress_callback:
                 progress_callback(i + 1, len(tickers), ticker)
 
+            wait = next_api_at - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)  # API 속도 제한
+
             new = self.fetch_and_store(ticker, start_yyyymmdd, end_yyyymmdd, krx_module)
             if new > 0:
                 stats['fetched'] += 1
                 stats['new_days'] += new
-                time.sleep(delay)  # API 속도 제한
-            else:
-                time.sleep(0.05)  # DB만 읽은 경우 짧게
+                next_api_at = time.monotonic() + delay
 
         return stats
 
@@ -91,9 +91,24 @@ def generate_html(result_df, df_turn, df_supply, df_nps, stats, output_path):
     now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
     # 메인 테이블 HTML
-    main_rows_html = ""
-    for idx, row in result_df.iterrows():
-        score = row['종합점수']
+    # 상세 열 분류는 행마다 다시 훑지 않도록 열 목록에서 한 번만 계산한다.
+    detail_columns = []
+    for position, col in enumerate(result_df.columns):
+        for prefix, css_class in (('[턴]', 'turn'), ('[수급]', 'supply'), ('[연금]', 'nps')):
+            if col.startswith(prefix):
+                detail_columns.append((position, css_class, _html(col[len(prefix):])))
+                break
+
+    main_rows = []
+    if not result_df.empty:
+        score_pos = result_df.columns.get_loc('종합점수')
+        name_pos = result_df.columns.get_loc('종목명')
+        source_pos = result_df.columns.get_loc('출처')
+        rows = zip(result_df.index, result_df.itertuples(index=False, name=None))
+    else:
+        rows = ()
+    for idx, values in rows:
+        score = values[score_pos]
         if score == 3:
             row_class = 'score-3'
         elif score == 2:
@@ -103,7 +118,7 @@ def generate_html(result_df, df_turn, df_supply, df_nps, stats, output_path):
 
         badge = f'<span class="badge badge-{score}">{score}점</span>'
         sources_html = ''
-        for src in row['출처'].split(', '):
+        for src in values[source_pos].split(', '):
             if src == '연간실적호전':
                 sources_html += '<span class="tag tag-turn">연간실적호전</span> '
             elif src == '순매수전환':
@@ -113,36 +128,25 @@ def generate_html(result_df, df_turn, df_supply, df_nps, stats, output_path):
 
         # 상세 정보 구성
         detail_parts = []
-        for col in result_df.columns:
-            if col.startswith('[턴]') and pd.notna(row.get(col)) and row.get(col, '') != '':
-                label = col.replace('[턴]', '')
-                detail_parts.append(
-                    f'<span class="detail-item turn">{_html(label)}: '
-                    f'{_html(row[col])}</span>'
-                )
-            elif col.startswith('[수급]') and pd.notna(row.get(col)) and row.get(col, '') != '':
-                label = col.replace('[수급]', '')
-                detail_parts.append(
-                    f'<span class="detail-item supply">{_html(label)}: '
-                    f'{_html(row[col])}</span>'
-                )
-            elif col.startswith('[연금]') and pd.notna(row.get(col)) and row.get(col, '') != '':
-                label = col.replace('[연금]', '')
+        for position, css_class, label in detail_columns:
+            value = values[position]
+            if pd.notna(value) and value != '':
                 detail_parts.append(
-                    f'<span class="detail-item nps">{_html(label)}: '
-                    f'{_html(row[col])}</span>'
+                    f'<span class="detail-item {css_class}">{label}: '
+                    f'{_html(value)}</span>'
                 )
 
         details_html = ' '.join(detail_parts)
 
-        main_rows_html += f"""
+        main_rows.append(f"""
         <tr class="{row_class}" data-score="{score}">
             <td class="center">{idx}</td>
-            <td class="stock-name"><strong>{_html(row['종목명'])}</strong></td>
+            <td class="stock-name"><strong>{_html(values[name_pos])}</strong></td>
             <td class="center">{badge}</td>
             <td>{sources_html}</td>
             <td class="details">{details_html}</td>
-        </tr>"""
+        </tr>""")
+    main_rows_html = ''.join(main_rows)
 
     # 개별 데이터셋 테이블 생성 함수
     def make_sub_table(df, table_id):
@@ -150,10 +154,10 @@ def generate_html(result_df, df_turn, df_supply, df_nps, stats, output_path):
             return '<p>데이터 없음</p>'
         cols = [c for c in df.columns if c != 'No.']
         header = ''.join(f'<th>{_html(c)}</th>' for c in cols)
-        rows = ''
-        for _, row in df.iterrows():
-            cells = ''.join(f'<td>{_html(row.get(c, ""))}</td>' for c in cols)
-            rows += f'<tr>{cells}</tr>'
+        rows = ''.join(
+            '<tr>' + ''.join(f'<td>{_html(value)}</td>' for value in values) + '</tr>'
+            for values in df[cols].itertuples(index=False, name=None)
+        )
         return f"""<table id="{table_id}" class="sub-table">
             <thead><tr>{header}</tr></thead>
             <tbody>{rows}</tbody>
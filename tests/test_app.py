@@ -1,7 +1,10 @@
 import csv
+import gzip
 import io
 import json
 import math
+import os
+import re
 import subprocess
 import tempfile
 import threading
@@ -15,15 +18,6 @@ from unittest.mock import MagicMock, patch
 import app as app_module
 
 
-class DeferredThread:
-    def __init__(self, *args, **kwargs):
-        self.args = args
-        self.kwargs = kwargs
-
-    def start(self):
-        return None
-
-
 class BacktestFilterTest(unittest.TestCase):
     @staticmethod
     def all_subsets(values):
@@ -94,14 +88,16 @@ class FlaskApiTest(unittest.TestCase):
                 nps=[],
                 last_updated=None,
             )
+        app_module.refresh_settled.set()
         with app_module.bt_lock:
             app_module.backtest_state.update(
                 status="idle", results=None, error_msg="", progress="", engine=None
             )
+            app_module._backtest_changed()
 
     def test_refresh_reserves_loading_state_before_thread_starts(self):
         try:
-            with patch.object(app_module.threading, "Thread", DeferredThread):
+            with patch.object(app_module.refresh_executor, "submit"):
                 first = self.client.post("/api/refresh")
                 second = self.client.post("/api/refresh")
         finally:
@@ -112,6 +108,20 @@ class FlaskApiTest(unittest.TestCase):
         self.assertEqual(first.get_json()["status"], "started")
         self.assertEqual(second.get_json()["status"], "already_loading")
 
+    def test_reserved_refresh_settles_before_releasing_the_lock(self):
+        settled_at_release = []
+
+        class RecordingLock:
+            def release(self):
+                settled_at_release.append(app_module.refresh_settled.is_set())
+
+        app_module.refresh_settled.clear()
+        with patch.object(app_module, "refresh_lock", RecordingLock()), \
+                patch.object(app_module, "_refresh_data_locked", return_value=True):
+            self.assertTrue(app_module._run_reserved_refresh())
+
+        self.assertEqual(settled_at_release, [True])
+
     def test_refresh_api_does_not_overwrite_active_scheduler_state(self):
         with app_module.data_lock:
             app_module.current_data.update(
@@ -121,7 +131,7 @@ class FlaskApiTest(unittest.TestCase):
 
         self.assertTrue(app_module.refresh_lock.acquire(blocking=False))
         try:
-            with patch.object(app_module.threading, "Thread") as thread:
+            with patch.object(app_module.refresh_executor, "submit") as submit:
                 response = self.client.post("/api/refresh")
         finally:
             app_module.refresh_lock.release()
@@ -129,10 +139,300 @@ class FlaskApiTest(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.get_json()["status"], "already_loading")
         self.assertEqual(app_module.current_data["status"], "done")
-        thread.assert_not_called()
+        submit.assert_not_called()
+
+    def test_status_poll_omits_screening_rows(self):
+        with app_module.data_lock:
+            app_module.current_data.update(
+                status="done",
+                result=[{"종목명": "A", "종합점수": 1}],
+                stats={"total": 1},
+            )
+
+        payload = self.client.get("/api/status").get_json()
+
+        self.assertEqual(payload["status"], "done")
+        self.assertEqual(payload["stats"], {"total": 1})
+        self.assertNotIn("result", payload)
+        self.assertNotIn("turn", payload)
+
+    def test_json_provider_matches_flask_default_encoding(self):
+        from datetime import date
+        from decimal import Decimal
+        from flask.json.provider import DefaultJSONProvider
+
+        payload = {
+            "b": [1, 2.5, None, "한글"],
+            "a": {"date": date(2026, 1, 2), "ratio": Decimal("1.5")},
+        }
+        with app_module.app.app_context():
+            encoded = app_module.app.json.dumps(payload)
+            expected = DefaultJSONProvider(app_module.app).dumps(payload)
+            response = app_module.app.json.response(payload)
+
+        self.assertEqual(json.loads(encoded), json.loads(expected))
+        self.assertLess(encoded.index('"a"'), encoded.index('"b"'))
+        self.assertEqual(response.get_json(), json.loads(expected))
+
+    def test_status_wait_returns_when_refresh_finishes(self):
+        with app_module.data_lock:
+            app_module.current_data["status"] = "loading"
+        app_module.refresh_settled.clear()
+
+        def finish():
+            with app_module.data_lock:
+                app_module.current_data["status"] = "done"
+            app_module.refresh_settled.set()
+
+        timer = threading.Timer(0.05, finish)
+        timer.start()
+        try:
+            started = time.monotonic()
+            payload = self.client.get("/api/status/wait?timeout=5").get_json()
+            elapsed = time.monotonic() - started
+        finally:
+            timer.cancel()
+
+        self.assertEqual(payload["status"], "done")
+        self.assertLess(elapsed, 4)
+
+    def test_status_stream_pushes_status_once_refresh_finishes(self):
+        with app_module.data_lock:
+            app_module.current_data["status"] = "loading"
+        app_module.refresh_settled.clear()
+
+        def finish():
+            with app_module.data_lock:
+                app_module.current_data["status"] = "done"
+            app_module.refresh_settled.set()
+
+        timer = threading.Timer(0.05, finish)
+        timer.start()
+        try:
+            with patch.object(app_module, "STATUS_STREAM_KEEPALIVE", 0.01):
+                response = self.client.get("/api/status/stream")
+                body = response.get_data(as_text=True)
+        finally:
+            timer.cancel()
+
+        self.assertEqual(response.mimetype, "text/event-stream")
+        self.assertTrue(body.startswith(": keep-alive\n\n"))
+        events = [line for line in body.split("\n") if line.startswith("data: ")]
+        self.assertEqual(len(events), 1)
+        self.assertEqual(json.loads(events[0][len("data: "):])["status"], "done")
+
+    def test_backtest_events_push_progress_then_results(self):
+        with app_module.bt_lock:
+            app_module.backtest_state.update(status="loading", progress="준비")
+            app_module._backtest_changed()
+
+        def advance():
+            time.sleep(0.05)
+            with app_module.bt_lock:
+                app_module.backtest_state["progress"] = "실행"
+                app_module._backtest_changed()
+            time.sleep(0.05)
+            with app_module.bt_lock:
+                app_module.backtest_state.update(
+                    status="done", results={"metrics": {"mdd": -1.5}}, progress=""
+                )
+                app_module._backtest_changed()
+
+        worker = threading.Thread(target=advance)
+        worker.start()
+        try:
+            with patch.object(app_module, "STATUS_STREAM_KEEPALIVE", 0.01):
+                response = self.client.get("/api/backtest/events")
+                body = response.get_data(as_text=True)
+        finally:
+            worker.join()
+
+        self.assertEqual(response.mimetype, "text/event-stream")
+        self.assertIn(": keep-alive\n\n", body)
+        events = [
+            (block.split("\n")[1], json.loads(block.split("\n")[2][len("data: "):]))
+            for block in body.split("\n\n")
+            if block.startswith("id: ")
+        ]
+        self.assertEqual(
+            events,
+            [
+                ("event: progress", {"progress": "준비"}),
+                ("event: progress", {"progress": "실행"}),
+                ("event: done", {}),
+            ],
+        )
+
+    def test_backtest_events_close_immediately_when_not_running(self):
+        with app_module.bt_lock:
+            tag = app_module._backtest_tag()
+        idle = self.client.get("/api/backtest/events").get_data(as_text=True)
+        with app_module.bt_lock:
+            app_module.backtest_state.update(status="error", error_msg="실패")
+        failed = self.client.get("/api/backtest/events").get_data(as_text=True)
+
+        self.assertEqual(idle, f"id: {tag}\nevent: idle\ndata: {{}}\n\n")
+        self.assertEqual(
+            failed, f'id: {tag}\nevent: error\ndata: {{"error_msg":"실패"}}\n\n'
+        )
+
+    def test_backtest_status_revalidates_without_reserializing(self):
+        with app_module.bt_lock:
+            app_module.backtest_state.update(status="done", results={"metrics": {}})
+            app_module._backtest_changed()
+
+        first = self.client.get("/api/backtest/status")
+        with patch.object(
+            app_module.orjson, "dumps", wraps=app_module.orjson.dumps
+        ) as dumps:
+            again = self.client.get(
+                "/api/backtest/status",
+                headers={"If-None-Match": first.headers["ETag"]},
+            )
+        with app_module.bt_lock:
+            app_module._backtest_changed()
+        changed = self.client.get(
+            "/api/backtest/status",
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(
+            first.headers["ETag"], f'"{first.get_json()["revision"]}"'
+        )
+        self.assertIn("no-cache", first.headers["Cache-Control"])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.headers["ETag"], first.headers["ETag"])
+        dumps.assert_not_called()
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["ETag"], first.headers["ETag"])
+
+    def test_backtest_status_is_encoded_once_per_revision(self):
+        results = {"metrics": {"mdd": -1.5}, "trades": [{"ticker": "AAA"}] * 50}
+        with app_module.bt_lock:
+            app_module.backtest_state.update(status="done", results=results)
+            app_module._backtest_changed()
+
+        with patch.object(
+            app_module.orjson, "dumps", wraps=app_module.orjson.dumps
+        ) as dumps:
+            plain = self.client.get("/api/backtest/status")
+            packed = self.client.get(
+                "/api/backtest/status", headers={"Accept-Encoding": "gzip"}
+            )
+            packed_again = self.client.get(
+                "/api/backtest/status", headers={"Accept-Encoding": "gzip"}
+            )
+
+        self.assertEqual(dumps.call_count, 1)
+        self.assertEqual(plain.get_json()["results"], results)
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertEqual(packed.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", packed.headers["Vary"])
+        self.assertEqual(gzip.decompress(packed.get_data()), plain.get_data())
+        self.assertEqual(packed_again.get_data(), packed.get_data())
+        self.assertNotEqual(packed.headers["ETag"], plain.headers["ETag"])
+
+    def test_status_wait_times_out_while_loading(self):
+        with app_module.data_lock:
+            app_module.current_data["status"] = "loading"
+        app_module.refresh_settled.clear()
+
+        payload = self.client.get("/api/status/wait?timeout=0.01").get_json()
+        bad = self.client.get("/api/status/wait?timeout=nan")
+
+        self.assertEqual(payload["status"], "loading")
+        self.assertEqual(bad.status_code, 400)
+
+    def test_data_endpoint_reencodes_only_when_data_is_replaced(self):
+        first_rows = [{"종목명": "A", "종합점수": 1}]
+        with app_module.data_lock:
+            app_module.current_data.update(status="done", result=first_rows)
+
+        with patch.object(
+            app_module.orjson, "dumps", wraps=app_module.orjson.dumps
+        ) as dumps:
+            first = self.client.get("/api/data").get_json()
+            again = self.client.get("/api/data").get_json()
+            with app_module.data_lock:
+                app_module.current_data["result"] = [{"종목명": "B", "종합점수": 2}]
+            replaced = self.client.get("/api/data").get_json()
+
+        self.assertEqual(first["result"][0]["종목명"], "A")
+        self.assertEqual(again, first)
+        self.assertEqual(replaced["result"][0]["종목명"], "B")
+        self.assertEqual(dumps.call_count, 2)
+
+    def test_data_endpoint_prerenders_escaped_main_rows(self):
+        rows = [{
+            "종목명": "A",
+            "종합점수": 2,
+            "출처": "연간실적호전, 국민연금",
+            "[턴]매출액": "<b>10</b>",
+            "[연금]지분율": 5.0,
+            "[수급]외국인": "",
+            "비고": "제외",
+        }]
+        with app_module.data_lock:
+            app_module.current_data.update(status="done", result=rows)
+
+        row = self.client.get("/api/data").get_json()["result"][0]
+
+        self.assertEqual(
+            row["_row_html"],
+            '<tr class="score-2" data-score="2">'
+            '<td class="c">1</td>'
+            '<td class="sn"><b>A</b></td>'
+            '<td class="c"><span class="badge b2">2점</span></td>'
+            '<td><span class="tag turn">연간실적호전</span>'
+            '<span class="tag nps">국민연금</span></td>'
+            '<td class="det"><span class="d nps">지분율: 5</span>'
+            '<span class="d turn">매출액: &lt;b&gt;10&lt;/b&gt;</span></td>'
+            '</tr>',
+        )
+        self.assertNotIn("_row_html", rows[0])
+
+    def test_data_endpoint_escapes_main_row_score_once(self):
+        with app_module.data_lock:
+            app_module.current_data.update(
+                status="done", result=[{"종목명": "A", "종합점수": '1"&<'}]
+            )
+
+        row = self.client.get("/api/data").get_json()["result"][0]
+
+        self.assertIn('data-score="1&quot;&amp;&lt;"', row["_row_html"])
+        self.assertIn(">1&quot;&amp;&lt;점</span>", row["_row_html"])
+        self.assertNotIn("&amp;amp;", row["_row_html"])
+
+    def test_data_endpoint_prerenders_escaped_sub_tables(self):
+        with app_module.data_lock:
+            app_module.current_data.update(
+                status="done",
+                result=[{"종목명": "<A&B>", "종합점수": 1}],
+                turn=[
+                    {"No.": 1, "종목명": "<A&B>", "수량": 0, "비율": None},
+                    {"No.": 2, "종목명": "C", "수량": 1.5},
+                ],
+                supply=[],
+            )
+
+        payload = self.client.get("/api/data").get_json()
+
+        self.assertIn(
+            '<td class="sn"><b>&lt;A&amp;B&gt;</b></td>',
+            payload["result"][0]["_row_html"],
+        )
+        self.assertEqual(
+            payload["tables"]["turn"],
+            "<thead><tr><th>비율</th><th>수량</th><th>종목명</th></tr></thead>"
+            "<tbody><tr><td></td><td>0</td><td>&lt;A&amp;B&gt;</td></tr>"
+            "<tr><td></td><td>1.5</td><td>C</td></tr></tbody>",
+        )
+        self.assertEqual(payload["tables"]["supply"], "")
+        self.assertEqual(payload["turn"][0]["종목명"], "<A&B>")
 
     def test_backtest_reserves_loading_state_before_thread_starts(self):
-        with patch.object(app_module.threading, "Thread", DeferredThread):
+        with patch.object(app_module.backtest_executor, "submit"):
             first = self.client.post("/api/backtest/run", json={})
             second = self.client.post("/api/backtest/run", json={})
 
@@ -141,20 +441,18 @@ class FlaskApiTest(unittest.TestCase):
         self.assertEqual(second.get_json()["status"], "already_loading")
 
     def test_backtest_api_passes_default_filters_to_worker(self):
-        with patch.object(app_module.threading, "Thread") as thread:
+        with patch.object(app_module.backtest_executor, "submit") as submit:
             response = self.client.post("/api/backtest/run", json={})
 
         self.assertEqual(response.status_code, 200)
-        args = thread.call_args.kwargs["args"]
+        args = submit.call_args.args
+        self.assertIs(args[0], app_module.run_backtest_task)
         self.assertEqual(args[-2:], ((3, 2), ()))
-        self.assertEqual(
-            thread.call_args.kwargs["kwargs"],
-            {"stop_loss_pct": 7.0},
-        )
-        thread.return_value.start.assert_called_once_with()
+        self.assertEqual(submit.call_args.kwargs, {"stop_loss_pct": 7.0})
+        submit.assert_called_once()
 
     def test_backtest_api_accepts_new_strategy_and_custom_stop_loss(self):
-        with patch.object(app_module.threading, "Thread") as thread:
+        with patch.object(app_module.backtest_executor, "submit") as submit:
             response = self.client.post(
                 "/api/backtest/run",
                 json={
@@ -164,11 +462,8 @@ class FlaskApiTest(unittest.TestCase):
             )
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(
-            thread.call_args.kwargs["kwargs"],
-            {"stop_loss_pct": 12.5},
-        )
-        thread.return_value.start.assert_called_once_with()
+        self.assertEqual(submit.call_args.kwargs, {"stop_loss_pct": 12.5})
+        submit.assert_called_once()
 
     def test_backtest_api_rejects_invalid_stop_loss_before_starting_worker(self):
         invalid_values = ("not-a-number", "nan", "inf", 0, 0.09, 50.01)
@@ -176,17 +471,17 @@ class FlaskApiTest(unittest.TestCase):
             with self.subTest(value=value):
                 with app_module.bt_lock:
                     app_module.backtest_state["status"] = "idle"
-                with patch.object(app_module.threading, "Thread") as thread:
+                with patch.object(app_module.backtest_executor, "submit") as submit:
                     response = self.client.post(
                         "/api/backtest/run",
                         json={"stop_loss": value},
                     )
                 self.assertEqual(response.status_code, 400)
                 self.assertIn("스탑로스", response.get_json()["error"])
-                thread.assert_not_called()
+                submit.assert_not_called()
 
     def test_backtest_api_normalizes_selected_filters(self):
-        with patch.object(app_module.threading, "Thread") as thread:
+        with patch.object(app_module.backtest_executor, "submit") as submit:
             response = self.client.post(
                 "/api/backtest/run",
                 json={
@@ -196,7 +491,7 @@ class FlaskApiTest(unittest.TestCase):
             )
 
         self.assertEqual(response.status_code, 200)
-        args = thread.call_args.kwargs["args"]
+        args = submit.call_args.args
         self.assertEqual(args[-2:], ((3, 1), ("turnaround", "nps")))
 
     def test_backtest_api_rejects_invalid_filters_before_starting_worker(self):
@@ -211,11 +506,11 @@ class FlaskApiTest(unittest.TestCase):
         )
         for payload in invalid_requests:
             with self.subTest(payload=payload):
-                with patch.object(app_module.threading, "Thread") as thread:
+                with patch.object(app_module.backtest_executor, "submit") as submit:
                     response = self.client.post("/api/backtest/run", json=payload)
                 self.assertEqual(response.status_code, 400)
                 self.assertIn("error", response.get_json())
-                thread.assert_not_called()
+                submit.assert_not_called()
 
     def test_backtest_task_reports_when_filters_match_no_stocks(self):
         with app_module.data_lock:
@@ -237,6 +532,38 @@ class FlaskApiTest(unittest.TestCase):
             "선택한 필터 조건에 맞는 종목이 없습니다.",
         )
 
+    def test_backtest_price_progress_is_throttled_but_reports_last_ticker(self):
+        with app_module.data_lock:
+            app_module.current_data["result"] = [
+                {"종목명": "A", "종합점수": 1, "출처": "연간실적호전"}
+            ]
+        seen = []
+
+        def collect(tickers, *_args, progress_callback, **_kwargs):
+            for index in range(1, 101):
+                progress_callback(index, 100, tickers[0])
+                seen.append(app_module.backtest_state["progress"])
+            raise RuntimeError("stop after progress")
+
+        with (
+            patch.object(
+                app_module.stock_db,
+                "get_or_refresh_ticker_map",
+                return_value=({"A": "000001"}, {"000001": "A"}),
+            ),
+            patch.object(
+                app_module.stock_db, "ensure_price_data", side_effect=collect
+            ),
+            patch.object(app_module.time, "monotonic", return_value=1000.0),
+        ):
+            app_module.run_backtest_task(
+                6, 100_000_000, "equal_weight", score_filters=(1,)
+            )
+
+        self.assertEqual(seen[0], "주가 데이터 수집 중... (1/100) A")
+        self.assertEqual(seen[98], seen[0])
+        self.assertEqual(seen[99], "주가 데이터 수집 중... (100/100) A")
+
     def test_backtest_result_records_effective_filters(self):
         with app_module.data_lock:
             app_module.current_data["result"] = [
@@ -259,7 +586,11 @@ class FlaskApiTest(unittest.TestCase):
                 "ensure_price_data",
                 return_value={"fetched": 0, "new_days": 0},
             ),
-            patch.object(app_module.stock_db, "get_prices", return_value=[1]),
+            patch.object(
+                app_module.stock_db,
+                "get_prices_bulk",
+                return_value={"000001": [1]},
+            ),
             patch.object(app_module.stock_db, "ensure_index_data"),
             patch.object(app_module.stock_db, "get_index_prices", return_value=[]),
             patch.object(
@@ -302,7 +633,7 @@ class FlaskApiTest(unittest.TestCase):
         invalid_strategy = self.client.post(
             "/api/backtest/run", json={"strategy": "unknown"}
         )
-        with patch.object(app_module.threading, "Thread", DeferredThread):
+        with patch.object(app_module.backtest_executor, "submit"):
             invalid_shape = self.client.post("/api/backtest/run", json=[])
             malformed_json = self.client.post(
                 "/api/backtest/run", data="{", content_type="application/json"
@@ -448,9 +779,400 @@ process.stdout.write(JSON.stringify({{
         self.assertIn("${fmtTradePct(t.return_pct)}", template)
         self.assertNotIn("((v >= 0 ? '+' : '') + v + '%')", template)
 
+    def test_backtest_page_defers_chart_library(self):
+        template = app_module.BACKTEST_TEMPLATE
+        head = template[:template.index("</head>")]
+
+        self.assertIn('<script defer src="https://cdn.jsdelivr.net/npm/uplot@', head)
+        self.assertNotIn("<script src=", head)
+
+    def test_backtest_charts_pass_flat_series_to_uplot(self):
+        template = app_module.BACKTEST_TEMPLATE
+        start = template.index("const CHART_HEIGHT =")
+        end = template.index("function renderStrategyStockTable(", start)
+        dates = ["2026-01-02", "2026-01-05", "2026-01-06"]
+        result = {
+            "equity_curve": {
+                "dates": dates,
+                "equity": [100000000, 110000000, 105000000],
+            },
+            "drawdown_curve": {"dates": dates, "dd": [0, 0, -4.55]},
+            "benchmark": {
+                "curve": {
+                    "dates": ["2026-01-02", "2026-01-06", "2026-01-07"],
+                    "equity": [100000000, 102000000, 103000000],
+                }
+            },
+        }
+        node_script = f"""
+const vm = require('node:vm');
+const charts = [];
+const updates = [];
+let destroyed = 0;
+function uPlot(opts, data, el) {{
+    charts.push({{ opts, data, el }});
+    this.series = [{{}}, ...opts.series.slice(1)];
+    this.setData = data => updates.push(data.length);
+    this.destroy = () => {{ destroyed += 1; }};
+}}
+uPlot.tzDate = date => date;
+const context = {{
+    r: {json.dumps(result)},
+    equityChartObj: null,
+    ddChartObj: null,
+    fmt: n => String(n),
+    uPlot,
+    window: {{ addEventListener: () => {{}} }},
+    document: {{ getElementById: id => ({{ id, clientWidth: 480 }}) }},
+}};
+vm.runInNewContext(
+    {json.dumps(template[start:end])} + '\\nrenderEquityChart(r); renderDDChart(r);',
+    context,
+    {{ timeout: 250 }},
+);
+vm.runInContext('renderEquityChart(r); renderDDChart(r);', context);
+vm.runInContext('delete r.benchmark; renderEquityChart(r);', context);
+const reuse = {{ updates, destroyed, created: charts.length }};
+charts.length = 2;
+process.stdout.write(JSON.stringify(charts.map(({{ opts, data, el }}) => ({{
+    el: el.id,
+    width: opts.width,
+    height: opts.height,
+    typed: data.slice(0, 2).every(
+        column => Object.prototype.toString.call(column) === '[object Float64Array]'
+    ),
+    data: data.map(column => Array.from(column)),
+    labels: opts.series.slice(1).map(series => series.label),
+    legend: opts.series.slice(1).map(series => series.value(null, data[1][2])),
+    ticks: opts.axes[1].values(null, [data[1][1]]),
+}})).concat(reuse)));
+"""
+
+        completed = subprocess.run(
+            ["node", "-e", node_script],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=2,
+        )
+
+        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
+        equity, drawdown, reuse = json.loads(completed.stdout)
+        self.assertEqual(reuse, {"updates": [3, 2], "destroyed": 1, "created": 3})
+        days = [1767312000, 1767571200, 1767657600]
+        self.assertEqual(equity["el"], "equityChart")
+        self.assertEqual((equity["width"], equity["height"]), (480, 300))
+        self.assertTrue(equity["typed"])
+        self.assertEqual(
+            equity["data"],
+            [
+                days,
+                [100000000, 110000000, 105000000],
+                [100000000, None, 102000000],
+            ],
+        )
+        self.assertEqual(equity["labels"], ["포트폴리오", "KOSPI"])
+        self.assertEqual(equity["legend"], ["105000000원", "105000000원"])
+        self.assertEqual(equity["ticks"], ["1.1억"])
+        self.assertEqual(drawdown["el"], "ddChart")
+        self.assertTrue(drawdown["typed"])
+        self.assertEqual(drawdown["data"], [days, [0, 0, -4.55]])
+        self.assertEqual(drawdown["legend"], ["-4.55%"])
+        self.assertEqual(drawdown["ticks"], ["0%"])
+        self.assertNotIn("Chart.js", template)
+
+    def test_backtest_trade_table_renders_only_scrolled_window(self):
+        template = app_module.BACKTEST_TEMPLATE
+        start = template.index("const tradePctFormatter =")
+        end = template.index("function downloadCSV(", start)
+        trades = [
+            {
+                "ticker": f"{index:06d}",
+                "name": f"종목{index}",
+                "entry_date": "2026-01-02",
+                "entry_price": 1000,
+                "shares": 10,
+                "buy_amount": 10000,
+                "avg_price": 1000,
+                "total_buy_amount": 10000,
+                "eval_amount": 11000,
+                "eval_pnl": 1000,
+                "exit_date": None,
+                "exit_price": None,
+                "exit_cost": None,
+                "realized_pnl": None,
+                "return_pct": 10,
+                "status": "closed" if index % 2 else "open",
+            }
+            for index in range(200)
+        ]
+        node_script = f"""
+const vm = require('node:vm');
+const writes = [];
+const scroll = {{ scrollTop: 0 }};
+const body = {{
+    set innerHTML(html) {{ writes.push(html); }},
+    querySelector: () => ({{ offsetHeight: 30 }}),
+}};
+const elements = {{ tradeScroll: scroll, tradeBody: body }};
+const context = {{
+    trades: {json.dumps(trades)},
+    TRADE_WINDOW: 50,
+    TRADE_OVERSCAN: 10,
+    tradeRows: [],
+    tradeRowHeight: 0,
+    tradeWindowStart: -1,
+    tradeWindowEnd: -1,
+    fmt: n => String(n),
+    Intl,
+    document: {{ getElementById: id => elements[id] }},
+}};
+vm.runInNewContext({json.dumps(template[start:end])}, context, {{ timeout: 250 }});
+const run = code => vm.runInContext(code, context);
+run('renderTradeRows(trades)');
+const top = writes.at(-1);
+const topWrites = writes.length;
+run('renderTradeWindow()');
+const unchangedWrites = writes.length;
+scroll.scrollTop = 3000;
+run('renderTradeWindow()');
+const scrolled = writes.at(-1);
+run('renderTradeRows([])');
+process.stdout.write(JSON.stringify({{
+    top, topWrites, unchangedWrites, scrolled, empty: writes.at(-1),
+    resetScroll: scroll.scrollTop,
+}}));
+"""
+
+        completed = subprocess.run(
+            ["node", "-e", node_script],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=2,
+        )
+
+        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
+        result = json.loads(completed.stdout)
+        top = result["top"]
+        self.assertEqual(top.count("<tr>"), 50)
+        self.assertIn("<b>종목0</b>", top)
+        self.assertNotIn("<b>종목50</b>", top)
+        self.assertIn('<tr class="vs-pad" style="height:4500px">', top)
+        self.assertEqual(result["unchangedWrites"], result["topWrites"])
+        scrolled = result["scrolled"]
+        self.assertEqual(scrolled.count("<tr>"), 50)
+        self.assertIn('<tr class="vs-pad" style="height:2700px">', scrolled)
+        self.assertIn("<b>종목90</b>", scrolled)
+        self.assertNotIn("<b>종목89</b>", scrolled)
+        self.assertIn('<tr class="vs-pad" style="height:1800px">', scrolled)
+        self.assertIn("매매 이력이 없습니다", result["empty"])
+        self.assertEqual(result["resetScroll"], 0)
+        self.assertNotIn("innerHTML +=", template)
+
+    def test_backtest_status_fetch_failure_falls_back_to_polling(self):
+        template = app_module.BACKTEST_TEMPLATE
+        start = template.index("function stopWatching() {")
+        end = template.index("function finishBacktest(", start)
+        node_script = f"""
+const vm = require('node:vm');
+const responses = [
+    () => Promise.reject(new Error('network')),
+    () => Promise.resolve({{ ok: true, json: () => ({{ status: 'done', progress: '' }}) }}),
+];
+const timers = [];
+const finished = [];
+const context = {{
+    pollTimer: null,
+    backtestEvents: null,
+    fetch: () => responses.shift()(),
+    setInterval: (fn, ms) => {{ timers.push(fn); return timers.length; }},
+    clearInterval: () => {{}},
+    finishBacktest: d => finished.push(d.status),
+    document: {{ getElementById: () => ({{ textContent: '' }}) }},
+}};
+vm.runInNewContext({json.dumps(template[start:end])}, context, {{ timeout: 250 }});
+vm.runInContext('pollStatus()', context);
+setTimeout(() => {{
+    const timerAfterFailure = context.pollTimer;
+    timers[0]();
+    setTimeout(() => {{
+        process.stdout.write(JSON.stringify({{
+            timerAfterFailure, intervals: timers.length, finished,
+            timerAfterDone: context.pollTimer,
+        }}));
+    }}, 0);
+}}, 0);
+"""
+
+        completed = subprocess.run(
+            ["node", "-e", node_script],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=2,
+        )
+
+        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
+        result = json.loads(completed.stdout)
+        self.assertEqual(result["timerAfterFailure"], 1)
+        self.assertEqual(result["intervals"], 1)
+        self.assertEqual(result["finished"], ["done"])
+        self.assertIsNone(result["timerAfterDone"])
+
+    def test_backtest_charts_draw_after_the_results_paint(self):
+        template = app_module.BACKTEST_TEMPLATE
+        start = template.index("function renderResults(r) {")
+        end = template.index("window.addEventListener('resize'", start)
+        node_script = f"""
+const vm = require('node:vm');
+const frames = [];
+const timers = [];
+const drawn = [];
+const context = {{
+    fmt: n => String(n),
+    document: {{ getElementById: () => ({{ style: {{}}, innerHTML: '' }}) }},
+    renderStrategyStockTable: () => {{}},
+    renderTradeHistory: () => {{}},
+    requestAnimationFrame: fn => {{ frames.push(fn); return frames.length; }},
+    cancelAnimationFrame: id => {{ frames[id - 1] = null; }},
+    setTimeout: fn => {{ timers.push(fn); return timers.length; }},
+    clearTimeout: id => {{ if (id) timers[id - 1] = null; }},
+}};
+vm.runInNewContext({json.dumps(template[start:end])}, context, {{ timeout: 250 }});
+context.renderEquityChart = r => drawn.push('equity:' + r.id);
+context.renderDDChart = r => drawn.push('dd:' + r.id);
+const run = id => vm.runInContext(
+    'renderResults({{ id: ' + id + ', metrics: {{}} }})', context);
+const result = {{}};
+run(1);
+frames[0]();
+result.afterFrame = drawn.length;
+run(2);
+result.staleTimer = timers[0];
+frames[1]();
+timers[1]();
+result.drawn = drawn;
+process.stdout.write(JSON.stringify(result));
+"""
+
+        completed = subprocess.run(
+            ["node", "-e", node_script],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=2,
+        )
+
+        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
+        result = json.loads(completed.stdout)
+        self.assertEqual(result["afterFrame"], 0)
+        self.assertIsNone(result["staleTimer"])
+        self.assertEqual(result["drawn"], ["equity:2", "dd:2"])
+
+    def test_backtest_trade_filters_use_ticker_index_once_per_frame(self):
+        template = app_module.BACKTEST_TEMPLATE
+        start = template.index("// 전역 변수로 trades 보관")
+        end = template.index("function downloadCSV(", start)
+        trades = [
+            {"ticker": "AAA", "name": "에이", "entry_date": "2026-01-02",
+             "status": "closed", "realized_pnl": 10},
+            {"ticker": "BBB", "name": "비", "entry_date": "2026-01-03",
+             "status": "open", "realized_pnl": None},
+            {"ticker": "AAA", "name": "에이", "entry_date": "2026-01-05",
+             "status": "closed", "realized_pnl": -5},
+        ]
+        node_script = f"""
+const vm = require('node:vm');
+const field = value => ({{ value, textContent: '', innerHTML: '', scrollTop: 0 }});
+const elements = {{
+    tradeStockFilter: field('all'), tradeStatusFilter: field('all'),
+    tradePnlFilter: field('all'), tradeDateFrom: field(''), tradeDateTo: field(''),
+    tradeFilterCount: field(''), tradeScroll: field(''), tradeBody: field(''),
+}};
+const frames = [];
+const rendered = [];
+const context = {{
+    r: {{ trades: {json.dumps(trades)} }},
+    document: {{ getElementById: id => elements[id] }},
+    requestAnimationFrame: fn => frames.push(fn),
+    cancelAnimationFrame: id => {{ if (id) frames[id - 1] = null; }},
+}};
+vm.runInNewContext({json.dumps(template[start:end])}, context, {{ timeout: 250 }});
+context.renderTradeRows = trades => rendered.push(trades.map(t => t.entry_date));
+vm.runInContext('renderTradeHistory(r)', context);
+const options = elements.tradeStockFilter.innerHTML;
+elements.tradeStockFilter.value = 'BBB';
+vm.runInContext('filterTrades()', context);
+elements.tradeStockFilter.value = 'AAA';
+elements.tradePnlFilter.value = 'profit';
+vm.runInContext('filterTrades()', context);
+const beforeFrame = rendered.length;
+frames.forEach(fn => fn && fn());
+process.stdout.write(JSON.stringify({{
+    options, beforeFrame, rendered, count: elements.tradeFilterCount.textContent,
+}}));
+"""
+
+        completed = subprocess.run(
+            ["node", "-e", node_script],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=2,
+        )
+
+        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
+        result = json.loads(completed.stdout)
+        self.assertEqual(
+            result["options"],
+            '<option value="all">전체 종목</option>'
+            '<option value="AAA">에이 (AAA)</option>'
+            '<option value="BBB">비 (BBB)</option>',
+        )
+        self.assertEqual(result["beforeFrame"], 1)
+        self.assertEqual(
+            result["rendered"],
+            [["2026-01-02", "2026-01-03", "2026-01-05"], ["2026-01-02"]],
+        )
+        self.assertEqual(result["count"], "1/3건")
+
+    def test_page_number_formatters_group_thousands(self):
+        inputs = [0, -0.0, 999, 1000, -1234567, 100000000, 1234.56, 0.1, 1234.5678]
+        expected = [
+            "0", "0", "999", "1,000", "-1,234,567", "100,000,000",
+            "1,234.56", "0.1", "1,234.5678",
+        ]
+        for name in ("BACKTEST_TEMPLATE", "DB_VIEWER_TEMPLATE"):
+            with self.subTest(template=name):
+                template = getattr(app_module, name)
+                start = template.index("const numberFormatter =")
+                end = template.index("\n\n", template.index("function fmt(", start))
+                node_script = f"""
+const vm = require('node:vm');
+const outputs = vm.runInNewContext(
+    {json.dumps(template[start:end])} + '\\ninputs.map(fmt)',
+    {{ inputs: {json.dumps(inputs)}, Intl }},
+    {{ timeout: 250 }},
+);
+process.stdout.write(JSON.stringify(outputs));
+"""
+                completed = subprocess.run(
+                    ["node", "-e", node_script],
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                    timeout=2,
+                )
+
+                self.assertEqual(completed.returncode, 0, msg=completed.stderr)
+                self.assertEqual(json.loads(completed.stdout), expected)
+                self.assertNotIn("(?=(\\d{3})+(?!\\d))", template)
+                self.assertNotIn("signDisplay:", template)
+
     def test_backtest_csv_formats_trade_return_pct_to_two_decimal_places(self):
         engine = MagicMock()
-        engine.get_daily_detail.return_value = []
+        engine.iter_daily_detail.return_value = iter(())
 
         def trade_row(ticker, return_pct):
             return {
@@ -500,6 +1222,89 @@ process.stdout.write(JSON.stringify({{
         self.assertEqual(math.copysign(1.0, trades[3]["return_pct"]), 1.0)
         self.assertEqual(math.copysign(1.0, trades[4]["return_pct"]), -1.0)
 
+    def test_backtest_csv_streams_daily_rows(self):
+        engine = MagicMock()
+        engine.iter_daily_detail.return_value = iter(
+            [
+                {
+                    "date": "2026-01-02", "ticker": "005930", "name": "삼성전자",
+                    "open": 100, "high": 110, "low": 90, "close": 105,
+                    "volume": 1000, "action": "BUY", "shares_traded": 3,
+                    "exec_price": 100, "trade_cost": 1, "holding_shares": 3,
+                    "holding_value": 315, "portfolio_equity": 1000,
+                    "portfolio_cash": 685,
+                }
+            ]
+        )
+        with app_module.bt_lock:
+            app_module.backtest_state.update(
+                engine=engine,
+                results={"trades": [], "config": {"strategy": "equal_weight"}},
+            )
+
+        response = self.client.get("/api/backtest/csv")
+
+        self.assertTrue(response.is_streamed)
+        rows = list(csv.reader(io.StringIO(response.data.decode("utf-8-sig"))))
+        self.assertEqual(rows[1][:3], ["2026-01-02", "005930", "삼성전자"])
+        self.assertEqual(rows[1][8], "BUY")
+        engine.get_daily_detail.assert_not_called()
+
+    def test_backtest_csv_gzip_is_built_once_per_result(self):
+        daily = {
+            "date": "2026-01-02", "ticker": "005930", "name": "삼성전자",
+            "open": 100, "high": 110, "low": 90, "close": 105,
+            "volume": 1000, "action": "BUY", "shares_traded": 3,
+            "exec_price": 100, "trade_cost": 1, "holding_shares": 3,
+            "holding_value": 315, "portfolio_equity": 1000,
+            "portfolio_cash": 685,
+        }
+        engine = MagicMock()
+        engine.iter_daily_detail.side_effect = lambda: iter([daily])
+        with app_module.bt_lock:
+            app_module.backtest_state.update(
+                engine=engine,
+                results={"trades": [], "config": {"strategy": "equal_weight"}},
+            )
+            app_module._backtest_changed()
+
+        packed = self.client.get(
+            "/api/backtest/csv", headers={"Accept-Encoding": "gzip"}
+        )
+        packed_again = self.client.get(
+            "/api/backtest/csv", headers={"Accept-Encoding": "gzip"}
+        )
+        plain = self.client.get("/api/backtest/csv")
+
+        self.assertEqual(packed.headers["Content-Encoding"], "gzip")
+        self.assertIn("attachment; filename=backtest_equal_weight_",
+                      packed.headers["Content-Disposition"])
+        self.assertEqual(gzip.decompress(packed.data), plain.data)
+        self.assertEqual(packed_again.data, packed.data)
+        self.assertEqual(engine.iter_daily_detail.call_count, 2)
+
+        with app_module.bt_lock:
+            app_module._backtest_changed()
+        self.assertIsNone(app_module._backtest_csv_cache["tag"])
+        self.assertEqual(app_module._backtest_csv_cache["gzip"], b"")
+
+    def test_backtest_csv_gzip_is_not_cached_for_a_superseded_result(self):
+        engine = MagicMock()
+
+        def rows_then_new_result():
+            with app_module.bt_lock:
+                app_module._backtest_changed()
+            yield "a,b\r\n"
+
+        with app_module.bt_lock:
+            stale_tag = app_module._backtest_tag()
+        with patch.object(app_module, "_backtest_csv_lines",
+                          side_effect=lambda *_: rows_then_new_result()):
+            body = app_module._backtest_csv_gzip(stale_tag, engine, {})
+
+        self.assertEqual(gzip.decompress(body), b"a,b\r\n")
+        self.assertIsNone(app_module._backtest_csv_cache["tag"])
+
     def test_db_routes_return_client_errors_for_invalid_requests(self):
         missing = self.client.get("/api/db/schema/not_a_table")
         bad_page_size = self.client.get("/api/db/query/daily_prices?page_size=0")
@@ -560,11 +1365,142 @@ process.stdout.write(JSON.stringify({{
                 ),
             ):
                 app_module.refresh_data()
+                app_module.flush_cache_writes()
 
             cache = json.loads(cache_path.read_text(encoding="utf-8"))
 
         self.assertEqual(cache["version"], app_module.CACHE_VERSION)
 
+    def test_refresh_bumps_data_version_and_data_etag(self):
+        stats = {"score_3": 0, "score_2": 0, "score_1": 1}
+        rows = [{"종목명": "A", "종합점수": 1}]
+        before = self.client.get("/api/status").get_json()["version"]
+        stale = self.client.get("/api/data")
+        with tempfile.TemporaryDirectory() as directory:
+            with (
+                patch.object(
+                    app_module,
+                    "CACHE_FILE",
+                    str(Path(directory) / "cache_data.json"),
+                ),
+                patch.object(
+                    app_module, "fetch_all_data", return_value=([], [], [])
+                ),
+                patch.object(
+                    app_module, "calculate_scores", return_value=(rows, stats)
+                ),
+                patch.object(
+                    app_module.stock_db,
+                    "replace_screening_results",
+                    return_value=1,
+                ),
+            ):
+                app_module.refresh_data()
+                app_module.flush_cache_writes()
+
+        status = self.client.get("/api/status").get_json()
+        fresh = self.client.get(
+            "/api/data", headers={"If-None-Match": stale.headers["ETag"]}
+        )
+        unchanged = self.client.get(
+            "/api/data", headers={"If-None-Match": fresh.headers["ETag"]}
+        )
+
+        self.assertEqual(status["version"], before + 1)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual(fresh.get_json()["version"], status["version"])
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(unchanged.data, b"")
+
+    def test_status_and_data_answer_unchanged_polls_with_304(self):
+        with app_module.data_lock:
+            app_module.current_data.update(
+                status="done",
+                result=[{"종목명": "A", "종합점수": 1}],
+                last_updated="2026-01-02 08:00:00",
+            )
+
+        status = self.client.get("/api/status")
+        status_again = self.client.get(
+            "/api/status", headers={"If-None-Match": status.headers["ETag"]}
+        )
+        data = self.client.get("/api/data")
+        data_again = self.client.get(
+            "/api/data",
+            headers={"If-Modified-Since": data.headers["Last-Modified"]},
+        )
+        with app_module.data_lock:
+            app_module.current_data["status"] = "loading"
+        status_changed = self.client.get(
+            "/api/status", headers={"If-None-Match": status.headers["ETag"]}
+        )
+
+        self.assertIn("no-cache", status.headers["Cache-Control"])
+        self.assertEqual(status_again.status_code, 304)
+        self.assertEqual(data_again.status_code, 304)
+        self.assertEqual(status_changed.status_code, 200)
+        self.assertEqual(status_changed.get_json()["status"], "loading")
+
+    def test_data_skips_last_modified_for_unparseable_timestamp(self):
+        with app_module.data_lock:
+            app_module.current_data.update(
+                status="done",
+                result=[{"종목명": "A", "종합점수": 1}],
+                last_updated="2026/01/02 08:00",
+            )
+
+        data = self.client.get("/api/data")
+        data_again = self.client.get(
+            "/api/data", headers={"If-None-Match": data.headers["ETag"]}
+        )
+
+        self.assertEqual(data.status_code, 200)
+        self.assertNotIn("Last-Modified", data.headers)
+        self.assertEqual(data_again.status_code, 304)
+
+    def test_failed_cache_write_keeps_previous_cache_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = Path(directory) / "cache_data.json"
+            cache_path.write_bytes(b'{"version": 2}')
+
+            with (
+                patch.object(app_module, "CACHE_FILE", str(cache_path)),
+                patch.object(
+                    app_module.orjson,
+                    "dumps",
+                    side_effect=TypeError("not serializable"),
+                ),
+            ):
+                with self.assertRaises(TypeError):
+                    app_module._write_cache({"version": 2})
+
+            self.assertEqual(cache_path.read_bytes(), b'{"version": 2}')
+            self.assertEqual(os.listdir(directory), ["cache_data.json"])
+
+    def test_queued_cache_writes_keep_only_the_latest_snapshot(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = Path(directory) / "cache_data.json"
+            release = threading.Event()
+            written = []
+
+            def slow_write(cache, path):
+                release.wait(timeout=5)
+                written.append(cache["n"])
+
+            with (
+                patch.object(app_module, "CACHE_FILE", str(cache_path)),
+                patch.object(app_module, "_write_cache", side_effect=slow_write),
+            ):
+                app_module._queue_cache_write({"n": 1})
+                time.sleep(0.05)
+                app_module._queue_cache_write({"n": 2})
+                app_module._queue_cache_write({"n": 3})
+                release.set()
+                app_module.flush_cache_writes()
+
+        self.assertEqual(written[-1], 3)
+        self.assertNotIn(2, written)
+
     def test_refresh_persists_results_before_publishing_cache(self):
         result = [
             {"종목명": "A", "종합점수": 1, "출처": "연간실적호전"}
@@ -596,6 +1532,7 @@ process.stdout.write(JSON.stringify({{
                 ) as save_results,
             ):
                 refreshed = app_module.refresh_data()
+                app_module.flush_cache_writes()
 
             cache = json.loads(cache_path.read_text(encoding="utf-8"))
 
@@ -638,6 +1575,7 @@ process.stdout.write(JSON.stringify({{
                 ),
             ):
                 refreshed = app_module.refresh_data()
+                app_module.flush_cache_writes()
 
             self.assertEqual(cache_path.read_bytes(), original_cache)
 
@@ -656,6 +1594,30 @@ process.stdout.write(JSON.stringify({{
         self.assertFalse(started)
         fetch.assert_not_called()
 
+    def test_background_worker_runs_jobs_in_order_on_a_daemon_thread(self):
+        worker = app_module._DaemonWorker("test-worker")
+        ran = []
+        done = threading.Event()
+
+        def job(value):
+            ran.append((value, threading.current_thread().daemon))
+            if value == 2:
+                done.set()
+
+        worker.submit(job, 1)
+        worker.submit(job, value=2)
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(ran, [(1, True), (2, True)])
+
+    def test_daily_job_runs_refresh_on_the_shared_refresh_worker(self):
+        job = app_module.create_scheduler().get_job("daily_refresh")
+
+        with patch.object(app_module.refresh_executor, "submit") as submit:
+            job.func()
+
+        submit.assert_called_once_with(app_module.refresh_data)
+
     def test_daily_refresh_runs_after_scheduler_wakes_up_late(self):
         refreshed = threading.Event()
         scheduler = app_module.scheduler
@@ -684,6 +1646,302 @@ process.stdout.write(JSON.stringify({{
         finally:
             scheduler.shutdown(wait=False)
 
+    def test_dashboard_page_is_served_precompressed_when_accepted(self):
+        compressed = self.client.get("/", headers={"Accept-Encoding": "gzip"})
+        plain = self.client.get("/")
+
+        self.assertEqual(compressed.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", compressed.headers["Vary"])
+        self.assertEqual(gzip.decompress(compressed.data), plain.data)
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertIn("한국 증시 종합 스크리닝 시스템", plain.get_data(as_text=True))
+        self.assertEqual(plain.mimetype, "text/html")
+
+    def test_static_pages_prefer_brotli_when_available(self):
+        fake_brotli = MagicMock()
+        fake_brotli.compress.side_effect = lambda raw, quality: b"br:" + raw
+        with patch.object(app_module, "brotli", fake_brotli):
+            page = app_module._compress_page("<html>페이지</html>")
+        with patch.object(app_module, "brotli", None):
+            without_brotli = app_module._compress_page("<html>페이지</html>")
+
+        with app_module.app.test_request_context(
+            headers={"Accept-Encoding": "gzip, br"}
+        ):
+            response = app_module._page_response(page)
+            fallback = app_module._page_response(without_brotli)
+        with app_module.app.test_request_context(
+            headers={"Accept-Encoding": "gzip"}
+        ):
+            gzip_only = app_module._page_response(page)
+
+        fake_brotli.compress.assert_called_once_with(
+            "<html>페이지</html>".encode("utf-8"), quality=11
+        )
+        self.assertEqual(response.headers["Content-Encoding"], "br")
+        self.assertEqual(response.get_data(), b"br:" + "<html>페이지</html>".encode())
+        self.assertTrue(response.headers["ETag"].endswith('-br"'))
+        self.assertEqual(fallback.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip_only.headers["Content-Encoding"], "gzip")
+
+    def test_static_pages_revalidate_with_etag(self):
+        first = self.client.get("/backtest", headers={"Accept-Encoding": "gzip"})
+        etag = first.headers["ETag"]
+
+        cached = self.client.get(
+            "/backtest",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": etag},
+        )
+        other_encoding = self.client.get("/backtest", headers={"If-None-Match": etag})
+
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.data, b"")
+        self.assertEqual(other_encoding.status_code, 200)
+        self.assertNotEqual(other_encoding.headers["ETag"], etag)
+
+    def test_static_pages_link_hashed_immutable_stylesheets(self):
+        pages = {
+            "/": app_module.HTML_TEMPLATE,
+            "/backtest": app_module.BACKTEST_TEMPLATE,
+            "/db": app_module.DB_VIEWER_TEMPLATE,
+        }
+        for path, template in pages.items():
+            with self.subTest(path=path):
+                page = self.client.get(path).get_data(as_text=True)
+                link = re.search(
+                    r'<link rel="stylesheet" href="(/assets/[^"]+\.css)">', page
+                )
+                self.assertIsNotNone(link)
+                css = self.client.get(link.group(1))
+
+                self.assertEqual(css.mimetype, "text/css")
+                self.assertIn("immutable", css.headers["Cache-Control"])
+                self.assertIn("max-age=31536000", css.headers["Cache-Control"])
+                self.assertNotIn("<style>", page)
+                style = re.search(r"<style>(.*?)</style>", template, re.S).group(1)
+                self.assertEqual(
+                    css.get_data(as_text=True), app_module._minify_css(style)
+                )
+                self.assertEqual(
+                    page,
+                    app_module._minify_markup(
+                        template.replace("<style>" + style + "</style>", link.group(0))
+                    ),
+                )
+
+        self.assertEqual(self.client.get("/assets/missing.css").status_code, 404)
+
+    def test_minify_css_keeps_strings_and_drops_comments(self):
+        css = "a , b {\n  color : red ;\n  /* 주석 */ content: ' ; , ';\n}\n"
+
+        self.assertEqual(
+            app_module._minify_css(css), "a,b{color :red;content:' ; , '}"
+        )
+
+    def test_minify_markup_leaves_script_indentation(self):
+        markup = "<div>\n    <p>x</p>\n</div>\n<script>\n    const t = `\n    a`;\n</script>"
+
+        self.assertEqual(
+            app_module._minify_markup(markup),
+            "<div>\n<p>x</p>\n</div>\n<script>\n    const t = `\n    a`;\n</script>",
+        )
+
+    def test_dashboard_main_table_renders_only_scrolled_window(self):
+        template = app_module.HTML_TEMPLATE
+        start = template.index("function applyRowFilters(")
+        end = template.index("function showTab(", start)
+        node_script = f"""
+const vm = require('node:vm');
+const scroller = {{ scrollTop: 0 }};
+const body = {{ children: [], writes: 0 }};
+body.replaceChildren = (...nodes) => {{ body.children = nodes; body.writes += 1; }};
+let parsedRows = 0;
+const createElement = tag => {{
+    if (tag !== 'template') {{
+        return {{ tag, style: {{}}, appendChild: child => child }};
+    }}
+    return {{
+        set innerHTML(html) {{
+            const rows = html.match(/<tr[^>]*>[^<]*<\\/tr>/g);
+            parsedRows += rows.length;
+            this.content = {{
+                children: rows.map(row => ({{ tag: 'tr', row, offsetHeight: 30 }})),
+            }};
+        }},
+    }};
+}};
+const context = {{
+    ROW_WINDOW: 50, ROW_OVERSCAN: 10,
+    mainRows: Array.from({{ length: 300 }}, (_, i) => ({{
+        score: i % 3 + 1,
+        name: 'stock' + i,
+        html: '<tr class="row">' + i + '</tr>',
+    }})),
+    shownRows: [], scoreFilter: 'all', searchQuery: '',
+    rowHeight: 0, windowStart: -1, windowEnd: -1, searchFrame: 0, rowParser: null,
+    els: {{ m: scroller, mainBody: body }},
+    document: {{ querySelectorAll: () => [], createElement }},
+    requestAnimationFrame: fn => {{ fn(); return 1; }},
+    cancelAnimationFrame: () => {{}},
+}};
+const rowsIn = () => body.children.filter(node => node.row).length;
+const pads = () => body.children.filter(node => !node.row).map(node => node.style.height);
+const result = {{}};
+vm.runInNewContext({json.dumps(template[start:end])}, context, {{ timeout: 250 }});
+vm.runInContext('filt(2, null)', context);
+result.filtered = [context.shownRows.length, rowsIn()];
+const writes = body.writes;
+vm.runInContext("filt(2, null); srch('  ')", context);
+result.repeated = body.writes - writes;
+scroller.scrollTop = 3000;
+vm.runInContext('renderMainWindow()', context);
+result.scrolled = [context.windowStart, context.windowEnd, rowsIn()];
+result.pads = pads();
+const parsedBefore = parsedRows;
+scroller.scrollTop = 0;
+vm.runInContext('renderMainWindow()', context);
+scroller.scrollTop = 3000;
+vm.runInContext('renderMainWindow()', context);
+result.reparsed = parsedRows - parsedBefore;
+vm.runInContext("srch(' STOCK29 ')", context);
+result.searched = [context.shownRows.map(r => r.name), scroller.scrollTop];
+result.nfd = vm.runInContext("searchKey('\\u1100\\u1161') === searchKey('가')", context);
+process.stdout.write(JSON.stringify(result));
+"""
+        completed = subprocess.run(
+            ["node", "-e", node_script],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=2,
+        )
+
+        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
+        result = json.loads(completed.stdout)
+        self.assertEqual(result["filtered"], [200, 50])
+        self.assertEqual(result["repeated"], 0)
+        self.assertEqual(result["scrolled"], [90, 140, 50])
+        self.assertEqual(result["pads"], ["2700px", "1800px"])
+        self.assertEqual(result["reparsed"], 0)
+        self.assertEqual(
+            result["searched"],
+            [["stock29", "stock290", "stock292", "stock293", "stock295",
+              "stock296", "stock298", "stock299"], 0],
+        )
+        self.assertTrue(result["nfd"])
+        self.assertNotIn("querySelectorAll('#mainBody tr')", template)
+
+    def test_dashboard_new_waits_abort_stale_requests(self):
+        template = app_module.HTML_TEMPLATE
+        start = template.index("function isAbort(")
+        end = template.index("function fetchStatus(", start)
+        node_script = f"""
+const vm = require('node:vm');
+const requests = [];
+const context = {{
+    window: {{}},
+    AbortController, setTimeout, clearTimeout,
+    pollTimer: null, statusStream: null, statusRequest: null,
+    dataRequest: null, dataVersion: null,
+    fetch: (url, options) => {{
+        requests.push([url, options.signal]);
+        return new Promise(() => {{}});
+    }},
+}};
+vm.runInNewContext({json.dumps(template[start:end])} + `
+startPolling();
+startPolling();
+loadData();
+loadData();
+`, context, {{ timeout: 250 }});
+process.stdout.write(JSON.stringify(
+    requests.map(([url, signal]) => [url, signal.aborted])
+));
+"""
+        completed = subprocess.run(
+            ["node", "-e", node_script],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=2,
+        )
+
+        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
+        self.assertEqual(
+            json.loads(completed.stdout),
+            [
+                ["/api/status/wait?timeout=25", True],
+                ["/api/status/wait?timeout=25", False],
+                ["/api/data", True],
+                ["/api/data", False],
+            ],
+        )
+
+    def test_dashboard_preloads_only_the_status_request_in_head(self):
+        page = self.client.get("/").get_data(as_text=True)
+        head = page[:page.index("</head>")]
+
+        self.assertIn(
+            '<link rel="preload" href="/api/status" as="fetch" crossorigin="anonymous">',
+            head,
+        )
+        self.assertIn("fetch('/api/status'", page)
+        # 갱신 전에 받아 둔 데이터가 갱신 뒤 loadData()에 재사용되지 않도록 데이터는 미리 받지 않는다.
+        self.assertNotIn('href="/api/data"', head)
+
+    def test_dashboard_opened_while_loading_fetches_data_after_refresh(self):
+        template = app_module.HTML_TEMPLATE
+        start = template.index("function isAbort(")
+        end = template.index("function renderEmpty(", start)
+        node_script = f"""
+const vm = require('node:vm');
+const requests = [];
+const rendered = [];
+const responses = {{
+    '/api/status': {{ status: 'loading', version: 1 }},
+    '/api/status/wait?timeout=25': {{ status: 'done', version: 2, error_msg: '' }},
+    '/api/data': {{ version: 2, result: [{{ 종목명: 'A' }}] }},
+}};
+const classList = {{ add: () => {{}}, remove: () => {{}} }};
+const context = {{
+    window: {{}},
+    AbortController, setTimeout, clearTimeout,
+    pollTimer: null, statusStream: null, statusRequest: null,
+    dataRequest: null, dataVersion: null,
+    els: {{ refreshBtn: {{ classList }}, loadingOverlay: {{ classList }} }},
+    showToast: () => {{}},
+    renderData: d => rendered.push(d.version),
+    renderEmpty: () => rendered.push('empty'),
+    fetch: url => {{
+        requests.push(url);
+        return Promise.resolve({{ json: () => responses[url] }});
+    }},
+}};
+vm.runInNewContext({json.dumps(template[start:end])}, context, {{ timeout: 250 }});
+vm.runInContext('fetchStatus()', context);
+setTimeout(() => {{
+    process.stdout.write(JSON.stringify({{
+        requests, rendered, dataVersion: context.dataVersion,
+    }}));
+}}, 20);
+"""
+        completed = subprocess.run(
+            ["node", "-e", node_script],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=2,
+        )
+
+        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
+        result = json.loads(completed.stdout)
+        self.assertEqual(
+            result["requests"],
+            ["/api/status", "/api/status/wait?timeout=25", "/api/data"],
+        )
+        self.assertEqual(result["rendered"], [2])
+        self.assertEqual(result["dataVersion"], 2)
+
     def test_dashboard_describes_time_bounded_nps_signal(self):
         self.assertIn("국민연금 신규/추가매수", app_module.HTML_TEMPLATE)
         self.assertIn("매수일부터 3개월 동안만 1점", app_module.HTML_TEMPLATE)
@@ -692,10 +1950,17 @@ process.stdout.write(JSON.stringify({{
     def test_dashboard_escapes_screening_values_before_html_rendering(self):
         template = app_module.HTML_TEMPLATE
 
-        self.assertIn("function escapeHtml(value)", template)
-        self.assertIn("escapeHtml(r['종목명'])", template)
-        self.assertIn("escapeHtml(v)", template)
-        self.assertIn("escapeHtml(r[c]", template)
+        self.assertIn("html: r._row_html", template)
+        self.assertIn("tables.turn || ''", template)
+
+    def test_dashboard_main_table_assigns_rows_once(self):
+        template = app_module.HTML_TEMPLATE
+        render_start = template.index("function renderData(d)")
+        render_end = template.index("function applyRowFilters(", render_start)
+        render_source = template[render_start:render_end]
+
+        self.assertIn("applyRowFilters();", render_source)
+        self.assertNotIn("innerHTML +=", render_source)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
+import statistics
 import unittest
 
-from backtester import BacktestEngine, CostConfig, Portfolio
+from backtester import BacktestEngine, CostConfig, Portfolio, _mean_stdev
 
 
 def price(date, close):
@@ -35,7 +36,18 @@ class BacktestAccountingTest(unittest.TestCase):
         self.assertEqual(results["metrics"]["final_equity"], 991)
         self.assertEqual(results["metrics"]["total_return"], -0.9)
         self.assertEqual(results["metrics"]["mdd"], -0.9)
-        self.assertEqual(results["benchmark"]["curve"][0]["equity"], 1_000)
+        self.assertEqual(
+            results["equity_curve"],
+            {"dates": ["2026-01-02", "2026-01-05"], "equity": [991, 991]},
+        )
+        self.assertEqual(
+            results["drawdown_curve"],
+            {"dates": ["2026-01-02", "2026-01-05"], "dd": [-0.9, -0.9]},
+        )
+        self.assertEqual(
+            results["benchmark"]["curve"],
+            {"dates": ["2026-01-02", "2026-01-05"], "equity": [1_000, 1_000]},
+        )
 
     def test_fifo_partial_sale_closes_every_lot_and_reconciles_cash(self):
         portfolio = Portfolio(10_000, CostConfig(commission_pct=1.0))
@@ -51,7 +63,7 @@ class BacktestAccountingTest(unittest.TestCase):
         self.assertEqual([trade.shares for trade in opened], [5])
         self.assertAlmostEqual(sum(trade.pnl for trade in closed), 118.5)
         self.assertAlmostEqual(portfolio.cash, 9_613.5)
-        self.assertEqual(portfolio.positions["AAA"]["shares"], 5)
+        self.assertEqual(portfolio.positions["AAA"].shares, 5)
 
         portfolio.sell("AAA", 110, 5, "2026-01-07")
 
@@ -61,6 +73,85 @@ class BacktestAccountingTest(unittest.TestCase):
         self.assertAlmostEqual(sum(trade.pnl for trade in portfolio.trades), 158.0)
         self.assertAlmostEqual(portfolio.cash, 10_158.0)
 
+    def test_partial_sales_keep_split_lots_in_trade_order(self):
+        portfolio = Portfolio(100_000)
+        portfolio.buy("AAA", 100, 10, "2026-01-02")
+        portfolio.buy("BBB", 100, 10, "2026-01-02")
+        portfolio.buy("AAA", 200, 10, "2026-01-05")
+
+        portfolio.sell("AAA", 150, 4, "2026-01-06")
+        portfolio.sell("AAA", 150, 4, "2026-01-07")
+        portfolio.sell("AAA", 150, 4, "2026-01-08")
+
+        self.assertEqual(
+            [(t.ticker, t.shares, t.status, t.exit_date) for t in portfolio.trades],
+            [
+                ("AAA", 4, "closed", "2026-01-06"),
+                ("AAA", 4, "closed", "2026-01-07"),
+                ("AAA", 2, "closed", "2026-01-08"),
+                ("BBB", 10, "open", None),
+                ("AAA", 2, "closed", "2026-01-08"),
+                ("AAA", 8, "open", None),
+            ],
+        )
+        self.assertEqual(portfolio.positions["AAA"].shares, 8)
+        self.assertEqual(portfolio.positions["AAA"].avg_price, 200)
+
+    def test_last_known_prices_carry_forward_across_gaps(self):
+        engine = BacktestEngine()
+        engine.add_price_data(
+            "AAA",
+            [price("2026-01-06", 120), price("2026-01-02", 100)],
+        )
+        engine.add_price_data("BBB", [price("2026-01-05", 50)])
+
+        self.assertEqual(engine._last_known_prices("2026-01-01"), {})
+        self.assertEqual(engine._last_known_prices("2026-01-02"), {"AAA": 100})
+        self.assertEqual(
+            engine._last_known_prices("2026-01-05"), {"AAA": 100, "BBB": 50}
+        )
+        self.assertEqual(
+            engine._last_known_prices("2026-01-09"), {"AAA": 120, "BBB": 50}
+        )
+
+    def test_build_dates_refreshes_after_new_price_data(self):
+        engine = BacktestEngine()
+        engine.add_price_data("AAA", [price("2026-01-05", 100)])
+        engine._build_dates()
+        self.assertEqual(engine.all_dates, ["2026-01-05"])
+
+        engine.add_price_data(
+            "BBB", [price("2026-01-02", 50), price("2026-01-05", 50)]
+        )
+        engine._build_dates()
+
+        self.assertEqual(engine.all_dates, ["2026-01-02", "2026-01-05"])
+
+    def test_date_window_is_inclusive_and_open_ended(self):
+        engine = BacktestEngine()
+        engine.add_price_data(
+            "AAA",
+            [price(d, 100) for d in ("2026-01-02", "2026-01-05", "2026-01-06")],
+        )
+        engine._build_dates()
+
+        self.assertEqual(
+            engine._date_window("2026-01-05", None), ["2026-01-05", "2026-01-06"]
+        )
+        self.assertEqual(
+            engine._date_window("2026-01-03", "2026-01-05"), ["2026-01-05"]
+        )
+        self.assertEqual(engine._date_window(None, "2026-01-01"), [])
+        self.assertEqual(engine._date_window("2026-01-06", "2026-01-02"), [])
+
+    def test_mean_stdev_matches_statistics_module(self):
+        values = [0.012, -0.004, 0.0, 0.031, -0.027, 0.008]
+
+        mean, stdev = _mean_stdev(values)
+
+        self.assertAlmostEqual(mean, statistics.mean(values), places=15)
+        self.assertAlmostEqual(stdev, statistics.stdev(values), places=15)
+
     def test_strategy_stock_performance_combines_realized_and_open_pnl(self):
         engine = BacktestEngine(initial_capital=2_000, commission_pct=1.0)
         engine.add_price_data(
@@ -1,6 +1,7 @@
 import json
 import os
 import tempfile
+import threading
 import unittest
 from datetime import date
 from pathlib import Path
@@ -96,6 +97,20 @@ class ScreeningFeedTest(unittest.TestCase):
         self.assertEqual(rows[0]["전일종가(원)"], "250,000")
         self.assertEqual(rows[0]["순매수금액(억원)"], "150.5")
 
+    def test_feed_session_is_returned_to_pool_for_next_refresh(self):
+        import screening
+
+        session = FakeSession(FakeResponse(b'{"comp": []}'))
+        with (
+            patch.object(screening, "_session_pool", screening.queue.LifoQueue()),
+            patch.object(screening, "_retry_session", return_value=session) as factory,
+        ):
+            fetch_turnaround()
+            fetch_supply_trend()
+
+            factory.assert_called_once_with()
+            self.assertIs(screening._session_pool.get_nowait(), session)
+
     def test_feed_rejects_http_200_error_document(self):
         session = FakeSession(FakeResponse(b"<html>404 - page not found</html>"))
 
@@ -666,6 +681,31 @@ class SourceOrchestrationTest(unittest.TestCase):
         with self.assertRaises(ScreeningDataError):
             fetch_all_data(require_all=True)
 
+    @patch(
+        "screening.build_nps_buy_signals",
+        return_value=([{"종목명": "C"}], candidate_state),
+    )
+    def test_feeds_reuse_the_module_worker_pool(self, _nps):
+        threads = []
+
+        def feed():
+            threads.append(threading.current_thread().name)
+            return []
+
+        with (
+            tempfile.TemporaryDirectory() as directory,
+            patch("screening.fetch_turnaround", side_effect=feed),
+            patch("screening.fetch_supply_trend", side_effect=feed),
+            patch("screening.ThreadPoolExecutor") as new_pool,
+        ):
+            state_path = Path(directory) / "nps_state.json"
+            fetch_all_data(nps_state_path=state_path)
+            fetch_all_data(nps_state_path=state_path)
+
+        new_pool.assert_not_called()
+        self.assertEqual(len(threads), 4)
+        self.assertTrue(all(name.startswith("screening-feed") for name in threads))
+
     def test_complete_refresh_saves_candidate_nps_state(self):
         with tempfile.TemporaryDirectory() as directory:
             state_path = Path(directory) / "nps_state.json"
@@ -774,6 +814,28 @@ class SourceOrchestrationTest(unittest.TestCase):
             self.assertEqual((turn, supply, nps), ([], [], [{"종목명": "C"}]))
             self.assertEqual(state_path.read_bytes(), original)
 
+    def test_json_feeds_are_fetched_while_nps_signals_build(self):
+        feed_started = threading.Event()
+
+        def turnaround():
+            feed_started.set()
+            return [{"종목명": "A"}]
+
+        def build_signals(*_args, **_kwargs):
+            self.assertTrue(feed_started.wait(timeout=5))
+            return [{"종목명": "C"}], self.candidate_state
+
+        with (
+            patch("screening.fetch_turnaround", side_effect=turnaround),
+            patch("screening.fetch_supply_trend", return_value=[]),
+            patch("screening.build_nps_buy_signals", side_effect=build_signals),
+            patch("screening.nps_state_lock"),
+            patch("screening.save_nps_state"),
+        ):
+            turn, supply, nps = fetch_all_data(require_all=True)
+
+        self.assertEqual((turn, supply, nps), ([{"종목명": "A"}], [], [{"종목명": "C"}]))
+
     def test_state_save_failure_is_reported_as_screening_error(self):
         with (
             patch("screening.fetch_turnaround", return_value=[]),
@@ -499,6 +499,30 @@ class StockDbCacheTest(unittest.TestCase):
             {"date", "open", "high", "low", "close", "volume"},
         )
 
+    def test_bulk_price_lookup_matches_per_ticker_queries(self):
+        def bar(day, close):
+            return {
+                "date": day, "open": close, "high": close, "low": close,
+                "close": close, "volume": 10,
+            }
+
+        self.db.save_prices("000001", [bar("2026-01-06", 110), bar("2026-01-05", 100)])
+        self.db.save_prices("000002", [bar("2026-01-05", 200), bar("2026-01-09", 210)])
+
+        bulk = self.db.get_prices_bulk(
+            ["000002", "000001", "999999"], "2026-01-05", "2026-01-06"
+        )
+
+        self.assertEqual(list(bulk), ["000002", "000001", "999999"])
+        for ticker in ("000001", "000002"):
+            self.assertEqual(
+                bulk[ticker],
+                self.db.get_prices(ticker, "2026-01-05", "2026-01-06"),
+            )
+        self.assertEqual([row["close"] for row in bulk["000001"]], [100, 110])
+        self.assertEqual(bulk["999999"], [])
+        self.assertEqual(self.db.get_prices_bulk([], "2026-01-05", "2026-01-06"), {})
+
     def test_ticker_map_file_backfills_missing_daily_price_name(self):
         self.db.save_prices("005930", [{
             "date": "2026-01-05",
@@ -751,6 +775,19 @@ class StockDbCacheTest(unittest.TestCase):
         self.assertEqual(added, 0)
         self.assertEqual(krx.index_calls, 0)
 
+    def test_price_collection_waits_only_after_api_fetch(self):
+        with (
+            patch.object(self.db, "fetch_and_store", side_effect=[0, 3, 0]),
+            patch("stock_db.time.sleep") as sleep,
+        ):
+            stats = self.db.ensure_price_data(
+                ["A", "B", "C"], "20260101", "20260105", delay=30
+            )
+
+        self.assertEqual(stats, {"total": 3, "fetched": 1, "new_days": 3})
+        sleep.assert_called_once()
+        self.assertLessEqual(sleep.call_args.args[0], 30)
+
     def test_screening_results_store_requested_fields_and_are_queryable(self):
         saved = self.db.replace_screening_results(
             [